@@ -1,136 +1,97 @@
 # Write your code here :-)
+import pandas as pd
 import streamlit as st
-import random
-from collections import defaultdict
-
-def calculate_rematch_interval(num_players):
-    return max(1, num_players // 2)
-
-def choose_player_to_rest(players, rest_counts):
-    min_rests = min(rest_counts.values())
-    candidates = [p for p in players if rest_counts[p] == min_rests]
-    return random.choice(candidates)
-
-def update_recent_partners(recent_partners, player1, player2, rematch_interval):
-    for player in [player1, player2]:
-        recent_partners[player].append(player2 if player == player1 else player1)
-        if len(recent_partners[player]) > rematch_interval:
-            recent_partners[player].pop(0)
-
-def score_pairings(pairings, player_pairing_counts):
-    score = 0
-    for player1, player2 in pairings:
-        if player_pairing_counts[player1][player2] == 0:
-            score += 0  # Strongly reward new partnerships
-        else:
-            score += (player_pairing_counts[player1][player2] ** 2) * 10  # Heavily penalize repeat partnerships
-    return score
-
-def generate_random_pairings(players, rest_counts):
-    available_players = players.copy()
-    resting_player = None
-    if len(available_players) % 2 == 1:
-        resting_player = choose_player_to_rest(available_players, rest_counts)
-        available_players.remove(resting_player)
-
-    random.shuffle(available_players)
-    pairings = [(available_players[i], available_players[i+1]) for i in range(0, len(available_players), 2)]
-    return pairings, resting_player
-
-def create_optimized_pairings(players, player_pairing_counts, rest_counts):
-    best_pairings = None
-    best_score = float('inf')
-    best_resting_player = None
-
-    for _ in range(10):  # Try 10 times to get the best pairings
-        pairings, resting_player = generate_random_pairings(players, rest_counts)
-        score = score_pairings(pairings, player_pairing_counts)
-
-        if score < best_score:
-            best_score = score
-            best_pairings = pairings
-            best_resting_player = resting_player
-
-    # Update pairing counts
-    for player1, player2 in best_pairings:
-        player_pairing_counts[player1][player2] += 1
-        player_pairing_counts[player2][player1] += 1
-
-    return best_pairings, best_resting_player
-
-def create_matches(pairings, previous_match_history, player_matchups):
-    matches = []
-    remaining_pairings = pairings.copy()
-
-    while len(remaining_pairings) > 1:
-        pair1 = remaining_pairings.pop(0)
-        best_match = None
-        best_score = float('-inf')
-
-        for i, pair2 in enumerate(remaining_pairings):
-            if set(pair1).isdisjoint(set(pair2)):  # Ensure no player is playing against themselves
-                score = calculate_match_score(pair1, pair2, previous_match_history, player_matchups)
-                if score > best_score:
-                    best_score = score
-                    best_match = (i, pair2)
-
-        if best_match:
-            i, pair2 = best_match
-            matches.append((pair1, pair2))
-            update_match_history(pair1, pair2, previous_match_history, player_matchups)
-            remaining_pairings.pop(i)
-        else:
-            # If no valid match found, put the pair back and try again later
-            remaining_pairings.append(pair1)
-
-    return matches
-
-def calculate_match_score(pair1, pair2, previous_match_history, player_matchups):
-    novelty_score = 0 if tuple(pair2) in previous_match_history[tuple(pair1)] else 1
-    balance_score = sum(player_matchups[p1][p2] for p1 in pair1 for p2 in pair2)
-    return novelty_score * 10 - balance_score  # Prioritize new matchups, then balance
-
-def update_match_history(pair1, pair2, previous_match_history, player_matchups):
-    previous_match_history[tuple(pair1)].add(tuple(pair2))
-    previous_match_history[tuple(pair2)].add(tuple(pair1))
-    for p1 in pair1:
-        for p2 in pair2:
-            player_matchups[p1][p2] += 1
-            player_matchups[p2][p1] += 1
-
-def generate_tournament_schedule(players, num_rounds):
-    player_pairing_counts = defaultdict(lambda: defaultdict(int))
-    rest_counts = {player: 0 for player in players}  # Initialize rest counts for all players
-    previous_match_history = defaultdict(set)
-    player_matchups = defaultdict(lambda: defaultdict(int))
-    all_rounds = []
-
-    for _ in range(num_rounds):
-        pairings, resting_player = create_optimized_pairings(players, player_pairing_counts, rest_counts)
-        matches = create_matches(pairings, previous_match_history, player_matchups)
-        all_rounds.append((matches, resting_player))
-
-        # Update rest counts after each round
-        if resting_player:
-            rest_counts[resting_player] += 1
-
-    return all_rounds, player_matchups, player_pairing_counts, rest_counts
+import pbscheduler
+
+import app_ui
+
+TOURNAMENT_NAME = "Americano"
+RESULT_OPTIONS = ["Not played", "Team 1 wins", "Team 2 wins"]
+
+@st.cache_data(show_spinner="Generating schedule...")
+def generate_tournament_schedule(players, num_rounds, optimize_seconds=0, use_all_cores=False, schedule_number=1):
+    return pbscheduler.tournament_schedule(players, num_rounds, optimize_seconds, use_all_cores, schedule_number)
 
 def display_tournament_schedule(all_rounds):
     st.write("### Pickleball Tournament Schedule:")
-    for round_number, (matches, resting_player) in enumerate(all_rounds, 1):
+    st.dataframe(app_ui.schedule_table(all_rounds), hide_index=True, use_container_width=True)
+
+def display_match_results_form(all_rounds, points_per_win):
+    # One editable grid per round, a page of rounds at a time. Results live in
+    # session state so they survive paging away from a round.
+    st.write("### Enter Match Results:")
+    match_results = st.session_state.match_results
+    page = app_ui.round_page(len(all_rounds), "results_page")
+    changed = {}
+    for round_index in page:
+        round_number = round_index + 1
+        matches = all_rounds[round_index][0]
         st.write(f"\n**Round {round_number}:**")
-        if resting_player:
-            st.write(f"Player resting this round: {resting_player}")
-        for match_number, (pair1, pair2) in enumerate(matches, 1):
-            st.write(f"Match {match_number}: {pair1[0]} & {pair1[1]} vs. {pair2[0]} & {pair2[1]}")
-        st.write("---")  # Add a separator between rounds
-
-def display_leaderboard(player_scores):
+        table = pd.DataFrame(
+            {
+                "Team 1": [pbscheduler.team_text(pair1) for pair1, _ in matches],
+                "Team 2": [pbscheduler.team_text(pair2) for _, pair2 in matches],
+                "Result": [match_results.get((round_number, m), "Not played") for m in range(1, len(matches) + 1)],
+            },
+            index=pd.RangeIndex(1, len(matches) + 1, name="Match"),
+        )
+        edited = st.data_editor(
+            table,
+            disabled=["Team 1", "Team 2"],
+            column_config={"Result": st.column_config.SelectboxColumn(options=RESULT_OPTIONS, required=True)},
+            key=f"results_round_{round_number}",
+        )
+        for match_number, winner in enumerate(edited["Result"], 1):
+            if match_results.get((round_number, match_number), "Not played") != winner:
+                changed[(round_number, match_number)] = winner
+
+    # Only changed results are saved, each as a new row
+    if changed:
+        with app_ui.tournament_store() as conn:
+            for key, winner in changed.items():
+                pbscheduler.append_result(conn, st.session_state.tournament_id, key, winner)
+        match_results.update(changed)
+
+    # Only this page's results can have changed, unless the points per win did
+    if st.session_state.get('scored_points_per_win') != points_per_win:
+        st.session_state.scored_points_per_win = points_per_win
+        page = range(len(all_rounds))
+    score_rounds(all_rounds, page, points_per_win)
+
+def score_rounds(all_rounds, round_indexes, points_per_win):
+    match_results = st.session_state.match_results
+    for round_index in round_indexes:
+        round_number = round_index + 1
+        for match_number, (pair1, pair2) in enumerate(all_rounds[round_index][0], 1):
+            winner = match_results.get((round_number, match_number), "Not played")
+            # Only a changed result touches the leaderboard
+            awards = {}
+            if winner == "Team 1 wins":
+                awards = pbscheduler.match_awards(pair1, points_per_win)
+            elif winner == "Team 2 wins":
+                awards = pbscheduler.match_awards(pair2, points_per_win)
+            pbscheduler.record_result(st.session_state.ledger, (round_number, match_number), awards)
+
+def load_saved_tournament(tournament_id):
+    with app_ui.tournament_store() as conn:
+        tournament = pbscheduler.load_tournament(conn, tournament_id)
+    if tournament is None or tournament["name"] != TOURNAMENT_NAME:
+        return False
+    st.session_state.tournament_id = tournament_id
+    st.session_state.all_rounds = tournament["all_rounds"]
+    st.session_state.points_per_win = tournament["settings"]["points_per_win"]
+    st.session_state.ledger = pbscheduler.new_ledger(tournament["roster"]["players"])
+    st.session_state.match_results = dict(tournament["results"])
+    # The results form scores every round again
+    st.session_state.pop('scored_points_per_win', None)
+    st.session_state.schedule_generated = True
+    return True
+
+def display_leaderboard(ledger):
     st.write("### Leaderboard:")
-    sorted_players = sorted(player_scores.items(), key=lambda x: x[1], reverse=True)
-    for rank, (player, score) in enumerate(sorted_players, 1):
-        st.write(f"{rank}. {player}: {score} points")
+    standings = pbscheduler.leaderboard(ledger)
+    table = pd.DataFrame(standings, columns=["Player", "Points"], index=pd.RangeIndex(1, len(standings) + 1, name="Rank"))
+    st.dataframe(table, use_container_width=True)
 
 def main():
     st.title("Americano Style Pickleball Tournament")
@@ -138,8 +99,10 @@ def main():
     # Initialize session state
     if 'schedule_generated' not in st.session_state:
         st.session_state.schedule_generated = False
-    if 'player_scores' not in st.session_state:
-        st.session_state.player_scores = defaultdict(int)
+    if 'ledger' not in st.session_state:
+        st.session_state.ledger = pbscheduler.new_ledger()
+    if 'match_results' not in st.session_state:
+        st.session_state.match_results = {}
     if 'num_players' not in st.session_state:
         st.session_state.num_players = 4
     if 'player_names' not in st.session_state:
@@ -149,26 +112,31 @@ def main():
     if 'points_per_win' not in st.session_state:
         st.session_state.points_per_win = 1
 
+    # A tournament in the page address survives refreshes
+    tournament_id = st.query_params.get("tournament")
+    if tournament_id and tournament_id.isdigit() and st.session_state.get('tournament_id') != int(tournament_id):
+        if not load_saved_tournament(int(tournament_id)):
+            st.warning(f"Tournament {tournament_id} was not found.")
+
     # Add a reset button
     if st.button("Reset All Inputs"):
         st.session_state.num_players = 4
         st.session_state.player_names = [f"Player {i+1}" for i in range(4)]
         st.session_state.num_rounds = 3
         st.session_state.schedule_generated = False
-        st.session_state.player_scores = defaultdict(int)
+        st.session_state.ledger = pbscheduler.new_ledger()
+        st.session_state.match_results = {}
         st.session_state.points_per_win = 1
+        st.session_state.pop('tournament_id', None)
+        st.query_params.clear()
         st.rerun()
 
-    num_players = st.number_input("Enter the number of players:", min_value=2, step=1, value=st.session_state.num_players, key="num_players_input")
-
-    # Update player names if number of players changed
-    if num_players != len(st.session_state.player_names):
-        st.session_state.player_names = st.session_state.player_names[:num_players] + [f"Player {i+1}" for i in range(len(st.session_state.player_names), num_players)]
-
-    players = [st.text_input(f"Name for Player {i + 1}", value=st.session_state.player_names[i], key=f"player_{i}") for i in range(num_players)]
+    num_players, players = app_ui.roster_editor()
 
     num_rounds = st.number_input("Enter the number of rounds in the tournament:", min_value=1, step=1, value=st.session_state.num_rounds, key="num_rounds_input")
 
+    schedule_number = st.number_input("Schedule number (the same number gives the same schedule):", min_value=1, step=1, value=1, key="schedule_number_input")
+
     points_per_win = st.number_input("Points awarded per win:", min_value=1, step=1, value=st.session_state.points_per_win, key="points_per_win_input")
 
     # Update session state
@@ -178,28 +146,30 @@ def main():
     st.session_state.points_per_win = points_per_win
 
     if st.button("Generate Tournament Schedule"):
-        st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = generate_tournament_schedule(players, num_rounds)
+        st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = generate_tournament_schedule(players, num_rounds, schedule_number=schedule_number)
         st.session_state.schedule_generated = True
+        st.session_state.ledger = pbscheduler.new_ledger(players)
+        st.session_state.match_results = {}
+        st.session_state.tournament_id = app_ui.save_to_history(TOURNAMENT_NAME, players, st.session_state.all_rounds, {"points_per_win": points_per_win})
+        st.query_params["tournament"] = str(st.session_state.tournament_id)
         display_tournament_schedule(st.session_state.all_rounds)
 
     if st.session_state.schedule_generated:
-        st.write("### Enter Match Results:")
-        for round_number, (matches, resting_player) in enumerate(st.session_state.all_rounds, 1):
-            st.write(f"\n**Round {round_number}:**")
-            for match_number, (pair1, pair2) in enumerate(matches, 1):
-                winner = st.radio(
-                    f"Match {match_number}: {pair1[0]} & {pair1[1]} vs. {pair2[0]} & {pair2[1]}",
-                    options=["Not played", "Team 1 wins", "Team 2 wins"],
-                    key=f"round_{round_number}_match_{match_number}"
-                )
-                if winner == "Team 1 wins":
-                    st.session_state.player_scores[pair1[0]] += points_per_win
-                    st.session_state.player_scores[pair1[1]] += points_per_win
-                elif winner == "Team 2 wins":
-                    st.session_state.player_scores[pair2[0]] += points_per_win
-                    st.session_state.player_scores[pair2[1]] += points_per_win
-
-        display_leaderboard(st.session_state.player_scores)
+        display_match_results_form(st.session_state.all_rounds, points_per_win)
+        display_leaderboard(st.session_state.ledger)
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            label="Download Schedule (CSV)",
+            data=app_ui.schedule_csv(st.session_state.all_rounds),
+            file_name="pickleball_tournament_schedule.csv",
+            mime="text/csv"
+        )
+        col2.download_button(
+            label="Download Results (CSV)",
+            data=app_ui.results_csv(st.session_state.all_rounds, st.session_state.ledger),
+            file_name="pickleball_results.csv",
+            mime="text/csv"
+        )
 
 if __name__ == "__main__":
     main()
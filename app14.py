@@ -1,192 +1,47 @@
-import streamlit as st
-import random
-from collections import defaultdict
-
-def calculate_rematch_interval(num_players):
-    return max(1, num_players // 2)
-
-def choose_player_to_rest(players, rest_counts):
-    min_rests = min(rest_counts.values())
-    candidates = [p for p in players if rest_counts[p] == min_rests]
-    return random.choice(candidates)
-
-def update_recent_partners(recent_partners, player1, player2, rematch_interval):
-    for player in [player1, player2]:
-        recent_partners[player].append(player2 if player == player1 else player1)
-        if len(recent_partners[player]) > rematch_interval:
-            recent_partners[player].pop(0)
-
-def score_pairings(pairings, player_pairing_counts):
-    score = 0
-    for player1, player2 in pairings:
-        if player_pairing_counts[player1][player2] == 0:
-            score += 0  # Strongly reward new partnerships
-        else:
-            score += (player_pairing_counts[player1][player2] ** 2) * 10  # Heavily penalize repeat partnerships
-    return score
-
-def generate_random_pairings(players, rest_counts):
-    available_players = players.copy()
-    resting_player = None
-    if len(available_players) % 2 == 1:
-        resting_player = choose_player_to_rest(available_players, rest_counts)
-        available_players.remove(resting_player)
-
-    random.shuffle(available_players)
-    pairings = [(available_players[i], available_players[i+1]) for i in range(0, len(available_players), 2)]
-    return pairings, resting_player
-
-def create_optimized_pairings(players, player_pairing_counts, rest_counts):
-    best_pairings = None
-    best_score = float('inf')
-    best_resting_player = None
-
-    for _ in range(10):  # Try 10 times to get the best pairings
-        pairings, resting_player = generate_random_pairings(players, rest_counts)
-        score = score_pairings(pairings, player_pairing_counts)
-
-        if score < best_score:
-            best_score = score
-            best_pairings = pairings
-            best_resting_player = resting_player
-
-    # Update pairing counts
-    for player1, player2 in best_pairings:
-        player_pairing_counts[player1][player2] += 1
-        player_pairing_counts[player2][player1] += 1
-
-    return best_pairings, best_resting_player
-
-def create_matches(pairings, previous_match_history, player_matchups):
-    matches = []
-    remaining_pairings = pairings.copy()
-
-    while len(remaining_pairings) > 1:
-        pair1 = remaining_pairings.pop(0)
-        best_match = None
-        best_score = float('-inf')
+from itertools import islice
 
-        for i, pair2 in enumerate(remaining_pairings):
-            if set(pair1).isdisjoint(set(pair2)):  # Ensure no player is playing against themselves
-                score = calculate_match_score(pair1, pair2, previous_match_history, player_matchups)
-                if score > best_score:
-                    best_score = score
-                    best_match = (i, pair2)
-
-        if best_match:
-            i, pair2 = best_match
-            matches.append((pair1, pair2))
-            update_match_history(pair1, pair2, previous_match_history, player_matchups)
-            remaining_pairings.pop(i)
-        else:
-            # If no valid match found, put the pair back and try again later
-            remaining_pairings.append(pair1)
-
-    return matches
-
-def calculate_match_score(pair1, pair2, previous_match_history, player_matchups):
-    novelty_score = 0 if tuple(pair2) in previous_match_history[tuple(pair1)] else 1
-    balance_score = sum(player_matchups[p1][p2] for p1 in pair1 for p2 in pair2)
-    return novelty_score * 10 - balance_score  # Prioritize new matchups, then balance
-
-def update_match_history(pair1, pair2, previous_match_history, player_matchups):
-    previous_match_history[tuple(pair1)].add(tuple(pair2))
-    previous_match_history[tuple(pair2)].add(tuple(pair1))
-    for p1 in pair1:
-        for p2 in pair2:
-            player_matchups[p1][p2] += 1
-            player_matchups[p2][p1] += 1
-
-def generate_tournament_schedule(players, num_rounds):
-    player_pairing_counts = defaultdict(lambda: defaultdict(int))
-    rest_counts = {player: 0 for player in players}  # Initialize rest counts for all players
-    previous_match_history = defaultdict(set)
-    player_matchups = defaultdict(lambda: defaultdict(int))
-    all_rounds = []
+import pandas as pd
+import streamlit as st
+import pbscheduler
 
-    for _ in range(num_rounds):
-        pairings, resting_player = create_optimized_pairings(players, player_pairing_counts, rest_counts)
-        matches = create_matches(pairings, previous_match_history, player_matchups)
-        all_rounds.append((matches, resting_player))
+import app_ui
 
-        # Update rest counts after each round
-        if resting_player:
-            rest_counts[resting_player] += 1
+HISTORY_NAME = "Weekly round robin"
 
-    return all_rounds, player_matchups, player_pairing_counts, rest_counts
+@st.cache_data(show_spinner="Generating schedule...")
+def generate_tournament_schedule(players, num_rounds, optimize_seconds=0, use_all_cores=False, schedule_number=1):
+    return pbscheduler.tournament_schedule(players, num_rounds, optimize_seconds, use_all_cores, schedule_number)
 
 def display_tournament_schedule(all_rounds):
     st.write("### Pickleball Tournament Schedule:")
-    for round_number, (matches, resting_player) in enumerate(all_rounds, 1):
-        st.write(f"\n**Round {round_number}:**")
-        if resting_player:
-            st.write(f"Player resting this round: {resting_player}")
-        for match_number, (pair1, pair2) in enumerate(matches, 1):
-            st.write(f"Match {match_number}: {pair1[0]} & {pair1[1]} vs. {pair2[0]} & {pair2[1]}")
-        st.write("---")  # Add a separator between rounds
+    st.dataframe(app_ui.schedule_table(all_rounds), hide_index=True, use_container_width=True)
     st.write(f"Total number of rounds: {len(all_rounds)}")
 
-def display_player_matchup_counts(player_matchups):
+def display_player_matchup_counts(player_matchups, players):
     st.write("\n### Player Matchup Counts (Times Faced Each Other):")
-    for player1, opponents in player_matchups.items():
-        for player2, count in opponents.items():
-            if player1 < player2:
-                st.write(f"{player1} vs. {player2}: {count} times")
+    st.dataframe(app_ui.count_heatmap(player_matchups, players))
 
-def display_partnership_stats(player_pairing_counts):
+def display_partnership_stats(player_pairing_counts, players):
     st.write("\n### Partnership Statistics (Times Paired Together):")
-    for player1 in player_pairing_counts:
-        for player2, count in player_pairing_counts[player1].items():
-            if player1 < player2:  # To avoid duplicate pairs
-                st.write(f"{player1} and {player2} partnered {count} times")
+    st.dataframe(app_ui.count_heatmap(player_pairing_counts, players))
 
-def display_rest_stats(rest_counts):
+def display_rest_stats(rest_counts, players):
     st.write("\n### Rest Statistics (Times Rested):")
-    for player, count in rest_counts.items():
-        st.write(f"{player} rested {count} times")
+    st.dataframe(pd.DataFrame({"Player": players, "Times rested": rest_counts}), hide_index=True)
 
+@st.cache_data(show_spinner=False)
 def generate_printable_schedule(all_rounds):
-    schedule = "Pickleball Doubles Tournament - Match Results\n\n"
-    for round_number, (matches, resting_player) in enumerate(all_rounds, 1):
-        schedule += f"Round {round_number}:\n"
-        if resting_player:
-            schedule += f"Player resting this round: {resting_player}\n"
-        for match_number, (pair1, pair2) in enumerate(matches, 1):
-            schedule += f"Match {match_number}: {pair1[0]} & {pair1[1]} vs. {pair2[0]} & {pair2[1]}\n"
-            schedule += "Winner: [ ] Team 1  [ ] Team 2\n"
-            schedule += "---\n"  # Add a separator between matches
-        schedule += "\n"  # Add an extra line between rounds
-    return schedule
-
-def display_schedule_history(schedule_history):
-    st.write("### Last 3 Generated Schedules:")
-    if not schedule_history:
-        st.write("No History")
-    else:
-        for i, (players, num_rounds, all_rounds) in enumerate(reversed(schedule_history[-3:]), 1):
-            st.write(f"\n**Schedule {i}:**")
-            st.write(f"Players: {', '.join(players)}")
-            st.write(f"Number of rounds: {num_rounds}")
-            temp_container = st.empty()
-            display_tournament_schedule(all_rounds, temp_container)
+    return pbscheduler.generate_printable_schedule(all_rounds)
 
-def generate_additional_round(players, player_pairing_counts, rest_counts, player_matchups):
-    previous_match_history = defaultdict(set)  # Initialize this here
-    pairings, resting_player = create_optimized_pairings(players, player_pairing_counts, rest_counts)
-    matches = create_matches(pairings, previous_match_history, player_matchups)
+def update_week_stats(players):
+    st.session_state.player_pairing_counts, st.session_state.player_matchups, st.session_state.rest_counts = pbscheduler.count_schedule(
+        pbscheduler.index_rounds(st.session_state.all_rounds, players), len(players)
+    )
 
-    # Update rest counts
-    if resting_player:
-        rest_counts[resting_player] += 1
-
-    # Update pairing counts
-    for pair1, pair2 in matches:
-        for p1 in pair1:
-            for p2 in pair2:
-                player_matchups[p1][p2] += 1
-                player_matchups[p2][p1] += 1
-
-    return matches, resting_player
+def display_player_itinerary(itineraries, players):
+    player = st.selectbox("Look up a player's matches:", players, index=None, key="itinerary_player_input")
+    if player is not None:
+        st.dataframe(app_ui.itinerary_table(pbscheduler.player_itinerary(itineraries, player)), hide_index=True, use_container_width=True)
 
 def main():
     st.title("Pickleball 2v2 Optimized Round Robin Generator")
@@ -194,8 +49,6 @@ def main():
     # Initialize session state
     if 'schedule_generated' not in st.session_state:
         st.session_state.schedule_generated = False
-    if 'schedule_history' not in st.session_state:
-        st.session_state.schedule_history = []
     if 'num_players' not in st.session_state:
         st.session_state.num_players = 4
     if 'player_names' not in st.session_state:
@@ -204,12 +57,10 @@ def main():
         st.session_state.num_rounds = 3
     if 'all_rounds' not in st.session_state:
         st.session_state.all_rounds = []
+    if 'scheduled_players' not in st.session_state:
+        st.session_state.scheduled_players = []
     if 'player_matchups' not in st.session_state:
-        st.session_state.player_matchups = defaultdict(lambda: defaultdict(int))
-    if 'player_pairing_counts' not in st.session_state:
-        st.session_state.player_pairing_counts = defaultdict(lambda: defaultdict(int))
-    if 'rest_counts' not in st.session_state:
-        st.session_state.rest_counts = {}
+        st.session_state.player_pairing_counts, st.session_state.player_matchups, st.session_state.rest_counts = pbscheduler.new_count_matrices(0)
     if 'schedule_container' not in st.session_state:
         st.session_state.schedule_container = st.empty()
 
@@ -222,16 +73,17 @@ def main():
         st.session_state.schedule_generated = False
         st.rerun()
 
-    num_players = st.number_input("Enter the number of players:", min_value=2, step=1, value=st.session_state.num_players, key="num_players_input")
-
-    # Update player names if number of players changed
-    if num_players != len(st.session_state.player_names):
-        st.session_state.player_names = st.session_state.player_names[:num_players] + [f"Player {i+1}" for i in range(len(st.session_state.player_names), num_players)]
-
-    players = [st.text_input(f"Name for Player {i + 1}", value=st.session_state.player_names[i], key=f"player_{i}") for i in range(num_players)]
+    num_players, players = app_ui.roster_editor()
 
     num_rounds = st.number_input("Enter the number of rounds in the tournament:", min_value=1, step=1, value=st.session_state.num_rounds, key="num_rounds_input")
 
+    optimize_seconds = st.slider("Extra optimization time (seconds):", min_value=0, max_value=30, value=0, key="optimize_seconds_input")
+    use_all_cores = st.checkbox("Search on all CPU cores", value=False, key="use_all_cores_input")
+    schedule_number = st.number_input("Schedule number (the same number gives the same schedule):", min_value=1, step=1, value=1, key="schedule_number_input")
+    league_mode = st.checkbox("League mode (avoid partners and opponents from earlier weeks this season)", value=False, key="league_mode_input")
+    if league_mode:
+        season_path = st.text_input("Season file:", value=pbscheduler.DEFAULT_SEASON_PATH, key="season_path_input")
+
     # Update session state
     st.session_state.num_players = num_players
     st.session_state.player_names = players
@@ -239,30 +91,44 @@ def main():
 
     if st.button("Generate Tournament Schedule"):
         st.write("Generating tournament schedule...")  # Debug print
-    try:
-        st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = generate_tournament_schedule(players, num_rounds)
-        st.session_state.schedule_generated = True
-        st.session_state.schedule_history.append((players, num_rounds, st.session_state.all_rounds))
-        st.write("Schedule generated. Displaying...")  # Debug print
-        display_tournament_schedule(st.session_state.all_rounds)
-        st.write("Schedule display complete.")  # Debug print
-    except Exception as e:
-        st.error(f"An error occurred while generating the schedule: {str(e)}")
+        try:
+            if league_mode:
+                # This week is scheduled against the season so far; the stats below are this week's
+                st.session_state.season = pbscheduler.load_season(season_path)
+                st.session_state.season_path = season_path
+                st.session_state.round_stream = pbscheduler.season_rounds(st.session_state.season, players, seed=schedule_number)
+                st.session_state.all_rounds = list(islice(st.session_state.round_stream, num_rounds))
+                update_week_stats(players)
+            else:
+                st.session_state.season = None
+                st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = generate_tournament_schedule(players, num_rounds, optimize_seconds, use_all_cores, schedule_number)
+                # Extra rounds continue from here, so the stats below follow the live state
+                state = pbscheduler.continue_schedule(st.session_state.all_rounds, players)
+                st.session_state.player_pairing_counts, st.session_state.player_matchups, st.session_state.rest_counts = state["pairing_counts"], state["matchup_counts"], state["rest_counts"]
+                st.session_state.round_stream = pbscheduler.named_tournament_rounds(players, state)
+            st.session_state.schedule_generated = True
+            st.session_state.scheduled_players = players
+            st.session_state.itineraries = pbscheduler.itinerary_index(st.session_state.all_rounds)
+            st.session_state.history_id = app_ui.save_to_history(HISTORY_NAME, players, st.session_state.all_rounds)
+            st.write("Schedule generated. Displaying...")  # Debug print
+            display_tournament_schedule(st.session_state.all_rounds)
+            st.write("Schedule display complete.")  # Debug print
+        except Exception as e:
+            st.error(f"An error occurred while generating the schedule: {str(e)}")
 
     if st.session_state.schedule_generated:
         if st.button("Add Additional Round"):
             try:
-                new_matches, new_resting_player = generate_additional_round(
-                players,
-                    st.session_state.player_pairing_counts,
-                    st.session_state.rest_counts,
-                    st.session_state.player_matchups
-                )
-                st.session_state.all_rounds.append((new_matches, new_resting_player))
+                new_round = next(st.session_state.round_stream)
+                st.session_state.all_rounds.append(new_round)
+                pbscheduler.add_round(st.session_state.itineraries, new_round)
                 st.session_state.num_rounds += 1
+                if st.session_state.get('season') is not None:
+                    update_week_stats(st.session_state.scheduled_players)
 
-                # Update the schedule history
-                st.session_state.schedule_history[-1] = (players, st.session_state.num_rounds, st.session_state.all_rounds)
+                # The saved schedule gets a new version with the extra round
+                with app_ui.tournament_store() as conn:
+                    pbscheduler.save_schedule(conn, st.session_state.history_id, st.session_state.scheduled_players, st.session_state.all_rounds)
 
                 # Display the updated schedule
                 display_tournament_schedule(st.session_state.all_rounds)
@@ -272,13 +138,29 @@ def main():
 
         # Add buttons to show statistics
         if st.button("Show Times Players Faced Each Other"):
-            display_player_matchup_counts(st.session_state.player_matchups)
+            display_player_matchup_counts(st.session_state.player_matchups, st.session_state.scheduled_players)
 
         if st.button("Show Times Players Paired Together"):
-            display_partnership_stats(st.session_state.player_pairing_counts)
+            display_partnership_stats(st.session_state.player_pairing_counts, st.session_state.scheduled_players)
 
         if st.button("Show Rest Statistics"):
-            display_rest_stats(st.session_state.rest_counts)
+            display_rest_stats(st.session_state.rest_counts, st.session_state.scheduled_players)
+
+        if st.button("Show Schedule Quality"):
+            app_ui.display_schedule_quality(app_ui.schedule_metrics(
+                st.session_state.player_pairing_counts,
+                st.session_state.player_matchups,
+                st.session_state.rest_counts,
+                st.session_state.all_rounds,
+                st.session_state.scheduled_players
+            ))
+
+        if st.session_state.get('season') is not None and st.button("Finish Week (add to season history)"):
+            season = st.session_state.season
+            pbscheduler.record_week(season, st.session_state.all_rounds)
+            pbscheduler.save_season(season, st.session_state.season_path)
+            st.session_state.season = None  # Each week is added once
+            st.success(f"Week {season['weeks']} added to the season ({len(season['players'])} members).")
 
         printable_schedule = generate_printable_schedule(st.session_state.all_rounds)
         st.download_button(
@@ -287,9 +169,29 @@ def main():
             file_name="pickleball_tournament_schedule.txt",
             mime="text/plain"
         )
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            label="Download Schedule (CSV)",
+            data=app_ui.schedule_csv(st.session_state.all_rounds),
+            file_name="pickleball_tournament_schedule.csv",
+            mime="text/csv"
+        )
+        col2.download_button(
+            label="Download Player Stats (CSV)",
+            data=app_ui.player_stats_csv(
+                st.session_state.scheduled_players,
+                st.session_state.player_pairing_counts,
+                st.session_state.player_matchups,
+                st.session_state.rest_counts
+            ),
+            file_name="pickleball_player_stats.csv",
+            mime="text/csv"
+        )
+        app_ui.display_printable_sheets(st.session_state.all_rounds, st.session_state.scheduled_players)
+        display_player_itinerary(st.session_state.itineraries, st.session_state.scheduled_players)
 
     if st.button("Show Schedule History"):
-        display_schedule_history(st.session_state.schedule_history)
+        app_ui.display_schedule_history(HISTORY_NAME, display_tournament_schedule)
 
 if __name__ == "__main__":
     main()
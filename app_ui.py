@@ -0,0 +1,167 @@
+import io
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import pbscheduler
+
+# Streamlit pieces shared by the apps. The pbscheduler package stays free of
+# Streamlit, so anything that draws widgets or uses st.cache_data lives here.
+
+ROUNDS_PER_PAGE = 5
+
+@st.cache_data(show_spinner=False)
+def schedule_table(all_rounds):
+    return pd.DataFrame(pbscheduler.schedule_rows(all_rounds))
+
+def round_page(num_rounds, key):
+    num_pages = -(-num_rounds // ROUNDS_PER_PAGE)
+    if num_pages <= 1:
+        return range(num_rounds)
+    page = st.number_input(f"Page ({ROUNDS_PER_PAGE} rounds per page)", min_value=1, max_value=num_pages, value=1, key=key)
+    return range((page - 1) * ROUNDS_PER_PAGE, min(page * ROUNDS_PER_PAGE, num_rounds))
+
+@st.cache_data(show_spinner="Preparing printable sheets...")
+def printable_sheets(all_rounds, players, file_format):
+    # Wall chart, a scorecard per court and an itinerary per player
+    if file_format == "pdf":
+        out = io.BytesIO()
+        pbscheduler.write_pdf_sheets(all_rounds, players, out)
+    else:
+        out = io.StringIO()
+        pbscheduler.write_html_sheets(all_rounds, players, out)
+    return out.getvalue()
+
+def display_printable_sheets(all_rounds, players):
+    # Only rendered on request, then cached
+    if st.checkbox("Prepare printable sheets (scorecards, player itineraries, wall chart)"):
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            label="Download Printable Sheets (HTML)",
+            data=printable_sheets(all_rounds, players, "html"),
+            file_name="pickleball_tournament_sheets.html",
+            mime="text/html"
+        )
+        col2.download_button(
+            label="Download Printable Sheets (PDF)",
+            data=printable_sheets(all_rounds, players, "pdf"),
+            file_name="pickleball_tournament_sheets.pdf",
+            mime="application/pdf"
+        )
+
+def import_roster(roster_file):
+    return pbscheduler.read_roster(
+        io.TextIOWrapper(roster_file, encoding="utf-8-sig", newline=""), pbscheduler.roster_format(roster_file.name)
+    )
+
+def roster_editor():
+    # Returns the number of players and their names, as kept in session state
+
+    # A roster file fills in every name at once
+    roster_file = st.file_uploader("Import players (CSV, JSON or one name per line):", type=["csv", "json", "jsonl", "txt"], key="roster_file_input")
+    if roster_file is not None and st.session_state.get('imported_roster') != (roster_file.name, roster_file.size):
+        st.session_state.imported_roster = (roster_file.name, roster_file.size)
+        imported = import_roster(roster_file)
+        if len(imported) >= 2:
+            st.session_state.player_names = imported
+            st.session_state.num_players = len(imported)
+            st.session_state.pop('num_players_input', None)
+            st.session_state.roster_imports = st.session_state.get('roster_imports', 0) + 1
+        else:
+            st.warning("The roster file needs at least 2 player names.")
+
+    num_players = st.number_input("Enter the number of players:", min_value=2, step=1, value=st.session_state.num_players, key="num_players_input")
+
+    # Update player names if number of players changed
+    if num_players != len(st.session_state.player_names):
+        st.session_state.player_names = st.session_state.player_names[:num_players] + [f"Player {i+1}" for i in range(len(st.session_state.player_names), num_players)]
+
+    # One editable table for every name rather than an input per player
+    names = st.data_editor(
+        pd.DataFrame({"Name": st.session_state.player_names}),
+        hide_index=True,
+        use_container_width=True,
+        key=f"player_names_{num_players}_{st.session_state.get('roster_imports', 0)}",
+    )
+    return num_players, ["" if name is None else str(name) for name in names["Name"]]
+
+def csv_text(rows, columns):
+    # Rows are written one at a time into the buffer
+    out = io.StringIO()
+    pbscheduler.write_table(rows, columns, out)
+    return out.getvalue()
+
+@st.cache_data(show_spinner=False)
+def schedule_csv(all_rounds):
+    return csv_text(pbscheduler.match_rows(all_rounds), pbscheduler.export.CSV_HEADER)
+
+@st.cache_data(show_spinner=False)
+def player_stats_csv(players, player_pairing_counts, player_matchups, rest_counts):
+    return csv_text(pbscheduler.player_rows(players, player_pairing_counts, player_matchups, rest_counts), pbscheduler.export.PLAYER_COLUMNS)
+
+def results_csv(all_rounds, ledger):
+    return csv_text(pbscheduler.result_rows(all_rounds, ledger), pbscheduler.export.RESULT_COLUMNS)
+
+def count_heatmap(counts, players):
+    table = pd.DataFrame(counts, index=players, columns=players)
+    if not (table.index.is_unique and table.columns.is_unique):
+        return table  # Styling needs unique player names
+    shades = "background-color: rgba(255, 75, 75, " + (table / max(int(counts.max(initial=0)), 1)).round(2).astype(str) + ")"
+    return table.style.apply(lambda _: shades, axis=None)
+
+@st.cache_data(show_spinner=False)
+def schedule_metrics(player_pairing_counts, player_matchups, rest_counts, all_rounds, players):
+    rested = pbscheduler.rest_matrix(all_rounds, players)
+    return pbscheduler.schedule_metrics(player_pairing_counts, player_matchups, rest_counts, rested)
+
+def display_schedule_quality(metrics):
+    st.write("\n### Schedule Quality:")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Fairness score", f"{metrics['fairness']:.1f} / 100")
+    col2.metric("Opponent coverage", f"{metrics['opponent_coverage']:.0f}%")
+    col3.metric("Most times with one partner", metrics["max_repeat_partners"])
+    histograms = {
+        "Partner pairs": metrics["partner_histogram"],
+        "Opponent pairs": metrics["opponent_histogram"],
+        "Players by rests": metrics["rest_histogram"],
+        "Rest gaps (rounds played)": metrics["rest_gap_histogram"],
+    }
+    length = max(len(histogram) for histogram in histograms.values())
+    table = pd.DataFrame({name: np.pad(histogram, (0, length - len(histogram))) for name, histogram in histograms.items()})
+    st.dataframe(table.rename_axis("Times"))
+
+def itinerary_table(entries):
+    return pd.DataFrame(
+        [
+            {
+                "Round": round_number,
+                "Court": court_number,
+                "Partner": partner or "",
+                "Opponents": pbscheduler.team_text(opponents) if opponents else "Sitting out",
+            }
+            for round_number, court_number, partner, opponents in entries
+        ],
+        columns=["Round", "Court", "Partner", "Opponents"],
+    )
+
+def tournament_store():
+    return closing(pbscheduler.open_store())
+
+def save_to_history(name, players, all_rounds, settings=None):
+    # Generated schedules are saved as tournaments called `name`, so the history
+    # survives a refresh. Returns the tournament id.
+    with tournament_store() as conn:
+        return pbscheduler.create_tournament(conn, name, players, all_rounds, settings)
+
+def display_schedule_history(name, display_schedule, count=3):
+    st.write(f"### Last {count} Generated Schedules:")
+    with tournament_store() as conn:
+        tournaments = [pbscheduler.load_tournament(conn, tournament_id) for tournament_id, _, _ in pbscheduler.list_tournaments(conn, name, count)]
+    if not tournaments:
+        st.write("No History")
+    for i, tournament in enumerate(tournaments, 1):
+        st.write(f"\n**Schedule {i}:**")
+        st.write(f"Players: {', '.join(tournament['roster']['players'])}")
+        st.write(f"Number of rounds: {len(tournament['all_rounds'])}")
+        display_schedule(tournament["all_rounds"])
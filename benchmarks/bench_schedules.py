@@ -0,0 +1,144 @@
+"""Schedule generation benchmarks.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_schedules --output results.json
+    python -m benchmarks.bench_schedules --quick --compare results.json
+
+Each case records wall time, peak traced memory and schedule quality, and
+--compare flags cases that got slower or produced worse schedules.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from pbscheduler import generate_multi_court_schedule, generate_tournament_schedule, schedule_cost
+
+PLAYERS = [4, 8, 13, 16, 24, 40, 64, 100, 128, 200, 256]
+ROUNDS = [1, 5, 10, 30, 50]
+COURTS = [None, 1, 2, 4, 8, 16, 32]  # None is the everyone-plays tournament generator
+
+QUICK_PLAYERS = [8, 16, 40, 100]
+QUICK_ROUNDS = [5, 30]
+QUICK_COURTS = [None, 2, 8]
+
+SLOWER_TOLERANCE = 1.25  # Flag cases more than 25% slower than the baseline...
+SLOWER_MIN_SECONDS = 0.01  # ...and by more than timer noise
+
+
+def quality(matchup_counts, pairing_counts, rest_counts):
+    upper = np.triu_indices(len(rest_counts), 1)
+    return {
+        "max_repeat_partners": int(pairing_counts.max(initial=0)),
+        "opponent_variance": float(matchup_counts[upper].var()) if len(upper[0]) else 0.0,
+        "rest_spread": int(np.ptp(rest_counts)) if len(rest_counts) else 0,
+        "cost": schedule_cost(pairing_counts, matchup_counts, rest_counts),
+    }
+
+
+def generate(num_players, num_rounds, num_courts, seed):
+    if num_courts is None:
+        return generate_tournament_schedule(num_players, num_rounds, seed)
+    return generate_multi_court_schedule(num_players, num_rounds, num_courts, seed)
+
+
+def run_case(num_players, num_rounds, num_courts, seed, repeat):
+    case = {"players": num_players, "rounds": num_rounds, "courts": num_courts}
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = generate(num_players, num_rounds, num_courts, seed)
+        except Exception as e:
+            return {**case, "error": f"{type(e).__name__}: {e}"}
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    generate(num_players, num_rounds, num_courts, seed)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    _, matchup_counts, pairing_counts, rest_counts = result
+    return {
+        **case,
+        "seconds": min(times),
+        "peak_memory_bytes": peak_memory,
+        **quality(matchup_counts, pairing_counts, rest_counts),
+    }
+
+
+def cases(players, rounds, courts):
+    for num_players in players:
+        for num_rounds in rounds:
+            for num_courts in courts:
+                if num_courts is None or num_courts * 4 <= num_players:
+                    yield num_players, num_rounds, num_courts
+
+
+def case_key(result):
+    return result["players"], result["rounds"], result["courts"]
+
+
+def compare(results, baseline):
+    previous = {case_key(result): result for result in baseline["results"]}
+    problems = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        label = "players={} rounds={} courts={}".format(*case_key(result))
+        if "error" in result or "error" in old:
+            if "error" in result and "error" not in old:
+                problems.append(f"{label}: now fails with {result['error']}")
+            continue
+        slower = result["seconds"] - old["seconds"]
+        if result["seconds"] > old["seconds"] * SLOWER_TOLERANCE and slower > SLOWER_MIN_SECONDS:
+            problems.append(f"{label}: {old['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        if result["cost"] > old["cost"]:
+            problems.append(f"{label}: schedule cost {old['cost']} -> {result['cost']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="run a small grid")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per case (best is kept)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    args = parser.parse_args(argv)
+
+    grid = (QUICK_PLAYERS, QUICK_ROUNDS, QUICK_COURTS) if args.quick else (PLAYERS, ROUNDS, COURTS)
+    results = []
+    for num_players, num_rounds, num_courts in cases(*grid):
+        result = run_case(num_players, num_rounds, num_courts, args.seed, args.repeat)
+        results.append(result)
+        if "error" in result:
+            print(f"players={num_players:>3} rounds={num_rounds:>2} courts={str(num_courts):>4}  {result['error']}")
+            continue
+        print(
+            f"players={num_players:>3} rounds={num_rounds:>2} courts={str(num_courts):>4}  "
+            f"{result['seconds'] * 1000:9.2f} ms  {result['peak_memory_bytes'] / 1024:9.1f} KiB  "
+            f"max partner repeats={result['max_repeat_partners']}  rest spread={result['rest_spread']}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "numpy": np.__version__, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare(results, json.load(f))
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
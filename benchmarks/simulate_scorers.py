@@ -0,0 +1,167 @@
+"""Concurrent scorekeeper simulation for the tournament service.
+
+Run from the repository root:
+
+    python -m benchmarks.simulate_scorers
+    python -m benchmarks.simulate_scorers --players 160 --courts 40 --watchers 20
+
+Starts the service in-process on a free port with a temporary store, then one
+scorer task per court submits (and sometimes corrects) results round by round
+while watcher tasks long-poll for changes. Checks that every watcher ends with
+the server's results and that a fresh service reloading the store agrees with
+the live leaderboard.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from pbscheduler import create_tournament, leaderboard, multi_court_schedule, open_store, team_text
+from pbscheduler.server import live_tournament, new_service, start_server
+
+CORRECTION_RATE = 0.1  # Share of results a scorer re-enters with a different winner
+
+
+async def http_json(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    if status != 200:
+        raise RuntimeError(f"{method} {path} failed with {status}: {body.decode('utf-8', 'replace')}")
+    return json.loads(body)
+
+
+def court_result(pair1, pair2, rng):
+    scores = [11, rng.randrange(10)]
+    rng.shuffle(scores)
+    return {
+        "Team 1": team_text(pair1),
+        "Team 2": team_text(pair2),
+        "Team 1 score": scores[0],
+        "Team 2 score": scores[1],
+        "Winner": "Team 1" if scores[0] > scores[1] else "Team 2",
+    }
+
+
+async def scorer(port, tournament_id, court_number, num_rounds, seed, latencies):
+    # Enters this court's result each round, reading the current schedule first since
+    # earlier results may have replanned it
+    rng = random.Random(seed)
+    for round_number in range(1, num_rounds + 1):
+        state = await http_json(port, "GET", f"/tournaments/{tournament_id}")
+        matches = state["tournament"]["all_rounds"][round_number - 1][0]
+        if court_number > len(matches):
+            continue
+        pair1, pair2 = matches[court_number - 1]
+        entries = [court_result(pair1, pair2, rng)]
+        if rng.random() < CORRECTION_RATE:
+            entries.append(court_result(pair1, pair2, rng))
+        for result in entries:
+            start = time.perf_counter()
+            await http_json(port, "POST", f"/tournaments/{tournament_id}/results",
+                            {"results": [{"round": round_number, "match": court_number, "result": result}]})
+            latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(rng.random() * 0.01)
+
+
+async def watcher(port, tournament_id, finished, seen):
+    # Keeps its own copy of the results from the pushed changes alone, until it has
+    # caught up with the final version once the scorers are finished
+    state = await http_json(port, "GET", f"/tournaments/{tournament_id}")
+    version = state["version"]
+    results = {(r["round"], r["match"]): r["result"] for r in state["tournament"]["results"]}
+    while version < finished.get("version", float("inf")):
+        update = await http_json(port, "GET", f"/tournaments/{tournament_id}/updates?since={version}&wait=1")
+        if "tournament" in update:
+            results = {(r["round"], r["match"]): r["result"] for r in update["tournament"]["results"]}
+        for change in update.get("changes", ()):
+            if change["type"] == "result":
+                results[(change["round"], change["match"])] = change["result"]
+            seen.append(change["version"])
+        version = update["version"]
+    return results
+
+
+async def simulate(args):
+    store = os.path.join(tempfile.mkdtemp(), "tournaments.sqlite3")
+    players = [f"Player {i + 1}" for i in range(args.players)]
+    all_rounds = multi_court_schedule(players, args.rounds, args.courts, args.seed)[0]
+    conn = open_store(store)
+    tournament_id = create_tournament(
+        conn, "Simulation", players, all_rounds,
+        {"num_rounds": args.rounds, "num_courts": args.courts, "points_per_win": 1, "balance_skill": args.balance_skill},
+        {"active": players, "late_additions": []},
+    )
+    conn.close()
+
+    server = await start_server(port=0, store=store)
+    port = server.sockets[0].getsockname()[1]
+    finished = {}
+    latencies, seen = [], []
+    start = time.perf_counter()
+    watchers = [asyncio.create_task(watcher(port, tournament_id, finished, seen)) for _ in range(args.watchers)]
+    await asyncio.gather(*(
+        scorer(port, tournament_id, court_number, args.rounds, args.seed * 1000 + court_number, latencies)
+        for court_number in range(1, args.courts + 1)
+    ))
+    final = await http_json(port, "GET", f"/tournaments/{tournament_id}")
+    finished["version"] = final["version"]
+    watcher_results = await asyncio.gather(*watchers)
+    seconds = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+
+    # A fresh service must rebuild the same state from the store alone
+    reloaded = live_tournament(new_service(open_store(store)), tournament_id)
+    final_results = {(r["round"], r["match"]): r["result"] for r in final["tournament"]["results"]}
+    problems = []
+    if [list(entry) for entry in leaderboard(reloaded["ledger"])] != final["leaderboard"]:
+        problems.append("reloaded leaderboard differs from the live one")
+    if reloaded["version"] != final["version"]:
+        problems.append(f"reloaded version {reloaded['version']} != live version {final['version']}")
+    problems += [f"watcher {i} missed results" for i, results in enumerate(watcher_results) if results != final_results]
+
+    latencies = np.array(latencies) * 1000
+    print(
+        f"{len(latencies)} submissions from {args.courts} scorers, {args.watchers} watchers, "
+        f"{len(seen)} changes pushed in {seconds:.2f} s"
+    )
+    print(
+        f"submit latency p50={np.percentile(latencies, 50):.1f} ms p95={np.percentile(latencies, 95):.1f} ms "
+        f"max={latencies.max():.1f} ms; final version {final['version']}"
+    )
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=96)
+    parser.add_argument("--rounds", type=int, default=8)
+    parser.add_argument("--courts", type=int, default=24, help="one scorer per court")
+    parser.add_argument("--watchers", type=int, default=10, help="clients long-polling for changes")
+    parser.add_argument("--balance-skill", action="store_true", help="replan by rating as results come in")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    problems = asyncio.run(simulate(args))
+    for problem in problems:
+        print(f"PROBLEM {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from .annealing import optimize_schedule
+from .cache import cached_schedule
+from .client import fetch_player, fetch_tournament, fetch_updates, server_url, submit_results, submit_roster
+from .core import (
+    assign_courts,
+    count_schedule,
+    create_matches,
+    create_optimized_pairings,
+    generate_tournament_schedule,
+    grow_count_matrices,
+    index_players,
+    index_rounds,
+    iter_tournament_rounds,
+    make_rng,
+    name_round,
+    name_rounds,
+    new_count_matrices,
+    new_schedule_state,
+    next_round,
+    schedule_cost,
+    schedule_state,
+    sitting_players,
+)
+from .designs import whist_design, whist_schedule
+from .export import (
+    match_rows,
+    player_rows,
+    read_roster,
+    result_rows,
+    roster_format,
+    write_parquet,
+    write_schedule_json,
+    write_table,
+)
+from .itinerary import (
+    add_round,
+    itinerary_index,
+    next_match,
+    player_itinerary,
+    truncate_itineraries,
+    upcoming_entries,
+    update_itinerary_index,
+)
+from .league import (
+    DEFAULT_SEASON_PATH,
+    add_members,
+    load_season,
+    new_season,
+    record_week,
+    save_season,
+    season_rounds,
+)
+from .leaderboard import (
+    adjust_score,
+    court_awards,
+    court_winner,
+    leaderboard,
+    match_awards,
+    new_ledger,
+    rebuild_ledger,
+    record_result,
+    rounds_played,
+)
+from .matching import min_cost_perfect_matching
+from .metrics import fairness_score, opponent_coverage, repeat_histogram, rest_gaps, rest_matrix, schedule_metrics
+from .multicourt import generate_multi_court_schedule
+from .objective import DEFAULT_OBJECTIVE, make_objective, objective_key, preferred_court_costs
+from .parallel import best_of_n, parallel_multi_court_schedule, parallel_tournament_schedule
+from .render import (
+    generate_printable_schedule,
+    schedule_rows,
+    schedule_sheets,
+    team_text,
+    write_html_sheets,
+    write_pdf_sheets,
+    write_printable_schedule,
+)
+from .ratings import new_ratings, rating, rating_array, record_rating_result
+from .roster import reschedule, update_roster
+from .store import append_result, create_tournament, list_tournaments, load_tournament, open_store, save_schedule
+from .schedules import continue_schedule, multi_court_schedule, named_tournament_rounds, tournament_schedule
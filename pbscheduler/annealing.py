@@ -0,0 +1,146 @@
+import math
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .core import count_schedule, lineup_round, make_rng, round_lineup, schedule_cost
+from .objective import make_objective
+
+# Whole-schedule local search. Each round is a flat lineup of player ids (four slots
+# per match, then the players sitting out) and a move swaps two slots of one round.
+# Only the one or two matches touched by a swap are rescored, so a move is O(1).
+
+PARTNER = 0
+OPPONENT = 1
+START_TEMPERATURE_FACTOR = 2.0  # Times the heaviest count weight
+END_TEMPERATURE = 0.05
+MOVES_PER_CLOCK_CHECK = 256
+
+
+def match_edges(lineup, match, changes, sign):
+    a, b, c, d = lineup[4 * match:4 * match + 4]
+    for kind, p, q in (
+        (PARTNER, a, b), (PARTNER, c, d),
+        (OPPONENT, a, c), (OPPONENT, a, d), (OPPONENT, b, c), (OPPONENT, b, d),
+    ):
+        key = (kind, p, q) if p < q else (kind, q, p)
+        changes[key] += sign
+
+
+def swap_changes(lineup, num_matches, i, j):
+    # Net (kind, player, player) -> count change if slots i and j of this lineup swap
+    matches = {slot // 4 for slot in (i, j) if slot < 4 * num_matches}
+    changes = defaultdict(int)
+    for match in matches:
+        match_edges(lineup, match, changes, -1)
+    lineup[i], lineup[j] = lineup[j], lineup[i]
+    for match in matches:
+        match_edges(lineup, match, changes, 1)
+    lineup[i], lineup[j] = lineup[j], lineup[i]
+    return changes
+
+
+def rest_changes(lineup, num_matches, i, j):
+    playing = 4 * num_matches
+    if (i < playing) == (j < playing):
+        return ()
+    sitting_slot, playing_slot = (i, j) if i >= playing else (j, i)
+    # The sitting player starts playing and the playing one sits out
+    return ((lineup[sitting_slot], -1), (lineup[playing_slot], 1))
+
+
+def move_delta(changes, rests, pairing_counts, matchup_counts, rest_counts, objective):
+    delta = 0
+    for (kind, p, q), change in changes.items():
+        if change == 0:
+            continue
+        if kind == PARTNER:
+            count = pairing_counts[p, q]
+            delta += objective["partner"] * ((count + change) ** 2 - count ** 2)
+        else:
+            count = matchup_counts[p, q]
+            delta += objective["opponent"] * ((count + change) ** 2 - count ** 2)
+    for player, change in rests:
+        count = rest_counts[player]
+        delta += objective["rest"] * ((count + change) ** 2 - count ** 2)
+    return delta
+
+
+def apply_move(changes, rests, pairing_counts, matchup_counts, rest_counts):
+    for (kind, p, q), change in changes.items():
+        counts = pairing_counts if kind == PARTNER else matchup_counts
+        counts[p, q] += change
+        counts[q, p] += change
+    for player, change in rests:
+        rest_counts[player] += change
+
+
+def anneal_lineups(lineups, num_matches, num_players, rng, time_budget, max_moves=None, objective=None):
+    if time_budget is None and max_moves is None:
+        raise ValueError("Annealing needs a time budget or a move budget")
+    objective = make_objective(objective)
+    heaviest = max(objective["partner"], objective["opponent"], objective["rest"], 1)
+    start_temperature = START_TEMPERATURE_FACTOR * heaviest
+    lineups = [list(map(int, lineup)) for lineup in lineups]
+    pairing_counts, matchup_counts, rest_counts = count_schedule(
+        [lineup_round(np.array(lineup), k) for lineup, k in zip(lineups, num_matches)], num_players
+    )
+    cost = schedule_cost(pairing_counts, matchup_counts, rest_counts, objective)
+    best_cost = cost
+    best_lineups = [lineup.copy() for lineup in lineups]
+
+    movable = [r for r, lineup in enumerate(lineups) if len(lineup) > 1 and num_matches[r] > 0]
+    if not movable:
+        return best_lineups, best_cost
+
+    # A move budget instead of (or as well as) a clock budget makes the search reproducible
+    start = time.perf_counter()
+    moves = 0
+    while True:
+        progress = 0.0
+        if time_budget is not None:
+            progress = (time.perf_counter() - start) / time_budget
+        if max_moves is not None:
+            progress = max(progress, moves / max_moves)
+        if progress >= 1.0:
+            break
+        temperature = start_temperature * (END_TEMPERATURE / start_temperature) ** progress
+        moves += MOVES_PER_CLOCK_CHECK
+
+        rounds = rng.choice(movable, MOVES_PER_CLOCK_CHECK)
+        draws = rng.random((MOVES_PER_CLOCK_CHECK, 3))
+        for r, (u, v, accept) in zip(rounds, draws):
+            lineup = lineups[r]
+            i = int(u * len(lineup))
+            j = int(v * len(lineup))
+            if i == j or (i // 2 == j // 2 and j < 4 * num_matches[r]):
+                continue  # Same slot or same team: nothing changes
+
+            changes = swap_changes(lineup, num_matches[r], i, j)
+            rests = rest_changes(lineup, num_matches[r], i, j)
+            delta = move_delta(changes, rests, pairing_counts, matchup_counts, rest_counts, objective)
+            if delta > 0 and accept >= math.exp(-delta / temperature):
+                continue
+
+            apply_move(changes, rests, pairing_counts, matchup_counts, rest_counts)
+            lineup[i], lineup[j] = lineup[j], lineup[i]
+            cost += delta
+            if cost < best_cost:
+                best_cost = cost
+                best_lineups = [lineup.copy() for lineup in lineups]
+
+    return best_lineups, best_cost
+
+
+def optimize_schedule(all_rounds, num_players, time_budget=1.0, seed=None, max_moves=None, objective=None):
+    # Improves a generate_tournament_schedule result for up to `time_budget` seconds
+    # and/or `max_moves` swaps
+    rng = make_rng(seed)
+    num_matches = [len(matches) for matches, _, _ in all_rounds]
+    lineups = [round_lineup(*round_) for round_ in all_rounds]
+    best_lineups, _ = anneal_lineups(lineups, num_matches, num_players, rng, time_budget, max_moves, objective)
+
+    all_rounds = [lineup_round(np.array(lineup), k) for lineup, k in zip(best_lineups, num_matches)]
+    pairing_counts, matchup_counts, rest_counts = count_schedule(all_rounds, num_players)
+    return all_rounds, matchup_counts, pairing_counts, rest_counts
@@ -0,0 +1,126 @@
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from .core import count_schedule
+
+# Schedules depend only on the shape of the problem, so they are cached on disk in
+# index form and mapped onto real names at display time. Each round is stored as
+#   [num_matches, resting_kind, num_resting, num_bye, *matches, *resting, *bye]
+# with resting_kind 0 = nobody, 1 = a single player id, 2 = a list of player ids.
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pbscheduler", "schedules.sqlite3")
+DEFAULT_MAX_ENTRIES = 512
+CACHE_DTYPE = np.int16
+# Part of every key: bump it whenever generation or the round encoding changes, so
+# schedules cached by an older version are never reused
+GENERATOR_VERSION = 2
+
+NO_REST = 0
+SINGLE_REST = 1
+LIST_REST = 2
+
+
+def cache_path():
+    return os.environ.get("PBSCHEDULER_CACHE", DEFAULT_CACHE_PATH)
+
+
+def open_cache(path=None):
+    path = path or cache_path()
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schedules ("
+        " num_players INTEGER, num_rounds INTEGER, num_courts INTEGER, seed INTEGER, objective TEXT,"
+        " data BLOB, last_used REAL,"
+        " PRIMARY KEY (num_players, num_rounds, num_courts, seed, objective))"
+    )
+    return conn
+
+
+def encode_rounds(all_rounds):
+    parts = []
+    for matches, resting, bye_team in all_rounds:
+        matches = np.asarray(matches).reshape(-1)
+        if resting is None:
+            kind, resting = NO_REST, []
+        elif np.ndim(resting) == 0:
+            kind, resting = SINGLE_REST, [resting]
+        else:
+            kind = LIST_REST
+        bye_team = [] if bye_team is None else bye_team
+        parts.append([len(matches) // 4, kind, len(resting), len(bye_team)])
+        parts.extend((matches, resting, bye_team))
+    return np.concatenate([np.asarray(part, dtype=CACHE_DTYPE) for part in parts]).tobytes()
+
+
+def decode_rounds(data):
+    values = np.frombuffer(data, dtype=CACHE_DTYPE).astype(np.int64)
+    all_rounds = []
+    i = 0
+    while i < len(values):
+        num_matches, kind, num_resting, num_bye = values[i:i + 4]
+        i += 4
+        matches = values[i:i + 4 * num_matches].reshape(-1, 2, 2)
+        i += 4 * num_matches
+        resting = values[i:i + num_resting]
+        i += num_resting
+        bye_team = values[i:i + num_bye] if num_bye else None
+        i += num_bye
+        if kind == NO_REST:
+            resting = None
+        elif kind == SINGLE_REST:
+            resting = int(resting[0])
+        all_rounds.append((matches, resting, bye_team))
+    return all_rounds
+
+
+def cache_get(conn, key):
+    row = conn.execute(
+        "SELECT data FROM schedules WHERE num_players = ? AND num_rounds = ? AND num_courts = ? AND seed = ?"
+        " AND objective = ?",
+        key,
+    ).fetchone()
+    if row is None:
+        return None
+    with conn:
+        conn.execute(
+            "UPDATE schedules SET last_used = ? WHERE num_players = ? AND num_rounds = ? AND num_courts = ?"
+            " AND seed = ? AND objective = ?",
+            (time.time(), *key),
+        )
+    return decode_rounds(row[0])
+
+
+def cache_put(conn, key, all_rounds, max_entries=DEFAULT_MAX_ENTRIES):
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*key, encode_rounds(all_rounds), time.time()),
+        )
+        # Least recently used schedules go first
+        conn.execute(
+            "DELETE FROM schedules WHERE rowid NOT IN"
+            " (SELECT rowid FROM schedules ORDER BY last_used DESC LIMIT ?)",
+            (max_entries,),
+        )
+
+
+def cached_schedule(generate, num_players, num_rounds, num_courts=0, seed=0, objective="default", path=None,
+                    max_entries=DEFAULT_MAX_ENTRIES):
+    # `generate()` runs only on a cache miss and must return generate_tournament_schedule's tuple
+    key = (num_players, num_rounds, num_courts, seed, f"v{GENERATOR_VERSION},{objective}")
+    conn = open_cache(path)
+    try:
+        all_rounds = cache_get(conn, key)
+        if all_rounds is None:
+            all_rounds = generate()[0]
+            cache_put(conn, key, all_rounds, max_entries)
+    finally:
+        conn.close()
+
+    pairing_counts, matchup_counts, rest_counts = count_schedule(all_rounds, num_players)
+    return all_rounds, matchup_counts, pairing_counts, rest_counts
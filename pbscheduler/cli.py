@@ -0,0 +1,132 @@
+import argparse
+import sys
+from contextlib import nullcontext
+
+from .export import (
+    CSV_HEADER,
+    PLAYER_COLUMNS,
+    match_rows,
+    player_rows,
+    read_roster,
+    roster_format,
+    write_parquet,
+    write_schedule_json,
+    write_table,
+)
+from .objective import DEFAULT_OBJECTIVE, make_objective
+from .render import write_html_sheets, write_pdf_sheets, write_printable_schedule
+from .schedules import multi_court_schedule, tournament_schedule
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="pbscheduler", description="Generate pickleball doubles schedules.")
+    roster = parser.add_mutually_exclusive_group(required=True)
+    roster.add_argument("--players", type=int, help="number of players, named Player 1..N")
+    roster.add_argument("--names", help="comma-separated player names")
+    roster.add_argument("--names-file", help="roster file: one name per line, or .csv/.json/.jsonl")
+    parser.add_argument("--rounds", type=int, default=3, help="number of rounds (default: 3)")
+    parser.add_argument("--courts", type=int, help="schedule a fixed number of courts per round")
+    parser.add_argument("--seed", type=int, default=1, help="schedule number; the same seed gives the same schedule")
+    parser.add_argument("--optimize-seconds", type=float, default=0, help="extra annealing time per schedule")
+    parser.add_argument("--all-cores", action="store_true", help="search on every CPU core and keep the best")
+    parser.add_argument(
+        "--method", choices=["matching", "random"], default="matching",
+        help="pair partners by min-cost matching (default) or keep the best of --candidates random pairings",
+    )
+    parser.add_argument(
+        "--candidates", type=int, default=1000,
+        help="random pairings scored per round with --method random (default: 1000)",
+    )
+    parser.add_argument(
+        "--weight", action="append", default=[], metavar="TERM=VALUE",
+        help=f"objective weight, repeatable; terms: {', '.join(DEFAULT_OBJECTIVE)}. rest=0 lets anyone sit out;"
+             " otherwise the size of the rest weight only counts with --optimize-seconds or --all-cores",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the schedule cache")
+    parser.add_argument(
+        "--format", choices=["json", "csv", "jsonl", "parquet", "text", "html", "pdf"], default="json",
+        help="html and pdf are printable sheets: wall chart, court scorecards and player itineraries",
+    )
+    parser.add_argument(
+        "--table", choices=["schedule", "players"], default="schedule",
+        help="write the schedule, or per-player totals (csv, jsonl or parquet)",
+    )
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def read_players(args):
+    if args.players is not None:
+        return [f"Player {i + 1}" for i in range(args.players)]
+    if args.names is not None:
+        return [name.strip() for name in args.names.split(",") if name.strip()]
+    with open(args.names_file, encoding="utf-8-sig", newline="") as f:
+        return read_roster(f, roster_format(args.names_file))
+
+
+def read_objective(args):
+    weights = {}
+    for setting in args.weight:
+        term, _, value = setting.partition("=")
+        try:
+            weights[term.strip()] = float(value)
+        except ValueError:
+            sys.exit(f"pbscheduler: bad --weight {setting!r}, expected TERM=VALUE")
+    try:
+        return make_objective(weights)
+    except ValueError as e:
+        sys.exit(f"pbscheduler: {e}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    players = read_players(args)
+    if len(players) < 4:
+        sys.exit("pbscheduler: at least 4 players are needed")
+    if args.format == "parquet" and not args.output:
+        sys.exit("pbscheduler: --format parquet needs --output")
+    if args.table == "players" and args.format not in ("csv", "jsonl", "parquet"):
+        sys.exit("pbscheduler: --table players is written as csv, jsonl or parquet")
+    if args.candidates < 1:
+        sys.exit("pbscheduler: --candidates must be at least 1")
+    objective = read_objective(args)
+
+    if args.courts:
+        all_rounds, matchup_counts, pairing_counts, rest_counts = multi_court_schedule(
+            players, args.rounds, args.courts, args.seed, objective, method=args.method, candidates=args.candidates,
+            use_cache=not args.no_cache,
+        )
+    else:
+        all_rounds, matchup_counts, pairing_counts, rest_counts = tournament_schedule(
+            players, args.rounds, args.optimize_seconds, args.all_cores, args.seed, use_cache=not args.no_cache,
+            objective=objective, method=args.method, candidates=args.candidates,
+        )
+
+    if args.table == "players":
+        rows, columns = player_rows(players, pairing_counts, matchup_counts, rest_counts), PLAYER_COLUMNS
+    else:
+        rows, columns = match_rows(all_rounds), CSV_HEADER
+    if args.format == "parquet":
+        try:
+            write_parquet(rows, columns, args.output)
+        except ImportError as e:
+            sys.exit(f"pbscheduler: {e}")
+        return
+    if args.format == "pdf":
+        with open(args.output, "wb") if args.output else nullcontext(sys.stdout.buffer) as out:
+            write_pdf_sheets(all_rounds, players, out)
+        return
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            write_schedule_json(all_rounds, out)
+        elif args.format == "text":
+            write_printable_schedule(all_rounds, out)
+        elif args.format == "html":
+            write_html_sheets(all_rounds, players, out)
+        else:
+            write_table(rows, columns, out, args.format)
+    finally:
+        if args.output:
+            out.close()
@@ -0,0 +1,61 @@
+import json
+import os
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+# Blocking client for the tournament service in pbscheduler.server, for apps like the
+# Streamlit ones. Tournaments come back in the same form as store.load_tournament.
+
+REQUEST_TIMEOUT = 10.0
+
+
+def server_url():
+    # e.g. http://127.0.0.1:8765, or None to work from the store directly
+    return os.environ.get("PBSCHEDULER_SERVER")
+
+
+def request_json(url, payload=None, timeout=REQUEST_TIMEOUT):
+    data = None if payload is None else json.dumps(payload, default=lambda v: v.item()).encode("utf-8")
+    request = Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+def read_tournament(snapshot):
+    tournament = dict(snapshot["tournament"], version=snapshot["version"])
+    tournament["results"] = {
+        (record["round"], record["match"]): record["result"] for record in tournament["results"]
+    }
+    return tournament
+
+
+def fetch_tournament(server, tournament_id):
+    return read_tournament(request_json(f"{server}/tournaments/{tournament_id}"))
+
+
+def fetch_updates(server, tournament_id, since, wait=0):
+    # {"version", "changes"}, or {"version", "tournament"} when too far behind to catch up
+    update = request_json(
+        f"{server}/tournaments/{tournament_id}/updates?{urlencode({'since': since, 'wait': wait})}",
+        timeout=REQUEST_TIMEOUT + wait,
+    )
+    if "tournament" in update:
+        return {"version": update["version"], "tournament": read_tournament(update)}
+    return update
+
+
+def fetch_player(server, tournament_id, player):
+    # {"player", "rounds_played", "next", "itinerary"}; entries are
+    # [round, court, partner, opponents] as in pbscheduler.itinerary
+    return request_json(f"{server}/tournaments/{tournament_id}/players/{quote(player, safe='')}")
+
+
+def submit_results(server, tournament_id, results):
+    # `results` maps (round, match) to a court result; returns the new version
+    records = [{"round": round_number, "match": match_number, "result": result}
+               for (round_number, match_number), result in results.items()]
+    return request_json(f"{server}/tournaments/{tournament_id}/results", {"results": records})["version"]
+
+
+def submit_roster(server, tournament_id, roster):
+    return request_json(f"{server}/tournaments/{tournament_id}/roster", {"roster": roster})["version"]
@@ -0,0 +1,405 @@
+from itertools import islice
+
+import numpy as np
+
+from .designs import whist_schedule
+from .matching import min_cost_perfect_matching
+from .objective import RATING_SCALE, make_objective, opponent_cost_matrix, partner_cost_matrix, rest_costs
+
+# Players are referred to by dense integer ids (their position in the roster) so
+# that partner, opponent and rest counts can live in flat NumPy arrays instead of
+# nested dicts keyed by display names.
+
+COUNT_DTYPE = np.int32
+SAMPLE_CHUNK = 4096
+
+
+def make_rng(seed=None):
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def index_players(players):
+    return {player: i for i, player in enumerate(players)}
+
+
+def new_count_matrices(num_players):
+    pairing_counts = np.zeros((num_players, num_players), dtype=COUNT_DTYPE)
+    matchup_counts = np.zeros((num_players, num_players), dtype=COUNT_DTYPE)
+    rest_counts = np.zeros(num_players, dtype=COUNT_DTYPE)
+    return pairing_counts, matchup_counts, rest_counts
+
+
+def grow_count_matrices(pairing_counts, matchup_counts, rest_counts, num_players):
+    extra = num_players - len(rest_counts)
+    if extra <= 0:
+        return pairing_counts, matchup_counts, rest_counts
+    pairing_counts = np.pad(pairing_counts, ((0, extra), (0, extra)))
+    matchup_counts = np.pad(matchup_counts, ((0, extra), (0, extra)))
+    rest_counts = np.pad(rest_counts, (0, extra))
+    return pairing_counts, matchup_counts, rest_counts
+
+
+def choose_player_to_rest(player_ids, rest_counts, rng, objective=None):
+    costs = rest_costs(rest_counts, player_ids, objective)
+    candidates = player_ids[costs == costs.min()]
+    return int(rng.choice(candidates))
+
+
+def choose_resting_player(player_ids, rest_counts, rng, objective=None):
+    player_ids = np.asarray(player_ids)
+    if len(player_ids) % 2 == 0:
+        return player_ids, None
+    resting_player = choose_player_to_rest(player_ids, rest_counts, rng, objective)
+    return player_ids[player_ids != resting_player], resting_player
+
+
+def score_pairings(pairs, partner_cost):
+    # Scores one round (k, 2) or a whole batch of candidate rounds (K, k, 2) at once
+    return partner_cost[pairs[..., 0], pairs[..., 1]].sum(axis=-1)
+
+
+def generate_random_pairings(available, rng, candidates=1):
+    shuffled = rng.permuted(np.tile(available, (candidates, 1)), axis=1)
+    return shuffled.reshape(candidates, -1, 2)
+
+
+def record_pairings(pairs, pairing_counts):
+    # Pairs within a round are disjoint, so fancy-indexed increments never collide
+    pairing_counts[pairs[:, 0], pairs[:, 1]] += 1
+    pairing_counts[pairs[:, 1], pairs[:, 0]] += 1
+
+
+def random_search_pairings(player_ids, pairing_counts, rest_counts, rng, candidates=1000, ratings=None,
+                           objective=None):
+    available, resting_player = choose_resting_player(player_ids, rest_counts, rng, objective)
+    partner_cost = partner_cost_matrix(pairing_counts, objective, ratings, available)
+    best_pairings = None
+    best_score = None
+
+    # Sample in bounded chunks so huge candidate counts don't blow up memory
+    for start in range(0, candidates, SAMPLE_CHUNK):
+        batch = generate_random_pairings(available, rng, min(SAMPLE_CHUNK, candidates - start))
+        scores = score_pairings(batch, partner_cost)
+        best = np.argmin(scores)
+        if best_score is None or scores[best] < best_score:
+            best_score = scores[best]
+            best_pairings = batch[best]
+
+    return best_pairings, resting_player
+
+
+def matching_pairings(player_ids, pairing_counts, rest_counts, rng, kicks=20, ratings=None, objective=None):
+    available, resting_player = choose_resting_player(player_ids, rest_counts, rng, objective)
+    cost = partner_cost_matrix(pairing_counts, objective, ratings, available)
+    pairs = min_cost_perfect_matching(available, cost, rng, kicks)
+    return pairs, resting_player
+
+
+def create_optimized_pairings(player_ids, pairing_counts, rest_counts, rng, method="matching", kicks=20,
+                              candidates=1000, ratings=None, objective=None):
+    # `ratings` (one per player id) adds the objective's skill term: strong players are
+    # teamed with weaker ones so team totals stay close to average
+    if method == "matching":
+        pairs, resting_player = matching_pairings(
+            player_ids, pairing_counts, rest_counts, rng, kicks, ratings, objective
+        )
+    elif method == "random":
+        pairs, resting_player = random_search_pairings(
+            player_ids, pairing_counts, rest_counts, rng, candidates, ratings, objective
+        )
+    else:
+        raise ValueError(f"Unknown pairing method: {method}")
+    return pairs, resting_player
+
+
+def team_key(pair):
+    a, b = int(pair[0]), int(pair[1])
+    return (a, b) if a < b else (b, a)
+
+
+def match_costs(pairs, match_history, opponent_cost, objective, ratings=None):
+    # cost[i, j] of team i facing team j: the four opponent costs, plus rematch and
+    # skill gap terms
+    cost = opponent_cost[pairs[:, None, :, None], pairs[None, :, None, :]].sum(axis=(2, 3))
+    keys = [team_key(pair) for pair in pairs]
+    for i, key1 in enumerate(keys):
+        for j, key2 in enumerate(keys):
+            if (key1, key2) in match_history:
+                cost[i, j] += objective["repeat_match"]
+    if ratings is not None and objective["skill"]:
+        strength = ratings[pairs].sum(axis=1)
+        gap = (strength[:, None] - strength[None, :]) / RATING_SCALE
+        cost += objective["skill"] * gap ** 2
+    return cost
+
+
+def record_matches(matches, match_history, matchup_counts):
+    for pair1, pair2 in matches:
+        match_history.add((team_key(pair1), team_key(pair2)))
+        match_history.add((team_key(pair2), team_key(pair1)))
+    if len(matches):
+        team1 = matches[:, 0, :]
+        team2 = matches[:, 1, :]
+        # Every player in a round appears once, so these index sets never collide
+        matchup_counts[team1[:, :, None], team2[:, None, :]] += 1
+        matchup_counts[team2[:, :, None], team1[:, None, :]] += 1
+
+
+def choose_bye_team(pairs, rest_counts, rng, objective=None):
+    # With an odd number of teams one sits out; prefer the team that has rested least
+    # (with a rest weight of 0 any team may)
+    if len(pairs) % 2 == 0:
+        return pairs, None
+    costs = rest_costs(rest_counts, pairs, objective).sum(axis=1)
+    candidates = np.flatnonzero(costs == costs.min())
+    bye = int(rng.choice(candidates))
+    return np.delete(pairs, bye, axis=0), pairs[bye]
+
+
+def create_matches(pairs, match_history, matchup_counts, rest_counts, rng, kicks=20, ratings=None,
+                   objective=None):
+    pairs, bye_team = choose_bye_team(pairs, rest_counts, rng, objective)
+    if len(pairs) == 0:
+        return np.empty((0, 2, 2), dtype=np.int64), bye_team
+
+    # Opponents are a min-cost perfect matching over teams, so this always terminates
+    objective = make_objective(objective)
+    cost = match_costs(pairs, match_history, opponent_cost_matrix(matchup_counts, objective), objective, ratings)
+    teams = min_cost_perfect_matching(np.arange(len(pairs)), cost, rng, kicks)
+    return pairs[teams], bye_team
+
+
+def assign_courts(matches, court_costs, objective=None):
+    # Reorders matches so that match i, played on court i, gives the least total
+    # court cost: pairwise court swaps while any of them helps
+    weight = make_objective(objective)["court"]
+    num_matches = len(matches)
+    if court_costs is None or weight == 0 or num_matches < 2:
+        return matches
+    usable = min(num_matches, court_costs.shape[1])
+    costs = np.zeros((num_matches, num_matches))
+    costs[:, :usable] = weight * court_costs[matches.reshape(num_matches, 4), :usable].sum(axis=1)
+
+    order = np.arange(num_matches)  # order[c] is the match on court c
+    while True:
+        on_court = costs[order]
+        current = np.diag(on_court)
+        gain = current[:, None] + current[None, :] - on_court - on_court.T
+        c, d = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[c, d] <= 1e-9:
+            break
+        order[c], order[d] = order[d], order[c]
+    return matches[order]
+
+
+def generate_tournament_schedule(num_players, num_rounds, seed=None, method="matching", kicks=20,
+                                 candidates=1000, use_designs=True, objective=None):
+    rng = make_rng(seed)
+    if use_designs:
+        # Known-optimal constructions need no search at all
+        all_rounds = whist_schedule(num_players, num_rounds, rng)
+        if all_rounds is not None:
+            pairing_counts, matchup_counts, rest_counts = count_schedule(all_rounds, num_players)
+            return all_rounds, matchup_counts, pairing_counts, rest_counts
+
+    state = new_schedule_state(num_players)
+    rounds = iter_tournament_rounds(
+        np.arange(num_players), state, rng, method, kicks, candidates, objective=objective
+    )
+    all_rounds = list(islice(rounds, num_rounds))
+    return all_rounds, state["matchup_counts"], state["pairing_counts"], state["rest_counts"]
+
+
+# Schedule state is everything later rounds depend on: the count matrices plus the
+# set of exact team-vs-team matches already played. Carrying it lets a schedule grow
+# a round at a time, or restart from any round with a different roster.
+
+
+def new_schedule_state(num_players):
+    pairing_counts, matchup_counts, rest_counts = new_count_matrices(num_players)
+    return {
+        "pairing_counts": pairing_counts,
+        "matchup_counts": matchup_counts,
+        "rest_counts": rest_counts,
+        "match_history": set(),
+    }
+
+
+def record_rests(resting, bye_team, rest_counts):
+    if resting is not None:
+        rest_counts[resting] += 1
+    if bye_team is not None:
+        rest_counts[bye_team] += 1
+
+
+def sitting_players(resting, bye_team):
+    # Everyone sitting out a round, as a list of names or ids: the resting player (or
+    # list of players), then the bye team
+    if resting is None:
+        sitting = []
+    elif np.ndim(resting) == 0:
+        sitting = [resting]
+    else:
+        sitting = list(resting)
+    return sitting + list(bye_team if bye_team is not None else ())
+
+
+def record_round(state, matches, resting, bye_team):
+    if len(matches):
+        record_pairings(matches.reshape(-1, 2), state["pairing_counts"])
+        record_matches(matches, state["match_history"], state["matchup_counts"])
+    record_rests(resting, bye_team, state["rest_counts"])
+
+
+def schedule_state(all_rounds, num_players):
+    # State after playing `all_rounds`, ready to continue the schedule
+    state = new_schedule_state(num_players)
+    for matches, resting, bye_team in all_rounds:
+        record_round(state, matches, resting, bye_team)
+    return state
+
+
+def choose_sitting_players(player_ids, num_sitting, rest_counts, rng, objective=None):
+    # The players who have rested least sit out (anyone, with a rest weight of 0), ties
+    # broken at random
+    order = np.lexsort((rng.random(len(player_ids)), rest_costs(rest_counts, player_ids, objective)))
+    return np.sort(player_ids[order[:num_sitting]]), player_ids[order[num_sitting:]]
+
+
+def next_round(player_ids, state, rng, method="matching", kicks=20, candidates=1000, max_matches=None,
+               ratings=None, objective=None, court_costs=None):
+    # `court_costs` is a (players, courts) table of each player's cost for each court,
+    # e.g. from preferred_court_costs; matches are ordered by court to suit it
+    player_ids = np.asarray(player_ids)
+    if max_matches is not None and len(player_ids) > 4 * max_matches:
+        # More players than courts: a list of players sits out, as in multi-court rounds
+        sitting, playing = choose_sitting_players(
+            player_ids, len(player_ids) - 4 * max_matches, state["rest_counts"], rng, objective
+        )
+        pairs, _ = create_optimized_pairings(
+            playing, state["pairing_counts"], state["rest_counts"], rng, method, kicks, candidates, ratings,
+            objective,
+        )
+        matches, _ = create_matches(
+            pairs, state["match_history"], state["matchup_counts"], state["rest_counts"], rng, kicks, ratings,
+            objective,
+        )
+        record_round(state, matches, sitting, None)
+        return assign_courts(matches, court_costs, objective), sitting, None
+
+    # Whoever can't fill a court sits out before pairing, the least rested first, so rests
+    # stay even: a resting player when one is left over and a bye team when two are
+    sitting, playing = choose_sitting_players(player_ids, len(player_ids) % 4, state["rest_counts"], rng, objective)
+    resting_player = int(sitting[0]) if len(sitting) % 2 else None
+    bye_team = sitting[len(sitting) % 2:] if len(sitting) > 1 else None
+    pairs, _ = create_optimized_pairings(
+        playing, state["pairing_counts"], state["rest_counts"], rng, method, kicks, candidates, ratings,
+        objective,
+    )
+    matches, _ = create_matches(
+        pairs, state["match_history"], state["matchup_counts"], state["rest_counts"], rng, kicks, ratings,
+        objective,
+    )
+    record_round(state, matches, resting_player, bye_team)
+    return assign_courts(matches, court_costs, objective), resting_player, bye_team
+
+
+def iter_tournament_rounds(player_ids, state, seed=None, method="matching", kicks=20, candidates=1000,
+                           max_matches=None, ratings=None, objective=None, court_costs=None):
+    # Endless rounds for `player_ids` (any subset of the state's players), updating
+    # `state` as each one is produced. Take as many as needed with islice or next().
+    # `max_matches` caps the matches per round, e.g. at the number of courts.
+    rng = make_rng(seed)
+    player_ids = np.asarray(player_ids)
+    while True:
+        yield next_round(
+            player_ids, state, rng, method, kicks, candidates, max_matches, ratings, objective, court_costs
+        )
+
+
+def round_lineup(matches, resting_player=None, bye_team=None):
+    # Flat slot layout of a round: four slots per match, then the sitting-out players
+    parts = [np.asarray(matches, dtype=np.int64).reshape(-1)]
+    if resting_player is not None:
+        parts.append([resting_player])
+    if bye_team is not None:
+        parts.append(bye_team)
+    return np.concatenate(parts).astype(np.int64)
+
+
+def lineup_round(lineup, num_matches):
+    playing = 4 * num_matches
+    matches = lineup[:playing].reshape(-1, 2, 2)
+    sitting = lineup[playing:]
+    resting_player = int(sitting[0]) if len(sitting) % 2 == 1 else None
+    bye_team = sitting[len(sitting) % 2:][:2] if len(sitting) > 1 else None
+    return matches, resting_player, bye_team
+
+
+def count_schedule(all_rounds, num_players):
+    pairing_counts, matchup_counts, rest_counts = new_count_matrices(num_players)
+    for matches, resting_player, bye_team in all_rounds:
+        if len(matches):
+            record_pairings(matches.reshape(-1, 2), pairing_counts)
+            record_matches(matches, set(), matchup_counts)
+        record_rests(resting_player, bye_team, rest_counts)
+    return pairing_counts, matchup_counts, rest_counts
+
+
+def schedule_cost(pairing_counts, matchup_counts, rest_counts, objective=None):
+    # Whole-schedule fairness: squared repeat counts, so spreading is always cheaper
+    objective = make_objective(objective)
+    pairing = np.triu(pairing_counts.astype(np.int64), 1)
+    matchup = np.triu(matchup_counts.astype(np.int64), 1)
+    rests = rest_counts.astype(np.int64)
+    cost = (
+        objective["partner"] * (pairing ** 2).sum()
+        + objective["opponent"] * (matchup ** 2).sum()
+        + objective["rest"] * (rests ** 2).sum()
+    )
+    return cost.item()
+
+
+def name_team(team, players):
+    if team is None:
+        return None
+    return players[int(team[0])], players[int(team[1])]
+
+
+def name_round(matches, resting, players, bye_team=None):
+    named_matches = [
+        ((players[a], players[b]), (players[c], players[d]))
+        for (a, b), (c, d) in matches
+    ]
+    if resting is None:
+        named_resting = None
+    elif np.ndim(resting) == 0:
+        named_resting = players[int(resting)]
+    else:
+        named_resting = [players[int(p)] for p in resting]
+    return named_matches, named_resting, name_team(bye_team, players)
+
+
+def name_rounds(all_rounds, players):
+    return [name_round(matches, resting, players, bye_team) for matches, resting, bye_team in all_rounds]
+
+
+def index_rounds(all_rounds, players):
+    # Inverse of name_rounds
+    index = index_players(players)
+    rounds = []
+    for matches, resting, bye_team in all_rounds:
+        match_ids = np.array(
+            [[[index[player] for player in team] for team in match] for match in matches], dtype=np.int64
+        ).reshape(-1, 2, 2)
+        if resting is None:
+            resting_ids = None
+        elif np.ndim(resting) == 0:
+            resting_ids = index[resting]
+        else:
+            resting_ids = np.array([index[player] for player in resting], dtype=np.int64)
+        bye_ids = None if bye_team is None else np.array([index[player] for player in bye_team], dtype=np.int64)
+        rounds.append((match_ids, resting_ids, bye_ids))
+    return rounds
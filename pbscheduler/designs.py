@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Whist tournament designs: every player partners every other player exactly once and
+# opposes every other player exactly twice. All designs here are cyclic. A base round
+# of tables (a, b, c, d), meaning a & b vs. c & d, is developed by adding j mod m:
+#   4n + 1 players: m = 4n + 1, player j rests in round j.
+#   4n players:     m = 4n - 1, plus a fixed player INFINITY who is never shifted.
+
+INFINITY = -1
+
+BASE_ROUNDS = {
+    4: ((INFINITY, 0, 1, 2),),
+    8: ((INFINITY, 4, 5, 2), (0, 6, 3, 1)),
+    12: ((INFINITY, 8, 5, 9), (0, 10, 4, 2), (1, 7, 6, 3)),
+    13: ((1, 10, 7, 5), (2, 8, 4, 3), (6, 11, 12, 9)),
+    16: ((INFINITY, 1, 4, 2), (0, 9, 6, 11), (3, 14, 8, 7), (5, 12, 13, 10)),
+    17: ((1, 8, 13, 16), (2, 15, 12, 4), (3, 14, 6, 7), (5, 10, 11, 9)),
+    20: ((INFINITY, 9, 0, 5), (1, 8, 2, 11), (3, 14, 6, 7), (4, 10, 16, 18), (12, 15, 17, 13)),
+    21: ((1, 13, 6, 7), (2, 8, 4, 20), (3, 16, 15, 5), (9, 12, 17, 19), (10, 14, 18, 11)),
+    24: ((INFINITY, 11, 7, 1), (0, 14, 15, 17), (2, 18, 16, 6), (3, 8, 21, 10), (4, 5, 22, 19), (9, 13, 20, 12)),
+    25: ((1, 23, 12, 8), (2, 11, 15, 10), (3, 14, 9, 7), (4, 17, 5, 20), (6, 24, 22, 16), (13, 21, 19, 18)),
+    28: ((INFINITY, 9, 7, 14), (0, 13, 16, 15), (1, 5, 20, 11), (2, 26, 19, 3), (4, 23, 18, 24), (6, 21, 10, 12),
+         (8, 25, 22, 17)),
+}
+
+
+def is_prime(n):
+    return n > 1 and all(n % k for k in range(2, int(n ** 0.5) + 1))
+
+
+def primitive_root(p):
+    for g in range(2, p):
+        if len({pow(g, k, p) for k in range(1, p)}) == p - 1:
+            return g
+    return 1
+
+
+def prime_base_round(p):
+    # For a prime p = 4m + 1 with primitive root w, the tables
+    # w^i & w^(i+2m) vs. w^(i+m) & w^(i+3m), i < m, form a cyclic whist base round
+    m = (p - 1) // 4
+    w = primitive_root(p)
+    return tuple(
+        (pow(w, i, p), pow(w, i + 2 * m, p), pow(w, i + m, p), pow(w, i + 3 * m, p))
+        for i in range(m)
+    )
+
+
+def base_round(num_players):
+    if num_players in BASE_ROUNDS:
+        return BASE_ROUNDS[num_players]
+    if num_players % 4 == 1 and is_prime(num_players):
+        return prime_base_round(num_players)
+    return None
+
+
+@lru_cache(maxsize=None)
+def whist_design(num_players):
+    # Full design as (rounds, resting): rounds is (R, tables, 2, 2) player ids and
+    # resting is one id per round, or None when nobody rests. None if no design is known.
+    base = base_round(num_players)
+    if base is None:
+        return None
+
+    modulus = num_players if num_players % 4 == 1 else num_players - 1
+    base = np.array(base, dtype=np.int64)
+    fixed = base == INFINITY
+    rounds = (base[None, :, :] + np.arange(modulus)[:, None, None]) % modulus
+    rounds[:, fixed] = num_players - 1
+    rounds = rounds.reshape(modulus, -1, 2, 2)
+    rounds.flags.writeable = False
+
+    resting = np.arange(modulus) if num_players % 4 == 1 else None
+    return rounds, resting
+
+
+def whist_schedule(num_players, num_rounds, rng):
+    # Design rounds in tournament form, with players relabelled at random so repeated
+    # events don't always produce the same schedule. Cycles if more rounds are asked for.
+    design = whist_design(num_players)
+    if design is None:
+        return None
+
+    rounds, resting = design
+    labels = rng.permutation(num_players)
+    all_rounds = []
+    for r in range(num_rounds):
+        cycle_round = r % len(rounds)
+        resting_player = None if resting is None else int(labels[resting[cycle_round]])
+        all_rounds.append((labels[rounds[cycle_round]], resting_player, None))
+    return all_rounds
@@ -0,0 +1,203 @@
+import csv
+import json
+import os
+from itertools import chain, islice
+
+import numpy as np
+
+from .core import sitting_players
+
+# Name-based schedules, results and rosters as plain data, for the command line,
+# downloads and uploads. Tables are produced a row at a time and written as they go,
+# so exports never build the whole file in memory.
+
+CSV_HEADER = ["round", "match", "team1_player1", "team1_player2", "team2_player1", "team2_player2", "resting"]
+RESULT_COLUMNS = CSV_HEADER[:-1] + ["winner", "team1_points", "team2_points"]
+PLAYER_COLUMNS = ["player", "points", "games", "rests", "partners", "opponents", "most_with_one_partner"]
+ROSTER_NAME_COLUMNS = ["name", "player", "player name", "full name"]
+ROSTER_FIRST_NAME_COLUMNS = ["first name", "first", "given name"]
+ROSTER_LAST_NAME_COLUMNS = ["last name", "last", "surname", "family name"]
+ROSTER_SNIFF_LINES = 20
+PARQUET_BATCH_ROWS = 10000
+
+
+def schedule_records(all_rounds):
+    for round_number, (matches, resting_player, bye_team) in enumerate(all_rounds, 1):
+        yield {
+            "round": round_number,
+            "matches": [
+                {"match": match_number, "team1": list(pair1), "team2": list(pair2)}
+                for match_number, (pair1, pair2) in enumerate(matches, 1)
+            ],
+            "resting": sitting_players(resting_player, bye_team),
+        }
+
+
+def match_rows(all_rounds):
+    # One flat row per match, with the round's sitting-out players on every row
+    for record in schedule_records(all_rounds):
+        for match in record["matches"]:
+            values = [record["round"], match["match"], *match["team1"], *match["team2"], record["resting"]]
+            yield dict(zip(CSV_HEADER, values))
+
+
+def result_rows(all_rounds, ledger):
+    # One row per match with the points each team earned in the ledger; the winner is
+    # the team that earned points, or empty while the match hasn't been played
+    for round_number, (matches, _, _) in enumerate(all_rounds, 1):
+        for match_number, (pair1, pair2) in enumerate(matches, 1):
+            awards = ledger["results"].get((round_number, match_number), {})
+            points1 = sum(awards.get(player, 0) for player in pair1)
+            points2 = sum(awards.get(player, 0) for player in pair2)
+            winner = "team1" if points1 > points2 else "team2" if points2 > points1 else ""
+            yield dict(zip(RESULT_COLUMNS, [round_number, match_number, *pair1, *pair2, winner, points1, points2]))
+
+
+def player_rows(players, pairing_counts, matchup_counts, rest_counts, ledger=None):
+    # Per-player totals from the count matrices (indexed like `players`)
+    scores = ledger["scores"] if ledger is not None else {}
+    partners = np.count_nonzero(pairing_counts, axis=1)
+    opponents = np.count_nonzero(matchup_counts, axis=1)
+    games = pairing_counts.sum(axis=1)
+    most = pairing_counts.max(axis=1, initial=0)
+    for i, player in enumerate(players):
+        yield dict(zip(PLAYER_COLUMNS, [
+            player, scores.get(player, 0), int(games[i]), int(rest_counts[i]),
+            int(partners[i]), int(opponents[i]), int(most[i]),
+        ]))
+
+
+def flat_value(value):
+    # Lists of players share one cell in flat formats
+    return ";".join(value) if isinstance(value, list) else value
+
+
+def write_table(rows, columns, out, table_format="csv"):
+    # `out` is a text stream; Parquet goes through write_parquet
+    if table_format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([flat_value(row[column]) for column in columns])
+    elif table_format == "jsonl":
+        for row in rows:
+            out.write(json.dumps({column: row[column] for column in columns}))
+            out.write("\n")
+    else:
+        raise ValueError(f"Unknown table format {table_format!r}, expected csv or jsonl")
+
+
+def write_parquet(rows, columns, path, batch_size=PARQUET_BATCH_ROWS):
+    # Row groups of `batch_size` rows are written as they fill. Needs pyarrow.
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from None
+
+    writer = None
+    batch = []
+
+    def flush():
+        nonlocal writer
+        table = pa.Table.from_pylist(batch, schema=writer.schema if writer else None)
+        if writer is None:
+            writer = pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+        batch.clear()
+
+    try:
+        for row in rows:
+            batch.append({column: flat_value(row[column]) for column in columns})
+            if len(batch) >= batch_size:
+                flush()
+        if batch or writer is None:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_schedule_json(all_rounds, out):
+    json.dump({"rounds": list(schedule_records(all_rounds))}, out, indent=2)
+    out.write("\n")
+
+
+def roster_format(name):
+    # "csv", "json", "jsonl" or "text" from a file name
+    extension = os.path.splitext(name)[1].lower().lstrip(".")
+    return {"csv": "csv", "json": "json", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension, "text")
+
+
+def find_column(columns, names):
+    return next((columns.index(name) for name in names if name in columns), None)
+
+
+def roster_columns(header):
+    # Indexes of the columns that make up a player's name: a name column, or first and
+    # last name columns, or else any column with "name" in it. None if there are none.
+    columns = [" ".join(str(column).lower().replace("_", " ").split()) for column in header]
+    name = find_column(columns, ROSTER_NAME_COLUMNS)
+    if name is not None:
+        return [name]
+    first = find_column(columns, ROSTER_FIRST_NAME_COLUMNS)
+    last = find_column(columns, ROSTER_LAST_NAME_COLUMNS)
+    if first is not None and last is not None:
+        return [first, last]
+    name = next((i for i, column in enumerate(columns) if "name" in column.split()), None)
+    return None if name is None else [name]
+
+
+def roster_row_name(row, columns):
+    return " ".join(str(row[i]).strip() for i in columns if i < len(row))
+
+
+def roster_name(entry):
+    if isinstance(entry, dict):
+        keys = list(entry)
+        columns = roster_columns(keys)
+        entry = roster_row_name([entry[key] for key in keys], columns) if columns else ""
+    return str(entry).strip()
+
+
+def has_csv_header(sample):
+    # The sniffer can't tell on some inputs (a single column, say); those have no header
+    try:
+        return csv.Sniffer().has_header(sample)
+    except csv.Error:
+        return False
+
+
+def roster_entries(f, file_format):
+    if file_format == "json":
+        data = json.load(f)
+        yield from data["players"] if isinstance(data, dict) else data
+    elif file_format == "jsonl":
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif file_format == "csv":
+        # The first lines are kept to sniff for a header, then read again
+        lines = list(islice(f, ROSTER_SNIFF_LINES))
+        reader = csv.reader(chain(lines, f))
+        header = next(reader, [])
+        columns = roster_columns(header)
+        if columns is None:
+            # Names are in the first column, and the first row is a name unless it
+            # looks like a header
+            columns = [0]
+            if not has_csv_header("".join(lines)):
+                yield roster_row_name(header, columns)
+        for row in reader:
+            yield roster_row_name(row, columns)
+    else:
+        yield from f
+
+
+def read_roster(f, file_format="text"):
+    # Player names from a text stream: one name per line, a CSV with a name column or
+    # first and last name columns (or names in the first column), a JSON list of names
+    # or of objects with those keys (or {"players": [...]}), or JSON Lines of either.
+    # Blank and repeated names are dropped.
+    names = (roster_name(entry) for entry in roster_entries(f, file_format))
+    return list(dict.fromkeys(name for name in names if name))
@@ -0,0 +1,77 @@
+from bisect import bisect_right
+
+from .core import sitting_players
+
+# Per-player itineraries: an inverted index from each player to their entries in round
+# order, (round, court, partner, opponents) with court, partner and opponents None for
+# a round sitting out. Rounds are added as they are generated and a reschedule only
+# replaces the entries from the first changed round on, so lookups never scan the
+# schedule. The index works the same on named rounds and on index rounds.
+
+
+def round_itinerary_entries(round_number, matches, sitting):
+    # (player, entry) for everyone in one round
+    for court_number, ((a, b), (c, d)) in enumerate(matches, 1):
+        yield a, (round_number, court_number, b, (c, d))
+        yield b, (round_number, court_number, a, (c, d))
+        yield c, (round_number, court_number, d, (a, b))
+        yield d, (round_number, court_number, c, (a, b))
+    for player in sitting:
+        yield player, (round_number, None, None, None)
+
+
+def new_itinerary_index():
+    return {"players": {}, "rounds": 0}
+
+
+def add_round(index, schedule_round):
+    matches, resting, bye_team = schedule_round
+    index["rounds"] += 1
+    players = index["players"]
+    for player, entry in round_itinerary_entries(index["rounds"], matches, sitting_players(resting, bye_team)):
+        players.setdefault(player, []).append(entry)
+
+
+def truncate_itineraries(index, num_rounds):
+    # Drops every entry after `num_rounds`, touching only the entries removed
+    for entries in index["players"].values():
+        while entries and entries[-1][0] > num_rounds:
+            entries.pop()
+    index["rounds"] = min(index["rounds"], num_rounds)
+
+
+def itinerary_index(all_rounds):
+    index = new_itinerary_index()
+    for schedule_round in all_rounds:
+        add_round(index, schedule_round)
+    return index
+
+
+def update_itinerary_index(index, all_rounds, from_round):
+    # After a reschedule that kept rounds before `from_round` (0-based) as they were
+    truncate_itineraries(index, from_round)
+    for schedule_round in all_rounds[from_round:]:
+        add_round(index, schedule_round)
+
+
+def entry_round(entry):
+    return entry[0]
+
+
+def player_itinerary(index, player):
+    return index["players"].get(player, [])
+
+
+def upcoming_entries(index, player, after_round=0):
+    # The player's entries for rounds after `after_round`
+    entries = player_itinerary(index, player)
+    return entries[bisect_right(entries, after_round, key=entry_round):]
+
+
+def next_match(index, player, after_round=0):
+    # The player's first match after `after_round`, or None if they have no more
+    entries = player_itinerary(index, player)
+    for i in range(bisect_right(entries, after_round, key=entry_round), len(entries)):
+        if entries[i][1] is not None:
+            return entries[i]
+    return None
@@ -0,0 +1,82 @@
+from bisect import bisect_left, insort
+
+from .render import team_text
+
+# A ledger holds one result per (round, match) key. A result is the points each player
+# earned in that match, e.g. {"Ann": 1, "Bo": 1} for a win worth 1 point, or {} when
+# the match hasn't been played. Changing a result only applies the difference to the
+# players involved, and the ranking is kept sorted as (-score, player) entries.
+
+
+def new_ledger(players=()):
+    ledger = {"results": {}, "scores": {}, "ranking": []}
+    for player in players:
+        adjust_score(ledger, player, 0)
+    return ledger
+
+
+def adjust_score(ledger, player, change):
+    scores, ranking = ledger["scores"], ledger["ranking"]
+    if player in scores:
+        if change == 0:
+            return
+        old = scores[player]
+        del ranking[bisect_left(ranking, (-old, player))]
+    else:
+        old = 0
+    scores[player] = old + change
+    insort(ranking, (-scores[player], player))
+
+
+def match_awards(winning_team, points):
+    return {player: points for player in winning_team}
+
+
+def court_winner(result, pair1, pair2):
+    # "Team 1" or "Team 2" from a court's result {"Team 1", "Team 2", "Team 1 score",
+    # "Team 2 score", "Winner"}, or None if it hasn't been played. Results entered for
+    # teams that have since been rescheduled don't count.
+    if result is None or result.get("Team 1") != team_text(pair1) or result.get("Team 2") != team_text(pair2):
+        return None
+    winner = result.get("Winner")
+    return winner if winner in ("Team 1", "Team 2") else None
+
+
+def court_awards(result, pair1, pair2, points_per_win=1):
+    # The winners each earn points_per_win plus the score difference
+    winner = court_winner(result, pair1, pair2)
+    if winner is None:
+        return {}
+    points = points_per_win + abs(int(result.get("Team 1 score", 0)) - int(result.get("Team 2 score", 0)))
+    return match_awards(pair1 if winner == "Team 1" else pair2, points)
+
+
+def record_result(ledger, key, awards):
+    # Returns True if the result changed (and the leaderboard with it)
+    old = ledger["results"].get(key, {})
+    if old == awards:
+        return False
+    for player in old.keys() | awards.keys():
+        adjust_score(ledger, player, awards.get(player, 0) - old.get(player, 0))
+    if awards:
+        ledger["results"][key] = dict(awards)
+    else:
+        ledger["results"].pop(key, None)
+    return True
+
+
+def rounds_played(ledger):
+    # Rounds up to the last one with a result entered count as played
+    return max((round_number for round_number, _ in ledger["results"]), default=0)
+
+
+def leaderboard(ledger):
+    return [(player, -negative_score) for negative_score, player in ledger["ranking"]]
+
+
+def rebuild_ledger(results, players=()):
+    # Same ledger from scratch, replaying results in key order
+    ledger = new_ledger(players)
+    for key in sorted(results):
+        record_result(ledger, key, results[key])
+    return ledger
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+
+from .core import (
+    count_schedule,
+    grow_count_matrices,
+    index_players,
+    index_rounds,
+    iter_tournament_rounds,
+    name_round,
+    new_count_matrices,
+    new_schedule_state,
+)
+from .ratings import rating_array
+from .store import DEFAULT_STORE_PATH
+
+# A league season keeps running partner, opponent and rest counts for every member
+# across weekly sessions, so each week is scheduled against the whole season so far.
+# A season is one .npz file of the count matrices: O(members²) on disk and in memory
+# however many weeks have been played. Members get ids in the order they first attend.
+
+DEFAULT_SEASON_PATH = os.path.join(os.path.dirname(DEFAULT_STORE_PATH), "season.npz")
+
+
+def new_season(players=()):
+    pairing_counts, matchup_counts, rest_counts = new_count_matrices(len(players))
+    return {
+        "players": list(players),
+        "pairing_counts": pairing_counts,
+        "matchup_counts": matchup_counts,
+        "rest_counts": rest_counts,
+        "weeks": 0,
+    }
+
+
+def load_season(path=DEFAULT_SEASON_PATH):
+    # A new season if nothing has been saved there yet
+    if not os.path.exists(path):
+        return new_season()
+    with np.load(path) as data:
+        return {
+            "players": data["players"].tolist(),
+            "pairing_counts": data["pairing_counts"],
+            "matchup_counts": data["matchup_counts"],
+            "rest_counts": data["rest_counts"],
+            "weeks": int(data["weeks"]),
+        }
+
+
+def save_season(season, path=DEFAULT_SEASON_PATH):
+    # Written to a temporary file and swapped in, so a crash leaves the old season intact
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = path + ".partial"
+    with open(partial, "wb") as f:
+        np.savez(
+            f,
+            players=np.array(season["players"], dtype=str),
+            pairing_counts=season["pairing_counts"],
+            matchup_counts=season["matchup_counts"],
+            rest_counts=season["rest_counts"],
+            weeks=season["weeks"],
+        )
+    os.replace(partial, path)
+
+
+def add_members(season, players):
+    index = index_players(season["players"])
+    new_players = [player for player in dict.fromkeys(players) if player not in index]
+    if new_players:
+        season["players"] = season["players"] + new_players
+        season["pairing_counts"], season["matchup_counts"], season["rest_counts"] = grow_count_matrices(
+            season["pairing_counts"], season["matchup_counts"], season["rest_counts"], len(season["players"])
+        )
+
+
+def week_state(season, attendees):
+    # Schedule state for this week's attendees carrying the season's partner and
+    # opponent counts. Rests start afresh each week, or newcomers would sit out until
+    # they caught up with everyone else's season rests; players who have sat out more
+    # than the others start the week with one rest counted so they aren't first to sit.
+    add_members(season, attendees)
+    index = index_players(season["players"])
+    player_ids = np.array(sorted(index[player] for player in set(attendees)), dtype=np.int64)
+    state = new_schedule_state(len(season["players"]))
+    state["pairing_counts"][:] = season["pairing_counts"]
+    state["matchup_counts"][:] = season["matchup_counts"]
+    if len(player_ids):
+        season_rests = season["rest_counts"][player_ids]
+        state["rest_counts"][player_ids] = np.minimum(season_rests - season_rests.min(), 1)
+    return player_ids, state
+
+
+def season_rounds(season, attendees, seed=None, num_courts=None, ratings=None, objective=None):
+    # Endless named rounds for this week's attendees. Apart from signing up new
+    # members the season is only changed by record_week, once the week is played.
+    # `ratings` is a rating table.
+    player_ids, state = week_state(season, attendees)
+    players = season["players"]
+    rounds = iter_tournament_rounds(
+        player_ids, state, seed, max_matches=num_courts,
+        ratings=None if ratings is None else rating_array(ratings, players), objective=objective,
+    )
+    for matches, resting, bye_team in rounds:
+        yield name_round(matches, resting, players, bye_team)
+
+
+def record_week(season, all_rounds):
+    # Adds a played week's named rounds to the season counts
+    pairing_counts, matchup_counts, rest_counts = count_schedule(
+        index_rounds(all_rounds, season["players"]), len(season["players"])
+    )
+    season["pairing_counts"] += pairing_counts
+    season["matchup_counts"] += matchup_counts
+    season["rest_counts"] += rest_counts
+    season["weeks"] += 1
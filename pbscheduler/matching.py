@@ -0,0 +1,72 @@
+import numpy as np
+
+
+def greedy_matching(cost, order):
+    # Each unmatched player in turn takes their cheapest unmatched partner
+    free = np.ones(len(cost), dtype=bool)
+    pairs = []
+    for player in order:
+        if not free[player]:
+            continue
+        free[player] = False
+        candidates = np.flatnonzero(free)
+        partner = candidates[np.argmin(cost[player, candidates])]
+        free[partner] = False
+        pairs.append((player, partner))
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def improve_matching(pairs, cost):
+    # 2-opt: for every two pairs (a, b), (c, d) try re-pairing them as (a, c), (b, d)
+    # or (a, d), (b, c) and apply the best improving swap until none is left
+    pairs = pairs.copy()
+    # Every swap lowers the cost, so this stops
+    while len(pairs) > 1:
+        a, b = pairs[:, 0], pairs[:, 1]
+        current = cost[a, b]
+        current = current[:, None] + current[None, :]
+        cross = cost[a[:, None], a[None, :]] + cost[b[:, None], b[None, :]]
+        swap = cost[a[:, None], b[None, :]] + cost[b[:, None], a[None, :]]
+        gain = np.maximum(current - cross, current - swap)
+        np.fill_diagonal(gain, 0)
+        i, j = np.unravel_index(np.argmax(gain), gain.shape)
+        if gain[i, j] <= 0:
+            break
+        (a_i, b_i), (a_j, b_j) = pairs[i].copy(), pairs[j].copy()
+        if current[i, j] - cross[i, j] >= current[i, j] - swap[i, j]:
+            pairs[i], pairs[j] = (a_i, a_j), (b_i, b_j)
+        else:
+            pairs[i], pairs[j] = (a_i, b_j), (b_i, a_j)
+    return pairs
+
+
+def matching_cost(pairs, cost):
+    return cost[pairs[:, 0], pairs[:, 1]].sum()
+
+
+def perturb_matching(pairs, rng, size=3):
+    # Re-pairs the players of `size` random pairs at random: a kick that 2-opt alone
+    # can't make, to leave a local optimum
+    pairs = pairs.copy()
+    chosen = rng.choice(len(pairs), size=min(size, len(pairs)), replace=False)
+    pairs[chosen] = rng.permutation(pairs[chosen].ravel()).reshape(-1, 2)
+    return pairs
+
+
+def min_cost_perfect_matching(player_ids, cost, rng, kicks=20):
+    # Minimum-cost perfect matching over an even set of players by iterated local
+    # search: greedy, then 2-opt, then `kicks` seeded kicks each followed by 2-opt,
+    # keeping the cheapest. Bounded by kicks rather than time, so a seed always gives
+    # the same matching. `cost` is indexed by player id.
+    player_ids = np.asarray(player_ids)
+    local_cost = cost[np.ix_(player_ids, player_ids)]
+    order = rng.permutation(len(player_ids))
+    pairs = improve_matching(greedy_matching(local_cost, order), local_cost)
+    best = matching_cost(pairs, local_cost)
+    # Two pairs have only three matchings, which 2-opt already compares
+    for _ in range(kicks if len(pairs) > 2 else 0):
+        candidate = improve_matching(perturb_matching(pairs, rng), local_cost)
+        candidate_cost = matching_cost(candidate, local_cost)
+        if candidate_cost < best:
+            pairs, best = candidate, candidate_cost
+    return player_ids[pairs]
@@ -0,0 +1,79 @@
+import numpy as np
+
+from .core import index_players, schedule_cost, sitting_players
+from .objective import make_objective
+
+# Schedule quality summaries computed straight from the count matrices, so they cost
+# a handful of array operations however many players there are.
+
+
+def pair_values(counts):
+    return counts[np.triu_indices(len(counts), 1)]
+
+
+def repeat_histogram(counts):
+    # histogram[k] = number of player pairs that partnered (or met) exactly k times
+    return np.bincount(pair_values(counts), minlength=1)
+
+
+def opponent_coverage(matchup_counts):
+    # Percentage of player pairs that faced each other at least once
+    values = pair_values(matchup_counts)
+    if len(values) == 0:
+        return 100.0
+    return 100.0 * int(np.count_nonzero(values)) / len(values)
+
+
+def rest_matrix(all_rounds, players):
+    # (rounds, players) booleans, True where a player sits out. Works on named rounds,
+    # or on index rounds with players=range(num_players).
+    index = index_players(players)
+    rested = np.zeros((len(all_rounds), len(players)), dtype=bool)
+    for r, (_, resting, bye_team) in enumerate(all_rounds):
+        rested[r, [index[player] for player in sitting_players(resting, bye_team)]] = True
+    return rested
+
+
+def rest_gaps(rested):
+    # Rounds played between consecutive rests of the same player
+    players, rounds = np.nonzero(rested.T)
+    same_player = players[1:] == players[:-1]
+    return np.diff(rounds)[same_player] - 1
+
+
+def even_spread_squares(total, slots):
+    # Smallest possible sum of squares of `slots` counts adding up to `total`
+    if slots == 0:
+        return 0
+    q, r = divmod(int(total), slots)
+    return slots * q * q + r * (2 * q + 1)
+
+
+def fairness_score(pairing_counts, matchup_counts, rest_counts, objective=None):
+    # 100 means partners, opponents and rests are spread as evenly as their totals
+    # allow; lower scores are further from that ideal under schedule_cost
+    objective = make_objective(objective)
+    cost = schedule_cost(pairing_counts, matchup_counts, rest_counts, objective)
+    if cost == 0:
+        return 100.0
+    num_pairs = len(rest_counts) * (len(rest_counts) - 1) // 2
+    ideal = (
+        objective["partner"] * even_spread_squares(pair_values(pairing_counts).sum(), num_pairs)
+        + objective["opponent"] * even_spread_squares(pair_values(matchup_counts).sum(), num_pairs)
+        + objective["rest"] * even_spread_squares(rest_counts.sum(), len(rest_counts))
+    )
+    return 100.0 * float(ideal) / cost
+
+
+def schedule_metrics(pairing_counts, matchup_counts, rest_counts, rested=None, objective=None):
+    metrics = {
+        "fairness": fairness_score(pairing_counts, matchup_counts, rest_counts, objective),
+        "opponent_coverage": opponent_coverage(matchup_counts),
+        "max_repeat_partners": int(pairing_counts.max(initial=0)),
+        "partner_histogram": repeat_histogram(pairing_counts),
+        "opponent_histogram": repeat_histogram(matchup_counts),
+        "rest_histogram": np.bincount(rest_counts, minlength=1),
+    }
+    if rested is not None:
+        metrics["rest_gap_histogram"] = np.bincount(rest_gaps(rested), minlength=1)
+    return metrics
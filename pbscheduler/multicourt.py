@@ -0,0 +1,42 @@
+from itertools import islice
+
+import numpy as np
+
+from .core import count_schedule, iter_tournament_rounds, make_rng, new_schedule_state, sitting_players
+from .designs import whist_schedule
+
+# Multi-court rounds have the same (matches, resting, bye_team) shape as tournament
+# rounds, but `resting` is always an array of the players sitting out and there is
+# no separate bye team.
+
+
+def generate_multi_court_schedule(num_players, num_rounds, num_courts, seed=None, objective=None, court_costs=None,
+                                  method="matching", candidates=1000):
+    # `court_costs` is a (players, courts) table as in next_round
+    rng = make_rng(seed)
+
+    # A whist design fills every court each round with perfect partner/opponent balance
+    if num_courts >= num_players // 4 and court_costs is None:
+        design_rounds = whist_schedule(num_players, num_rounds, rng)
+        if design_rounds is not None:
+            all_rounds = [
+                (matches, np.sort(np.asarray(sitting_players(resting, None), dtype=np.int64)), None)
+                for matches, resting, _ in design_rounds
+            ]
+            pairing_counts, matchup_counts, rest_counts = count_schedule(all_rounds, num_players)
+            return all_rounds, matchup_counts, pairing_counts, rest_counts
+
+    # Each round the least-rested players sit out, then partners and court opponents
+    # are matched over everyone playing, against the whole history so far
+    state = new_schedule_state(num_players)
+    max_matches = min(num_courts, num_players // 4)
+    rounds = iter_tournament_rounds(
+        np.arange(num_players), state, rng, method, candidates=candidates, max_matches=max_matches,
+        objective=objective, court_costs=court_costs,
+    )
+    all_rounds = [
+        (matches, np.sort(np.asarray(sitting_players(resting, bye_team), dtype=np.int64)), None)
+        for matches, resting, bye_team in islice(rounds, num_rounds)
+    ]
+    pairing_counts, matchup_counts, rest_counts = count_schedule(all_rounds, num_players)
+    return all_rounds, matchup_counts, pairing_counts, rest_counts
@@ -0,0 +1,76 @@
+import numpy as np
+
+# The scheduling objective is a weight per term:
+#   partner       times a pair has partnered, squared
+#   opponent      times a pair has faced each other (squared over a whole schedule)
+#   rest          times a player has sat out, squared
+#   skill         squared distance of team ratings from even, per RATING_SCALE points
+#   court         each player's cost of playing on each court
+#   repeat_match  exact team-vs-team rematches
+# Each round the terms are compiled into cost matrices indexed by player id, so the
+# optimizers score any candidate with plain array lookups whatever the weights are.
+# Who sits out is chosen before pairing, when nothing else is at stake, so there the
+# rest weight only decides whether rests are spread (any weight above 0) or ignored
+# (0); its size trades against the other terms in schedule_cost and annealing.
+
+RATING_SCALE = 100.0
+
+DEFAULT_OBJECTIVE = {
+    "partner": 10,
+    "opponent": 1,
+    "rest": 10,
+    "skill": 1,
+    "court": 1,
+    "repeat_match": 10,
+}
+
+
+def make_objective(objective=None, **weights):
+    merged = dict(DEFAULT_OBJECTIVE)
+    merged.update(objective or {})
+    merged.update(weights)
+    unknown = set(merged) - set(DEFAULT_OBJECTIVE)
+    if unknown:
+        raise ValueError(f"Unknown objective terms: {', '.join(sorted(unknown))}")
+    return merged
+
+
+def objective_key(objective=None):
+    # Stable text form, e.g. for cache keys
+    objective = make_objective(objective)
+    return ",".join(f"{term}={objective[term]:g}" for term in DEFAULT_OBJECTIVE)
+
+
+def team_strength_cost(ratings, average_team):
+    # cost[i, j] for teaming i with j: how far their combined rating is from an average team
+    totals = ratings[:, None] + ratings[None, :]
+    return ((totals - average_team) / RATING_SCALE) ** 2
+
+
+def partner_cost_matrix(pairing_counts, objective=None, ratings=None, player_ids=None):
+    # cost[i, j] of teaming i with j this round
+    objective = make_objective(objective)
+    cost = objective["partner"] * pairing_counts.astype(np.float64) ** 2
+    if ratings is not None and objective["skill"] and player_ids is not None and len(player_ids):
+        cost += objective["skill"] * team_strength_cost(ratings, 2 * ratings[player_ids].mean())
+    return cost
+
+
+def rest_costs(rest_counts, player_ids, objective=None):
+    # cost of each of `player_ids` sitting out this round: the increase in its squared rests
+    rests = rest_counts[player_ids].astype(np.float64)
+    return make_objective(objective)["rest"] * (2 * rests + 1)
+
+
+def opponent_cost_matrix(matchup_counts, objective=None):
+    # cost[i, j] of putting i and j on opposite sides of the net this round
+    return make_objective(objective)["opponent"] * matchup_counts.astype(np.float64)
+
+
+def preferred_court_costs(preferred_courts, num_courts):
+    # Court cost table from one preferred court per player (-1 for no preference):
+    # 1 for every other court, 0 for the preferred one
+    preferred_courts = np.asarray(preferred_courts)
+    costs = (np.arange(num_courts)[None, :] != preferred_courts[:, None]).astype(np.float64)
+    costs[preferred_courts < 0] = 0
+    return costs
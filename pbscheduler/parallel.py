@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .annealing import optimize_schedule
+from .core import generate_tournament_schedule, make_rng, schedule_cost
+from .multicourt import generate_multi_court_schedule
+
+# Independent seeded searches run one per process and the cheapest schedule under
+# schedule_cost wins. Child seeds are spawned from one master seed, and searches
+# that should be reproducible use move budgets rather than clock budgets.
+
+
+def seeded_tournament_search(num_players, num_rounds, optimize_seconds, optimize_moves, objective, method, candidates,
+                             seed):
+    rng = make_rng(seed)
+    schedule = generate_tournament_schedule(
+        num_players, num_rounds, rng, method, candidates=candidates, objective=objective
+    )
+    if optimize_seconds or optimize_moves:
+        schedule = optimize_schedule(
+            schedule[0], num_players, optimize_seconds or None, rng, optimize_moves, objective
+        )
+    return schedule
+
+
+def seeded_multi_court_search(num_players, num_rounds, num_courts, objective, court_costs, method, candidates, seed):
+    return generate_multi_court_schedule(
+        num_players, num_rounds, num_courts, make_rng(seed), objective, court_costs, method, candidates
+    )
+
+
+def best_of_n(search, num_searches=None, seed=None, workers=None, objective=None):
+    # `search` must be picklable (a module-level function or a partial of one) and
+    # return (all_rounds, matchup_counts, pairing_counts, rest_counts)
+    num_searches = num_searches or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(num_searches)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        schedules = list(pool.map(search, seeds))
+    costs = [schedule_cost(pairing, matchup, rest, objective) for _, matchup, pairing, rest in schedules]
+    return schedules[int(np.argmin(costs))]
+
+
+def parallel_tournament_schedule(num_players, num_rounds, seed=None, num_searches=None, workers=None,
+                                 optimize_seconds=0, optimize_moves=None, objective=None, method="matching",
+                                 candidates=1000):
+    search = partial(
+        seeded_tournament_search, num_players, num_rounds, optimize_seconds, optimize_moves, objective, method,
+        candidates,
+    )
+    return best_of_n(search, num_searches, seed, workers, objective)
+
+
+def parallel_multi_court_schedule(num_players, num_rounds, num_courts, seed=None, num_searches=None, workers=None,
+                                  objective=None, court_costs=None, method="matching", candidates=1000):
+    search = partial(
+        seeded_multi_court_search, num_players, num_rounds, num_courts, objective, court_costs, method, candidates
+    )
+    return best_of_n(search, num_searches, seed, workers, objective)
@@ -0,0 +1,105 @@
+import zlib
+
+# A minimal streaming PDF writer for plain-text printouts. Pages are laid out as lines of
+# Courier, each page is compressed and written out as soon as it is full, and only the
+# byte offset of each object is kept until the cross-reference table at the end.
+# Objects 1-4 are the catalog, page tree and two fonts, written last.
+
+PAGE_WIDTH = 612  # US Letter, in points
+PAGE_HEIGHT = 792
+MARGIN = 48
+LINE_SPACING = 1.4
+CHAR_WIDTH = 0.6  # Courier advance width per point of font size
+FONTS = {"normal": (b"F1", 10), "bold": (b"F2", 10), "heading": (b"F2", 13), "title": (b"F2", 18)}
+FIRST_PAGE_OBJECT = 5
+
+
+def pdf_string(text):
+    data = text.encode("latin-1", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def line_height(style):
+    return FONTS[style][1] * LINE_SPACING
+
+
+def fit_line(text, size):
+    width = int((PAGE_WIDTH - 2 * MARGIN) / (CHAR_WIDTH * size))
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def new_pdf(out):
+    # `out` is a binary stream; nothing is read back from it
+    doc = {"out": out, "position": 0, "offsets": {}, "next_object": FIRST_PAGE_OBJECT, "pages": [], "content": [], "y": None}
+    write(doc, b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    return doc
+
+
+def write(doc, data):
+    doc["out"].write(data)
+    doc["position"] += len(data)
+
+
+def write_object(doc, object_id, body):
+    doc["offsets"][object_id] = doc["position"]
+    write(doc, b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+
+
+def next_object(doc):
+    doc["next_object"] += 1
+    return doc["next_object"] - 1
+
+
+def finish_page(doc):
+    if doc["y"] is None:
+        return
+    stream = zlib.compress(b"\n".join(doc["content"]))
+    content_id = next_object(doc)
+    write_object(doc, content_id, b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+    page_id = next_object(doc)
+    write_object(doc, page_id, (
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >>"
+        b" /Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_id)
+    ))
+    doc["pages"].append(page_id)
+    doc["content"] = []
+    doc["y"] = None
+
+
+def start_page(doc):
+    finish_page(doc)
+    doc["y"] = PAGE_HEIGHT - MARGIN
+
+
+def add_block(doc, lines, new_page=False):
+    # `lines` are (style, text) pairs. A block that fits on a page isn't split across
+    # two; longer ones simply run on to the next page.
+    height = sum(line_height(style) for style, _ in lines)
+    if new_page or doc["y"] is None or (doc["y"] - height < MARGIN and height <= PAGE_HEIGHT - 2 * MARGIN):
+        start_page(doc)
+    for style, text in lines:
+        if doc["y"] - line_height(style) < MARGIN:
+            start_page(doc)
+        doc["y"] -= line_height(style)
+        if text:
+            font, size = FONTS[style]
+            doc["content"].append(
+                b"BT /%s %d Tf %d %.1f Td %s Tj ET" % (font, size, MARGIN, doc["y"], pdf_string(fit_line(text, size)))
+            )
+
+
+def finish_pdf(doc):
+    if doc["y"] is None and not doc["pages"]:
+        start_page(doc)  # An empty document still gets one page
+    finish_page(doc)
+    for object_id, base_font in ((3, b"Courier"), (4, b"Courier-Bold")):
+        write_object(doc, object_id, b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font)
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in doc["pages"])
+    write_object(doc, 2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(doc["pages"])))
+    write_object(doc, 1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    xref_position = doc["position"]
+    size = doc["next_object"]
+    write(doc, b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    write(doc, b"".join(b"%010d 00000 n \n" % doc["offsets"][object_id] for object_id in range(1, size)))
+    write(doc, b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_position))
@@ -0,0 +1,68 @@
+import numpy as np
+
+# Elo ratings for doubles. A team plays at its players' mean rating and both partners
+# move by the same amount after a result. Results are keyed like the leaderboard's
+# (round, match) entries: a new latest result is applied on top in O(1), while a
+# corrected or out-of-order one replays everything, since Elo depends on order.
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+ELO_SCALE = 400.0
+
+TEAM1_WIN = 1.0
+DRAW = 0.5
+TEAM2_WIN = 0.0
+# The outcome of a court's "Winner"
+OUTCOMES = {"Team 1": TEAM1_WIN, "Team 2": TEAM2_WIN}
+
+
+def new_ratings(players=()):
+    return {"results": {}, "ratings": {player: DEFAULT_RATING for player in players}}
+
+
+def rating(table, player):
+    return table["ratings"].get(player, DEFAULT_RATING)
+
+
+def expected_score(team_rating, opponent_rating):
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - team_rating) / ELO_SCALE))
+
+
+def apply_result(table, team1, team2, outcome):
+    team1_rating = sum(rating(table, player) for player in team1) / len(team1)
+    team2_rating = sum(rating(table, player) for player in team2) / len(team2)
+    change = K_FACTOR * (outcome - expected_score(team1_rating, team2_rating))
+    for player in team1:
+        table["ratings"][player] = rating(table, player) + change
+    for player in team2:
+        table["ratings"][player] = rating(table, player) - change
+
+
+def replay_ratings(table):
+    table["ratings"] = {player: DEFAULT_RATING for player in table["ratings"]}
+    for key in sorted(table["results"]):
+        apply_result(table, *table["results"][key])
+
+
+def record_rating_result(table, key, team1, team2, outcome):
+    # `outcome` is TEAM1_WIN, DRAW or TEAM2_WIN, or None to clear the result.
+    # Returns True if the ratings changed.
+    results = table["results"]
+    result = None if outcome is None else (tuple(team1), tuple(team2), outcome)
+    if results.get(key) == result:
+        return False
+
+    appended = key not in results and all(key > other for other in results)
+    if result is None:
+        results.pop(key, None)
+    else:
+        results[key] = result
+    if appended and result is not None:
+        apply_result(table, *result)
+    else:
+        replay_ratings(table)
+    return True
+
+
+def rating_array(table, players):
+    return np.array([rating(table, player) for player in players], dtype=np.float64)
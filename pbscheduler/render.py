@@ -0,0 +1,201 @@
+import html
+import io
+
+from .core import index_rounds, sitting_players
+from .itinerary import round_itinerary_entries
+from .pdf import add_block, finish_pdf, new_pdf
+
+# Printouts. Everything is written piece by piece to an output stream, so output grows
+# linearly with the schedule. The printable sheets (wall chart, one scorecard per court
+# and an itinerary per player) all come from one pass over the index-based schedule.
+
+DEFAULT_TITLE = "Pickleball Doubles Tournament"
+SHEET_SECTIONS = ("wall_chart", "scorecards", "itineraries")
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 1.5em; }
+section + section { break-before: page; }
+h2, h3 { break-after: avoid; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1em; }
+th, td { border: 1px solid #999; padding: 2px 6px; text-align: left; }
+.cards { display: grid; grid-template-columns: 1fr 1fr; gap: 12px; }
+.card, .itinerary { border: 1px solid #333; padding: 8px; break-inside: avoid; }
+.itinerary { margin-bottom: 12px; }
+.card p { margin: 4px 0; }
+.box { display: inline-block; width: 4em; border-bottom: 1px solid #333; }
+"""
+
+
+def resting_text(resting):
+    if isinstance(resting, (list, tuple)):
+        return f"Players resting this round: {', '.join(resting)}"
+    return f"Player resting this round: {resting}"
+
+
+def write_printable_schedule(all_rounds, out):
+    out.write("Pickleball Doubles Tournament - Match Results\n\n")
+    for round_number, (matches, resting_player, bye_team) in enumerate(all_rounds, 1):
+        out.write(f"Round {round_number}:\n")
+        if resting_player:
+            out.write(f"{resting_text(resting_player)}\n")
+        if bye_team:
+            out.write(f"Team sitting out this round: {bye_team[0]} & {bye_team[1]}\n")
+        for match_number, (pair1, pair2) in enumerate(matches, 1):
+            out.write(f"Match {match_number}: {pair1[0]} & {pair1[1]} vs. {pair2[0]} & {pair2[1]}\n")
+            out.write("Winner: [ ] Team 1  [ ] Team 2\n")
+            out.write("---\n")  # Add a separator between matches
+        out.write("\n")  # Add an extra line between rounds
+
+
+def generate_printable_schedule(all_rounds):
+    out = io.StringIO()
+    write_printable_schedule(all_rounds, out)
+    return out.getvalue()
+
+
+def team_text(team):
+    return f"{team[0]} & {team[1]}"
+
+
+def schedule_rows(all_rounds):
+    # One row per match (or per empty round), for rendering a schedule as a single table
+    rows = []
+    for round_number, (matches, resting_player, bye_team) in enumerate(all_rounds, 1):
+        sitting_out = ", ".join(sitting_players(resting_player, bye_team))
+        for match_number, (pair1, pair2) in enumerate(matches, 1):
+            rows.append({
+                "Round": round_number,
+                "Match": match_number,
+                "Team 1": team_text(pair1),
+                "Team 2": team_text(pair2),
+                "Sitting out": sitting_out,
+            })
+        if not len(matches):
+            rows.append({"Round": round_number, "Match": None, "Team 1": "", "Team 2": "", "Sitting out": sitting_out})
+    return rows
+
+
+def schedule_sheets(all_rounds, players):
+    # One pass over the rounds in index space. "rounds" holds each round's courts as
+    # (team1, team2) id pairs and who sits out; "itineraries" holds each player's
+    # (round, court, partner, opponents) entries, with court None when sitting out.
+    rounds = []
+    itineraries = [[] for _ in players]
+    for round_number, (matches, resting, bye_team) in enumerate(index_rounds(all_rounds, players), 1):
+        courts = matches.tolist()
+        sitting = [int(player) for player in sitting_players(resting, bye_team)]
+        for player, entry in round_itinerary_entries(round_number, courts, sitting):
+            itineraries[player].append(entry)
+        rounds.append((courts, sitting))
+    return {"rounds": rounds, "itineraries": itineraries}
+
+
+def write_html_sheets(all_rounds, players, out, title=DEFAULT_TITLE, sections=SHEET_SECTIONS):
+    # A printable HTML document; each section starts on a new page
+    sheets = schedule_sheets(all_rounds, players)
+    names = [html.escape(str(player)) for player in players]  # Escaped once, not per appearance
+
+    def team(ids):
+        return f"{names[ids[0]]} &amp; {names[ids[1]]}"
+
+    out.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>")
+    out.write(f"<style>{HTML_STYLE}</style></head><body>\n<h1>{html.escape(title)}</h1>\n")
+
+    if "wall_chart" in sections:
+        out.write("<section><h2>Schedule</h2>\n")
+        for round_number, (courts, sitting) in enumerate(sheets["rounds"], 1):
+            out.write(f"<h3>Round {round_number}</h3>\n<table><tr><th>Court</th><th>Team 1</th><th>Team 2</th></tr>\n")
+            for court_number, (team1, team2) in enumerate(courts, 1):
+                out.write(f"<tr><td>{court_number}</td><td>{team(team1)}</td><td>{team(team2)}</td></tr>\n")
+            if sitting:
+                out.write(f"<tr><td colspan=\"3\">Sitting out: {', '.join(names[p] for p in sitting)}</td></tr>\n")
+            out.write("</table>\n")
+        out.write("</section>\n")
+
+    if "scorecards" in sections:
+        out.write("<section><h2>Scorecards</h2>\n<div class=\"cards\">\n")
+        for round_number, (courts, _) in enumerate(sheets["rounds"], 1):
+            for court_number, (team1, team2) in enumerate(courts, 1):
+                out.write(
+                    f"<div class=\"card\"><h3>Round {round_number} &middot; Court {court_number}</h3>"
+                    f"<p>Team 1: {team(team1)} <span class=\"box\"></span></p>"
+                    f"<p>Team 2: {team(team2)} <span class=\"box\"></span></p>"
+                    "<p>Winner: &#9744; Team 1 &nbsp; &#9744; Team 2</p></div>\n"
+                )
+        out.write("</div></section>\n")
+
+    if "itineraries" in sections:
+        out.write("<section><h2>Player Itineraries</h2>\n")
+        for player, entries in enumerate(sheets["itineraries"]):
+            out.write(
+                f"<div class=\"itinerary\"><h3>{names[player]}</h3>"
+                "<table><tr><th>Round</th><th>Court</th><th>Partner</th><th>Opponents</th></tr>\n"
+            )
+            for round_number, court_number, partner, opponents in entries:
+                if court_number is None:
+                    out.write(f"<tr><td>{round_number}</td><td colspan=\"3\">Sitting out</td></tr>\n")
+                else:
+                    out.write(
+                        f"<tr><td>{round_number}</td><td>{court_number}</td>"
+                        f"<td>{names[partner]}</td><td>{team(opponents)}</td></tr>\n"
+                    )
+            out.write("</table></div>\n")
+        out.write("</section>\n")
+
+    out.write("</body></html>\n")
+
+
+def write_pdf_sheets(all_rounds, players, out, title=DEFAULT_TITLE, sections=SHEET_SECTIONS):
+    # The same sheets as write_html_sheets as a PDF; `out` is a binary stream
+    sheets = schedule_sheets(all_rounds, players)
+    names = [str(player) for player in players]
+
+    def team(ids):
+        return f"{names[ids[0]]} & {names[ids[1]]}"
+
+    doc = new_pdf(out)
+    add_block(doc, [("title", title), ("normal", "")])
+    started = []
+
+    def heading(text):
+        # The first section shares the title page; the others start a new one
+        add_block(doc, [("heading", text)], new_page=bool(started))
+        started.append(text)
+
+    if "wall_chart" in sections:
+        heading("Schedule")
+        for round_number, (courts, sitting) in enumerate(sheets["rounds"], 1):
+            lines = [("bold", f"Round {round_number}")]
+            lines += [
+                ("normal", f"Court {court_number:<4} {team(team1)}  vs.  {team(team2)}")
+                for court_number, (team1, team2) in enumerate(courts, 1)
+            ]
+            if sitting:
+                lines.append(("normal", f"Sitting out: {', '.join(names[p] for p in sitting)}"))
+            add_block(doc, lines + [("normal", "")])
+
+    if "scorecards" in sections:
+        heading("Scorecards")
+        for round_number, (courts, _) in enumerate(sheets["rounds"], 1):
+            for court_number, (team1, team2) in enumerate(courts, 1):
+                add_block(doc, [
+                    ("bold", f"Round {round_number} - Court {court_number}"),
+                    ("normal", f"Team 1: {team(team1)}"),
+                    ("normal", f"Team 2: {team(team2)}"),
+                    ("normal", "Score:  Team 1 ______   Team 2 ______"),
+                    ("normal", "Winner: [ ] Team 1   [ ] Team 2"),
+                    ("normal", "-" * 40),
+                ])
+
+    if "itineraries" in sections:
+        heading("Player Itineraries")
+        for player, entries in enumerate(sheets["itineraries"]):
+            lines = [("bold", names[player]), ("normal", f"{'Round':<7}{'Court':<7}{'Partner':<22}Opponents")]
+            for round_number, court_number, partner, opponents in entries:
+                if court_number is None:
+                    lines.append(("normal", f"{round_number:<7}{'-':<7}Sitting out"))
+                else:
+                    lines.append(("normal", f"{round_number:<7}{court_number:<7}{names[partner][:20]:<22}{team(opponents)}"))
+            add_block(doc, lines + [("normal", "")])
+
+    finish_pdf(doc)
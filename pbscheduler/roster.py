@@ -0,0 +1,55 @@
+from itertools import islice
+
+import numpy as np
+
+from .core import index_players, index_rounds, iter_tournament_rounds, name_rounds, schedule_state
+from .ratings import rating_array
+
+# Roster changes part way through an event. Rounds already played stay as they are and
+# only the rest are regenerated, continuing from the counts the played rounds left.
+
+
+def absence_rest_counts(all_rounds, num_players):
+    # Every round a player didn't play in counts as a rest, so late arrivals are
+    # treated as well rested and get the games they missed
+    played = np.zeros(num_players, dtype=np.int64)
+    for matches, _, _ in all_rounds:
+        np.add.at(played, np.asarray(matches, dtype=np.int64).reshape(-1), 1)
+    return len(all_rounds) - played
+
+
+def reschedule(all_rounds, num_players, from_round, active_players, num_rounds=None, num_courts=None, seed=None,
+               ratings=None, objective=None):
+    # Keeps rounds before `from_round` (0-based) and regenerates the rest for the
+    # `active_players` ids. New arrivals take ids from the old roster size upwards.
+    # `ratings` (one per player id) balances the new rounds by skill.
+    num_rounds = len(all_rounds) if num_rounds is None else num_rounds
+    played_rounds = all_rounds[:from_round]
+    state = schedule_state(played_rounds, num_players)
+    state["rest_counts"][:] = absence_rest_counts(played_rounds, num_players)
+
+    # Integer ids even when nobody is active (sorted([]) would make a float array)
+    rounds = iter_tournament_rounds(
+        np.array(sorted(active_players), dtype=np.int64), state, seed, max_matches=num_courts, ratings=ratings, objective=objective
+    )
+    all_rounds = played_rounds + list(islice(rounds, max(num_rounds - from_round, 0)))
+    return all_rounds, state["matchup_counts"], state["pairing_counts"], state["rest_counts"]
+
+
+def update_roster(all_rounds, players, active_players, from_round, num_courts=None, seed=None, ratings=None,
+                  objective=None):
+    # Name-based reschedule: `players` is everyone who has been on the roster (arrivals
+    # appended at the end) and `active_players` those playing from `from_round` on.
+    # `ratings` is a rating table from pbscheduler.ratings.
+    index = index_players(players)
+    all_rounds, matchup_counts, pairing_counts, rest_counts = reschedule(
+        index_rounds(all_rounds, players),
+        len(players),
+        from_round,
+        [index[player] for player in active_players],
+        num_courts=num_courts,
+        seed=seed,
+        ratings=None if ratings is None else rating_array(ratings, players),
+        objective=objective,
+    )
+    return name_rounds(all_rounds, players), matchup_counts, pairing_counts, rest_counts
@@ -0,0 +1,97 @@
+from .annealing import optimize_schedule
+from .cache import cached_schedule
+from .core import (
+    generate_tournament_schedule,
+    index_rounds,
+    iter_tournament_rounds,
+    name_round,
+    name_rounds,
+    schedule_state,
+)
+from .multicourt import generate_multi_court_schedule
+from .objective import objective_key, preferred_court_costs
+from .parallel import parallel_multi_court_schedule, parallel_tournament_schedule
+
+# Name-based entry points used by the apps and the command line. Generation happens
+# in index space and names are only attached to the finished rounds.
+
+# Searches on all cores turn the optimization time into a move budget (about what
+# one core gets through in that time), so a schedule number always gives the same schedule
+OPTIMIZE_MOVES_PER_SECOND = 20000
+
+
+def search_settings(use_all_cores, method, candidates, objective):
+    # The cache key's description of how a schedule was searched for
+    search = f"random:{candidates}" if method == "random" else method
+    return f"all_cores={use_all_cores},method={search},{objective_key(objective)}"
+
+
+def tournament_schedule(players, num_rounds, optimize_seconds=0, use_all_cores=False, schedule_number=1,
+                        use_cache=True, objective=None, method="matching", candidates=1000):
+    # `method` is "matching", or "random" to keep the best of `candidates` random pairings
+    def generate():
+        if use_all_cores:
+            return parallel_tournament_schedule(
+                len(players), num_rounds, seed=schedule_number,
+                optimize_moves=optimize_seconds * OPTIMIZE_MOVES_PER_SECOND, objective=objective, method=method,
+                candidates=candidates,
+            )
+        schedule = generate_tournament_schedule(
+            len(players), num_rounds, seed=schedule_number, method=method, candidates=candidates, objective=objective
+        )
+        if optimize_seconds > 0:
+            schedule = optimize_schedule(
+                schedule[0], len(players), optimize_seconds, seed=schedule_number, objective=objective
+            )
+        return schedule
+
+    # Schedules only depend on the head count, so the same settings reuse the saved one
+    if use_cache:
+        settings = f"optimize={optimize_seconds}s,{search_settings(use_all_cores, method, candidates, objective)}"
+        schedule = cached_schedule(generate, len(players), num_rounds, seed=schedule_number, objective=settings)
+    else:
+        schedule = generate()
+    all_rounds, matchup_counts, pairing_counts, rest_counts = schedule
+    return name_rounds(all_rounds, players), matchup_counts, pairing_counts, rest_counts
+
+
+def multi_court_schedule(players, num_rounds, num_courts, seed=None, objective=None, preferred_courts=None,
+                         method="matching", candidates=1000, use_all_cores=False, use_cache=True):
+    # `preferred_courts` maps player names to the court number (from 1) they'd rather play on
+    court_costs = None
+    preferred = None
+    if preferred_courts:
+        preferred = [preferred_courts.get(player, 0) - 1 for player in players]
+        court_costs = preferred_court_costs(preferred, num_courts)
+
+    def generate():
+        if use_all_cores:
+            return parallel_multi_court_schedule(
+                len(players), num_rounds, num_courts, seed, objective=objective, court_costs=court_costs,
+                method=method, candidates=candidates,
+            )
+        return generate_multi_court_schedule(
+            len(players), num_rounds, num_courts, seed, objective, court_costs, method, candidates
+        )
+
+    # Only seeded schedules are cached; without a seed every call draws a new one
+    if use_cache and seed is not None:
+        settings = search_settings(use_all_cores, method, candidates, objective)
+        if preferred is not None:
+            settings += f",preferred={':'.join(map(str, preferred))}"
+        schedule = cached_schedule(generate, len(players), num_rounds, num_courts, seed, settings)
+    else:
+        schedule = generate()
+    all_rounds, matchup_counts, pairing_counts, rest_counts = schedule
+    return name_rounds(all_rounds, players), matchup_counts, pairing_counts, rest_counts
+
+
+def continue_schedule(all_rounds, players):
+    # Schedule state after the named rounds played so far
+    return schedule_state(index_rounds(all_rounds, players), len(players))
+
+
+def named_tournament_rounds(players, state, seed=None):
+    # Endless named rounds continuing from `state`, which is updated as rounds are taken
+    for matches, resting_player, bye_team in iter_tournament_rounds(range(len(players)), state, seed):
+        yield name_round(matches, resting_player, players, bye_team)
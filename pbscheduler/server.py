@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import json
+from collections import deque
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .itinerary import itinerary_index, next_match, player_itinerary, update_itinerary_index
+from .leaderboard import adjust_score, court_awards, court_winner, leaderboard, new_ledger, record_result, rounds_played
+from .ratings import OUTCOMES, new_ratings, record_rating_result
+from .roster import update_roster
+from .store import append_result, load_tournament, open_store, save_schedule
+
+# A local tournament service. One process owns each tournament's state, loaded from the
+# store on first use; scorekeepers POST results and clients long-poll for the changes
+# since the version they last saw. Handlers never await while changing state, so
+# concurrent submissions are applied one at a time in arrival order. Every change is
+# written to the store before it is pushed, and the version counts those writes.
+#
+#   GET  /tournaments/<id>                      full state
+#   GET  /tournaments/<id>/updates?since=V&wait=S   changes after version V
+#   GET  /tournaments/<id>/players/<name>       a player's next match and itinerary
+#   POST /tournaments/<id>/results              {"results": [{"round", "match", "result"}]}
+#   POST /tournaments/<id>/roster               {"roster": {"players", "active", ...}}
+#
+# Results are the apps' court rows: {"Team 1", "Team 2", "Team 1 score", "Team 2 score",
+# "Winner"}, with Winner "Team 1", "Team 2" or anything else for not played.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_CHANGES = 1000  # Clients further behind than this get the full state instead
+MAX_WAIT = 30.0  # Longest a long-poll is held open, in seconds
+MAX_BODY = 1 << 20
+
+
+def new_service(conn):
+    return {"store": conn, "tournaments": {}}
+
+
+def live_tournament(service, tournament_id):
+    # None if there is no such tournament
+    live = service["tournaments"].get(tournament_id)
+    if live is None:
+        tournament = load_tournament(service["store"], tournament_id)
+        if tournament is None:
+            return None
+        live = {
+            "tournament": tournament,
+            "ledger": new_ledger(tournament["roster"]["players"]),
+            "ratings": new_ratings(tournament["roster"]["players"]),
+            "version": tournament.pop("version"),
+            "changes": deque(maxlen=MAX_CHANGES),
+            "changed": asyncio.Event(),
+            "itineraries": itinerary_index(tournament["all_rounds"]),
+        }
+        score_all(live)
+        service["tournaments"][tournament_id] = live
+    return live
+
+
+def score_court(live, key):
+    # Returns the players whose points changed and whether any rating did
+    tournament = live["tournament"]
+    round_number, match_number = key
+    pair1, pair2 = tournament["all_rounds"][round_number - 1][0][match_number - 1]
+    result = tournament["results"].get(key)
+    awards = court_awards(result, pair1, pair2, tournament["settings"].get("points_per_win", 1))
+    outcome = OUTCOMES.get(court_winner(result, pair1, pair2))
+    old = live["ledger"]["results"].get(key, {})
+    record_result(live["ledger"], key, awards)
+    ratings_changed = record_rating_result(live["ratings"], key, pair1, pair2, outcome)
+    return old.keys() | awards.keys(), ratings_changed
+
+
+def score_all(live):
+    for round_number, (matches, _, _) in enumerate(live["tournament"]["all_rounds"], 1):
+        for match_number in range(1, len(matches) + 1):
+            score_court(live, (round_number, match_number))
+
+
+def push_change(live, change):
+    live["version"] += 1
+    live["changes"].append(dict(change, version=live["version"]))
+    # Wake every waiting client, then start a new wait
+    live["changed"].set()
+    live["changed"] = asyncio.Event()
+
+
+def player_snapshot(live, player):
+    # None for someone not on the roster
+    if player not in live["itineraries"]["players"] and player not in live["tournament"]["roster"]["players"]:
+        return None
+    played = rounds_played(live["ledger"])
+    return {
+        "version": live["version"],
+        "player": player,
+        "rounds_played": played,
+        "next": next_match(live["itineraries"], player, played),
+        "itinerary": player_itinerary(live["itineraries"], player),
+    }
+
+
+def tournament_snapshot(live):
+    tournament = live["tournament"]
+    return {
+        "version": live["version"],
+        "tournament": dict(
+            tournament,
+            results=[
+                {"round": round_number, "match": match_number, "result": result}
+                for (round_number, match_number), result in tournament["results"].items()
+            ],
+        ),
+        "leaderboard": leaderboard(live["ledger"]),
+    }
+
+
+def changes_since(live, since):
+    changes = live["changes"]
+    oldest = live["version"] - len(changes)
+    if since < oldest or since > live["version"]:
+        return tournament_snapshot(live)
+    return {"version": live["version"], "changes": list(changes)[since - oldest:]}
+
+
+async def wait_for_changes(live, since, wait):
+    if live["version"] == since and wait > 0:
+        try:
+            await asyncio.wait_for(live["changed"].wait(), wait)
+        except asyncio.TimeoutError:
+            pass
+    return changes_since(live, since)
+
+
+def read_submissions(live, submissions):
+    # Checks a whole batch before any of it is applied
+    all_rounds = live["tournament"]["all_rounds"]
+    checked = []
+    for submission in submissions:
+        key = (int(submission["round"]), int(submission["match"]))
+        result = submission["result"]
+        if not 1 <= key[0] <= len(all_rounds) or not 1 <= key[1] <= len(all_rounds[key[0] - 1][0]):
+            raise ValueError(f"No match {key[1]} in round {key[0]}")
+        if not isinstance(result, dict):
+            raise ValueError("A result must be an object")
+        int(result.get("Team 1 score", 0)), int(result.get("Team 2 score", 0))
+        checked.append((key, result))
+    return checked
+
+
+def submit_results(service, live, submissions):
+    tournament = live["tournament"]
+    ratings_changed = False
+    for key, result in read_submissions(live, submissions):
+        if tournament["results"].get(key) == result:
+            continue
+        append_result(service["store"], tournament["id"], key, result)
+        tournament["results"][key] = result
+        players, changed = score_court(live, key)
+        ratings_changed = ratings_changed or changed
+        push_change(live, {
+            "type": "result",
+            "round": key[0],
+            "match": key[1],
+            "result": result,
+            "scores": {player: live["ledger"]["scores"][player] for player in players},
+        })
+
+    # Replan the rounds still to come around the new ratings
+    if ratings_changed and tournament["settings"].get("balance_skill"):
+        replan(service, live)
+
+
+def change_roster(service, live, roster):
+    # Arrivals are appended to "players"; "active" is who plays from now on
+    players = live["tournament"]["roster"]["players"]
+    if list(roster["players"][:len(players)]) != players:
+        raise ValueError("Players can only be added to the end of the roster")
+    if not set(roster["active"]) <= set(roster["players"]) or len(roster["active"]) < 4:
+        raise ValueError("At least 4 active players from the roster are needed")
+    for player in roster["players"][len(players):]:
+        adjust_score(live["ledger"], player, 0)
+    live["tournament"]["roster"] = dict(roster)
+    replan(service, live)
+
+
+def replan(service, live):
+    # Played rounds stay put; the rest are rescheduled for the active players
+    tournament = live["tournament"]
+    roster, settings = tournament["roster"], tournament["settings"]
+    from_round = rounds_played(live["ledger"])
+    tournament["all_rounds"] = update_roster(
+        tournament["all_rounds"],
+        roster["players"],
+        roster["active"],
+        from_round,
+        settings.get("num_courts"),
+        ratings=live["ratings"] if settings.get("balance_skill") else None,
+    )[0]
+    update_itinerary_index(live["itineraries"], tournament["all_rounds"], from_round)
+    save_schedule(service["store"], tournament["id"], roster["players"], tournament["all_rounds"], roster)
+    score_all(live)
+    push_change(live, {
+        "type": "schedule",
+        "roster": roster,
+        "all_rounds": tournament["all_rounds"],
+        "leaderboard": leaderboard(live["ledger"]),
+    })
+
+
+async def handle_request(service, method, target, body):
+    url = urlsplit(target)
+    parts = url.path.strip("/").split("/")
+    if len(parts) not in (2, 3, 4) or parts[0] != "tournaments" or not parts[1].isdigit():
+        return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+    live = live_tournament(service, int(parts[1]))
+    if live is None:
+        return HTTPStatus.NOT_FOUND, {"error": f"No tournament {parts[1]}"}
+
+    route = (method, parts[2] if len(parts) > 2 else "")
+    if route == ("GET", "players") and len(parts) == 4:
+        player = unquote(parts[3])
+        snapshot = player_snapshot(live, player)
+        if snapshot is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"No player {player}"}
+        return HTTPStatus.OK, snapshot
+    if len(parts) == 4:
+        return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+    try:
+        if route == ("GET", ""):
+            return HTTPStatus.OK, tournament_snapshot(live)
+        if route == ("GET", "updates"):
+            query = parse_qs(url.query)
+            since = int(query.get("since", ["0"])[0])
+            wait = min(float(query.get("wait", ["0"])[0]), MAX_WAIT)
+            return HTTPStatus.OK, await wait_for_changes(live, since, wait)
+        if route == ("POST", "results"):
+            submit_results(service, live, json.loads(body)["results"])
+            return HTTPStatus.OK, {"version": live["version"]}
+        if route == ("POST", "roster"):
+            change_roster(service, live, json.loads(body)["roster"])
+            return HTTPStatus.OK, {"version": live["version"]}
+    except (ValueError, KeyError, TypeError) as e:
+        return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+    return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+
+async def read_request(reader):
+    # (method, target, body), or None if the client hung up
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise ValueError("Request body too large")
+    return method, target, await reader.readexactly(length)
+
+
+def http_response(status, payload):
+    body = json.dumps(payload, default=lambda v: v.item()).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        try:
+            request = await read_request(reader)
+        except ValueError as e:
+            writer.write(http_response(HTTPStatus.BAD_REQUEST, {"error": str(e)}))
+        else:
+            if request is not None:
+                writer.write(http_response(*await handle_request(service, *request)))
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT, store=None):
+    # Port 0 picks a free port; see server.sockets
+    service = new_service(open_store(store))
+    return await asyncio.start_server(partial(handle_connection, service), host, port)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, store=None):
+    server = await start_server(host, port, store)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="pbscheduler.server", description="Serve tournaments from the store.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--store", help="tournament database (default: PBSCHEDULER_STORE or the user data folder)")
+    args = parser.parse_args(argv)
+    print(f"Serving tournaments on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, args.store))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
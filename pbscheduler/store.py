@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+import time
+
+from .cache import decode_rounds, encode_rounds
+from .core import index_rounds, name_rounds
+
+# Durable tournaments. Nothing is updated in place: every schedule change is saved
+# as a new version and every result is appended as a row, so the latest version and
+# the latest row per (round, match) are the current state. WAL mode lets readers
+# load a tournament while another device is writing results.
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".local", "share", "pbscheduler", "tournaments.sqlite3")
+
+
+def store_path():
+    return os.environ.get("PBSCHEDULER_STORE", DEFAULT_STORE_PATH)
+
+
+def open_store(path=None):
+    path = path or store_path()
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tournaments (id INTEGER PRIMARY KEY, name TEXT, settings TEXT, created REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schedules ("
+            " tournament_id INTEGER, version INTEGER, roster TEXT, data BLOB, saved REAL,"
+            " PRIMARY KEY (tournament_id, version))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " id INTEGER PRIMARY KEY, tournament_id INTEGER, round INTEGER, match INTEGER, result TEXT, recorded REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS results_by_tournament ON results (tournament_id, id)")
+    return conn
+
+
+def to_json(value):
+    # NumPy scalars (e.g. from DataFrame rows) become plain numbers
+    return json.dumps(value, default=lambda v: v.item())
+
+
+def create_tournament(conn, name, players, all_rounds, settings=None, roster=None):
+    with conn:
+        tournament_id = conn.execute(
+            "INSERT INTO tournaments (name, settings, created) VALUES (?, ?, ?)",
+            (name, to_json(settings or {}), time.time()),
+        ).lastrowid
+    save_schedule(conn, tournament_id, players, all_rounds, roster)
+    return tournament_id
+
+
+def save_schedule(conn, tournament_id, players, all_rounds, roster=None):
+    # `players` names the rounds' player ids; `roster` holds any other roster details
+    # the app wants back (e.g. who is still playing)
+    roster = dict(roster or {}, players=list(players))
+    with conn:
+        (version,) = conn.execute(
+            "SELECT COALESCE(MAX(version), 0) + 1 FROM schedules WHERE tournament_id = ?", (tournament_id,)
+        ).fetchone()
+        conn.execute(
+            "INSERT INTO schedules VALUES (?, ?, ?, ?, ?)",
+            (tournament_id, version, to_json(roster), encode_rounds(index_rounds(all_rounds, players)), time.time()),
+        )
+    return version
+
+
+def append_result(conn, tournament_id, key, result):
+    round_number, match_number = key
+    with conn:
+        conn.execute(
+            "INSERT INTO results (tournament_id, round, match, result, recorded) VALUES (?, ?, ?, ?, ?)",
+            (tournament_id, round_number, match_number, to_json(result), time.time()),
+        )
+
+
+def list_tournaments(conn, name=None, limit=-1):
+    # (id, name, created) rows, newest first; `name` keeps only tournaments with that name
+    if name is None:
+        return conn.execute("SELECT id, name, created FROM tournaments ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    return conn.execute(
+        "SELECT id, name, created FROM tournaments WHERE name = ? ORDER BY id DESC LIMIT ?", (name, limit)
+    ).fetchall()
+
+
+def load_tournament(conn, tournament_id):
+    # None if there is no such tournament
+    row = conn.execute("SELECT name, settings FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+    if row is None:
+        return None
+    name, settings = row
+    version, roster, data = conn.execute(
+        "SELECT version, roster, data FROM schedules WHERE tournament_id = ? ORDER BY version DESC LIMIT 1", (tournament_id,)
+    ).fetchone()
+    roster = json.loads(roster)
+
+    results = {}
+    for round_number, match_number, result in conn.execute(
+        "SELECT round, match, result FROM results WHERE tournament_id = ? ORDER BY id", (tournament_id,)
+    ):
+        results[(round_number, match_number)] = json.loads(result)
+        version += 1
+
+    return {
+        "id": tournament_id,
+        "name": name,
+        "settings": json.loads(settings),
+        "roster": roster,
+        "all_rounds": name_rounds(decode_rounds(data), roster["players"]),
+        "results": results,
+        # Number of writes so far, so it only ever goes up
+        "version": version,
+    }
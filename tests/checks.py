@@ -0,0 +1,19 @@
+import numpy as np
+
+from pbscheduler import count_schedule, sitting_players
+
+# Assertions shared by the schedule tests
+
+
+def assert_counts_match_rounds(schedule, num_players):
+    all_rounds, matchup_counts, pairing_counts, rest_counts = schedule
+    pairing, matchup, rests = count_schedule(all_rounds, num_players)
+    assert np.array_equal(pairing_counts, pairing)
+    assert np.array_equal(matchup_counts, matchup)
+    assert np.array_equal(rest_counts, rests)
+
+
+def assert_everyone_once_per_round(all_rounds, num_players):
+    for matches, resting, bye_team in all_rounds:
+        seen = np.concatenate([np.asarray(matches).reshape(-1), sitting_players(resting, bye_team)])
+        assert sorted(seen.tolist()) == list(range(num_players))
@@ -0,0 +1,13 @@
+import pytest
+
+from checks import assert_counts_match_rounds, assert_everyone_once_per_round
+from pbscheduler import generate_tournament_schedule, optimize_schedule
+
+
+@pytest.mark.parametrize("num_players", [7, 10, 15])
+def test_annealing_keeps_every_player_in_each_round(num_players):
+    all_rounds = generate_tournament_schedule(num_players, 10, seed=2, use_designs=False)[0]
+    schedule = optimize_schedule(all_rounds, num_players, time_budget=None, seed=2, max_moves=3000)
+    assert_everyone_once_per_round(schedule[0], num_players)
+    assert [len(matches) for matches, _, _ in schedule[0]] == [len(matches) for matches, _, _ in all_rounds]
+    assert_counts_match_rounds(schedule, num_players)
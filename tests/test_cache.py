@@ -0,0 +1,61 @@
+import sqlite3
+
+import numpy as np
+
+from pbscheduler import cached_schedule, generate_multi_court_schedule, generate_tournament_schedule, multi_court_schedule
+from pbscheduler.cache import GENERATOR_VERSION, decode_rounds, encode_rounds
+
+
+def plain_rounds(all_rounds):
+    # Comparable form of index rounds, whatever array types they hold
+    return [
+        (np.asarray(matches).tolist(), None if resting is None else np.asarray(resting).tolist(),
+         None if bye_team is None else np.asarray(bye_team).tolist())
+        for matches, resting, bye_team in all_rounds
+    ]
+
+
+def test_cache_encoding_round_trips_every_round_shape():
+    for all_rounds in (
+        generate_tournament_schedule(10, 6, seed=1, use_designs=False)[0],  # Bye teams
+        generate_tournament_schedule(11, 6, seed=1, use_designs=False)[0],  # A resting player and a bye team
+        generate_multi_court_schedule(14, 6, 2, seed=1)[0],  # Lists of sitting players
+    ):
+        assert plain_rounds(decode_rounds(encode_rounds(all_rounds))) == plain_rounds(all_rounds)
+
+
+def test_cached_schedule_returns_the_saved_schedule(tmp_path):
+    path = str(tmp_path / "schedules.sqlite3")
+    generated = []
+
+    def generate():
+        generated.append(True)
+        return generate_tournament_schedule(10, 6, seed=1, use_designs=False)
+
+    first = cached_schedule(generate, 10, 6, seed=1, path=path)
+    second = cached_schedule(generate, 10, 6, seed=1, path=path)
+    assert len(generated) == 1
+    assert plain_rounds(second[0]) == plain_rounds(first[0])
+    for counts, cached_counts in zip(first[1:], second[1:]):
+        assert np.array_equal(counts, cached_counts)
+
+
+
+
+def test_multi_court_schedules_are_cached_by_courts_and_seed(tmp_path, monkeypatch):
+    monkeypatch.setenv("PBSCHEDULER_CACHE", str(tmp_path / "schedules.sqlite3"))
+    players = [f"Player {i + 1}" for i in range(14)]
+    first = multi_court_schedule(players, 6, 2, seed=1)
+    assert multi_court_schedule(players, 6, 2, seed=1)[0] == first[0]
+    for counts, cached_counts in zip(first[1:], multi_court_schedule(players, 6, 2, seed=1)[1:]):
+        assert np.array_equal(counts, cached_counts)
+
+    conn = sqlite3.connect(str(tmp_path / "schedules.sqlite3"))
+    keys = conn.execute("SELECT num_courts, seed, objective FROM schedules").fetchall()
+    assert [(num_courts, seed) for num_courts, seed, _ in keys] == [(2, 1)]
+    assert keys[0][2].startswith(f"v{GENERATOR_VERSION},")
+    multi_court_schedule(players, 6, 3, seed=1)
+    multi_court_schedule(players, 6, 2, seed=2)
+    multi_court_schedule(players, 6, 2)  # Unseeded schedules aren't cached
+    assert conn.execute("SELECT COUNT(*) FROM schedules").fetchone() == (3,)
+    conn.close()
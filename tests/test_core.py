@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from checks import assert_counts_match_rounds, assert_everyone_once_per_round
+from pbscheduler import count_schedule, generate_multi_court_schedule, generate_tournament_schedule, schedule_cost
+
+
+@pytest.mark.parametrize("num_players", [5, 6, 7, 10, 11, 14])
+@pytest.mark.parametrize("method", ["matching", "random"])
+def test_generated_counts_match_the_rounds(num_players, method):
+    schedule = generate_tournament_schedule(num_players, 8, seed=1, method=method, use_designs=False)
+    assert_everyone_once_per_round(schedule[0], num_players)
+    assert_counts_match_rounds(schedule, num_players)
+
+
+@pytest.mark.parametrize("num_players, num_courts", [(10, 2), (13, 2), (18, 3)])
+def test_multi_court_counts_match_the_rounds(num_players, num_courts):
+    schedule = generate_multi_court_schedule(num_players, 8, num_courts, seed=1)
+    assert_everyone_once_per_round(schedule[0], num_players)
+    assert_counts_match_rounds(schedule, num_players)
+
+
+def test_bye_team_is_not_counted_as_partners():
+    # Six players make three teams, so one team sits out every round
+    _, _, pairing_counts, rest_counts = generate_tournament_schedule(6, 2, seed=1, use_designs=False)
+    assert np.array_equal(pairing_counts.sum(axis=1) + rest_counts, np.full(6, 2))
+
+
+def test_schedule_cost_is_the_same_from_either_count_path():
+    all_rounds, matchup_counts, pairing_counts, rest_counts = generate_tournament_schedule(10, 6, seed=1)
+    pairing, matchup, rests = count_schedule(all_rounds, 10)
+    assert schedule_cost(pairing_counts, matchup_counts, rest_counts) == schedule_cost(pairing, matchup, rests)
+
+
+@pytest.mark.parametrize("num_players", [5, 6, 7, 9, 10, 11, 14, 15])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_rests_stay_even(num_players, seed):
+    rest_counts = generate_tournament_schedule(num_players, num_players, seed=seed, use_designs=False)[3]
+    assert np.ptp(rest_counts) <= 1
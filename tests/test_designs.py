@@ -0,0 +1,20 @@
+from itertools import combinations
+
+import pytest
+
+from checks import assert_everyone_once_per_round
+from pbscheduler import count_schedule, whist_design
+from pbscheduler.designs import BASE_ROUNDS
+
+
+@pytest.mark.parametrize("num_players", sorted(BASE_ROUNDS) + [29, 37])
+def test_whist_designs_are_balanced(num_players):
+    rounds, resting = whist_design(num_players)
+    all_rounds = [
+        (matches, None if resting is None else int(resting[r]), None) for r, matches in enumerate(rounds)
+    ]
+    assert_everyone_once_per_round(all_rounds, num_players)
+    pairing_counts, matchup_counts, _ = count_schedule(all_rounds, num_players)
+    for i, j in combinations(range(num_players), 2):
+        assert pairing_counts[i, j] == 1
+        assert matchup_counts[i, j] == 2
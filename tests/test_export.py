@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+
+import pytest
+
+from pbscheduler import generate_tournament_schedule, match_rows, name_rounds, read_roster, write_schedule_json, write_table
+from pbscheduler.export import CSV_HEADER
+
+
+@pytest.mark.parametrize("text, names", [
+    ("Name,Rating\nAnn,3.5\nBob,4.0\n", ["Ann", "Bob"]),
+    ("Full Name,Rating\nAnn,1200\nBob,1100\n", ["Ann", "Bob"]),
+    ("First Name,Last Name,Rating\nAnn,Lee,3.5\nBob,Ng,4.0\n", ["Ann Lee", "Bob Ng"]),
+    ("Ann,3.5\nBob,4.0\n", ["Ann", "Bob"]),
+    ("Ann\nBob\nAnn\n\n", ["Ann", "Bob"]),
+])
+def test_csv_rosters(text, names):
+    assert read_roster(io.StringIO(text), "csv") == names
+
+
+def test_a_detected_header_is_never_a_player():
+    assert read_roster(io.StringIO("Club,Rating\nAnn,1200\nBob,1100\n"), "csv") == ["Ann", "Bob"]
+
+
+def test_json_and_text_rosters():
+    players = [{"first_name": "Ann", "last_name": "Lee"}, {"name": "Bob"}, "Cat"]
+    assert read_roster(io.StringIO(json.dumps({"players": players})), "json") == ["Ann Lee", "Bob", "Cat"]
+    jsonl = "\n".join(json.dumps(player) for player in players) + "\n"
+    assert read_roster(io.StringIO(jsonl), "jsonl") == ["Ann Lee", "Bob", "Cat"]
+    assert read_roster(io.StringIO(" Ann \nBob\n"), "text") == ["Ann", "Bob"]
+
+
+def named_schedule():
+    players = [f"P{i}" for i in range(7)]
+    return name_rounds(generate_tournament_schedule(7, 3, seed=1)[0], players)
+
+
+def test_match_rows_round_trip_through_csv_and_jsonl():
+    all_rounds = named_schedule()
+    rows = list(match_rows(all_rounds))
+    assert len(rows) == sum(len(matches) for matches, _, _ in all_rounds)
+
+    out = io.StringIO()
+    write_table(rows, CSV_HEADER, out, "csv")
+    read_back = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["team1_player1"] for row in read_back] == [row["team1_player1"] for row in rows]
+    assert [row["resting"] for row in read_back] == [";".join(row["resting"]) for row in rows]
+
+    out = io.StringIO()
+    write_table(rows, CSV_HEADER, out, "jsonl")
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == rows
+
+
+def test_schedule_json_lists_everyone_once_per_round():
+    all_rounds = named_schedule()
+    out = io.StringIO()
+    write_schedule_json(all_rounds, out)
+    for record in json.loads(out.getvalue())["rounds"]:
+        players = [p for match in record["matches"] for p in match["team1"] + match["team2"]] + record["resting"]
+        assert sorted(players) == [f"P{i}" for i in range(7)]
+
+
+def test_parquet_export(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from pbscheduler import write_parquet
+
+    rows = list(match_rows(named_schedule()))
+    write_parquet(rows, CSV_HEADER, tmp_path / "schedule.parquet", batch_size=2)
+    assert pq.read_table(tmp_path / "schedule.parquet").num_rows == len(rows)
@@ -0,0 +1,41 @@
+from pbscheduler import (
+    add_round,
+    itinerary_index,
+    multi_court_schedule,
+    next_match,
+    tournament_schedule,
+    update_itinerary_index,
+    update_roster,
+    upcoming_entries,
+)
+
+PLAYERS = [f"Player {i + 1}" for i in range(11)]
+
+
+def test_update_matches_a_full_rebuild_after_a_roster_change():
+    all_rounds = multi_court_schedule(PLAYERS, 8, 2, seed=1, use_cache=False)[0]
+    index = itinerary_index(all_rounds)
+
+    players = PLAYERS + ["Late 1", "Late 2"]
+    active = [player for player in players if player != "Player 3"]
+    all_rounds = update_roster(all_rounds, players, active, 3, num_courts=2, seed=1)[0]
+    update_itinerary_index(index, all_rounds, 3)
+    assert index == itinerary_index(all_rounds)
+
+
+def test_added_rounds_match_a_full_rebuild():
+    all_rounds = tournament_schedule(PLAYERS, 6, use_cache=False)[0]
+    index = itinerary_index(all_rounds[:4])
+    for schedule_round in all_rounds[4:]:
+        add_round(index, schedule_round)
+    assert index == itinerary_index(all_rounds)
+
+
+def test_next_match_skips_rounds_sitting_out():
+    index = itinerary_index(tournament_schedule(PLAYERS, 6, use_cache=False)[0])
+    for player in PLAYERS:
+        for played in range(7):
+            entries = upcoming_entries(index, player, played)
+            assert [entry[0] for entry in entries] == list(range(played + 1, 7))
+            playing = [entry for entry in entries if entry[1] is not None]
+            assert next_match(index, player, played) == (playing[0] if playing else None)
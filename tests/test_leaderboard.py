@@ -0,0 +1,39 @@
+from pbscheduler import court_awards, leaderboard, match_awards, new_ledger, rebuild_ledger, record_result, rounds_played
+
+PLAYERS = ["Ann", "Bo", "Cy", "Di", "Ed", "Flo", "Gus", "Hal"]
+
+
+def test_results_only_change_their_own_key():
+    ledger = new_ledger(PLAYERS)
+    record_result(ledger, (1, 1), match_awards(("Ann", "Bo"), 3))
+    record_result(ledger, (1, 2), match_awards(("Ed", "Flo"), 2))
+    record_result(ledger, (2, 1), match_awards(("Cy", "Di"), 1))
+    record_result(ledger, (1, 1), match_awards(("Cy", "Di"), 1))  # A correction
+    record_result(ledger, (2, 1), {})  # Cleared
+
+    assert ledger["results"] == {(1, 1): {"Cy": 1, "Di": 1}, (1, 2): {"Ed": 2, "Flo": 2}}
+    assert dict(leaderboard(ledger)) == {**dict.fromkeys(PLAYERS, 0), "Cy": 1, "Di": 1, "Ed": 2, "Flo": 2}
+    assert leaderboard(ledger) == leaderboard(rebuild_ledger(ledger["results"], PLAYERS))
+
+
+def test_unchanged_results_leave_the_ledger_alone():
+    ledger = new_ledger(PLAYERS)
+    assert record_result(ledger, (1, 1), match_awards(("Ann", "Bo"), 1))
+    assert not record_result(ledger, (1, 1), match_awards(("Ann", "Bo"), 1))
+    assert not record_result(ledger, (1, 2), {})
+
+
+def test_court_awards_need_the_scheduled_teams():
+    result = {"Team 1": "Ann & Bo", "Team 2": "Cy & Di", "Team 1 score": 11, "Team 2 score": 8, "Winner": "Team 1"}
+    assert court_awards(result, ("Ann", "Bo"), ("Cy", "Di"), points_per_win=2) == {"Ann": 5, "Bo": 5}
+    assert court_awards(dict(result, Winner="Not played"), ("Ann", "Bo"), ("Cy", "Di")) == {}
+    assert court_awards(result, ("Ann", "Ed"), ("Cy", "Di")) == {}  # Rescheduled since
+    assert court_awards(None, ("Ann", "Bo"), ("Cy", "Di")) == {}
+
+
+def test_rounds_played_is_the_last_round_with_a_result():
+    ledger = new_ledger(PLAYERS)
+    assert rounds_played(ledger) == 0
+    record_result(ledger, (3, 1), match_awards(("Ann", "Bo"), 1))
+    record_result(ledger, (1, 2), match_awards(("Cy", "Di"), 1))
+    assert rounds_played(ledger) == 3
@@ -0,0 +1,47 @@
+from itertools import islice
+
+import numpy as np
+
+from pbscheduler import load_season, new_season, record_week, save_season, season_rounds
+
+MEMBERS = [f"Member {i + 1}" for i in range(10)]
+
+
+def play_week(season, attendees, num_rounds=5, seed=1):
+    all_rounds = list(islice(season_rounds(season, attendees, seed=seed), num_rounds))
+    record_week(season, all_rounds)
+    return all_rounds
+
+
+def test_weeks_add_up_in_the_season_counts():
+    season = new_season()
+    play_week(season, MEMBERS[:8], seed=1)
+    play_week(season, MEMBERS[2:], seed=2)
+    assert season["players"] == MEMBERS[:8] + MEMBERS[8:]
+    assert season["weeks"] == 2
+    # Every game gives each player one partner and two opponents
+    games = season["pairing_counts"].sum(axis=1)
+    assert np.array_equal(season["matchup_counts"].sum(axis=1), 2 * games)
+    assert games.sum() + season["rest_counts"].sum() == 8 * 5 + 8 * 5
+
+
+def test_a_week_is_scheduled_against_the_season_so_far():
+    # Last week's partners are avoided this week
+    season = new_season(MEMBERS[:8])
+    first_week = play_week(season, MEMBERS[:8], num_rounds=1, seed=1)
+    second_week = list(islice(season_rounds(season, MEMBERS[:8], seed=1), 1))
+    first_teams = {frozenset(team) for match in first_week[0][0] for team in match}
+    second_teams = {frozenset(team) for match in second_week[0][0] for team in match}
+    assert not first_teams & second_teams
+
+
+def test_seasons_round_trip_through_a_file(tmp_path):
+    path = str(tmp_path / "season.npz")
+    assert load_season(path)["players"] == []
+    season = new_season()
+    play_week(season, MEMBERS)
+    save_season(season, path)
+    loaded = load_season(path)
+    assert loaded["players"] == season["players"] and loaded["weeks"] == 1
+    for counts in ("pairing_counts", "matchup_counts", "rest_counts"):
+        assert np.array_equal(loaded[counts], season[counts])
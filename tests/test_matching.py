@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from pbscheduler.matching import min_cost_perfect_matching
+
+
+def matching_cost(pairs, cost):
+    return cost[pairs[:, 0], pairs[:, 1]].sum()
+
+
+def brute_force_cost(cost, players=None):
+    players = list(range(len(cost))) if players is None else players
+    if not players:
+        return 0
+    first, rest = players[0], players[1:]
+    return min(cost[first, other] + brute_force_cost(cost, [p for p in rest if p != other]) for other in rest)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matching_finds_the_optimum_on_small_rosters(seed):
+    rng = np.random.default_rng(seed)
+    cost = rng.integers(0, 30, (8, 8))
+    cost = cost + cost.T
+    pairs = min_cost_perfect_matching(np.arange(8), cost, np.random.default_rng(seed))
+    assert sorted(pairs.ravel()) == list(range(8))
+    assert matching_cost(pairs, cost) == brute_force_cost(cost)
+
+
+def test_matching_is_reproducible_from_a_seed():
+    cost = np.random.default_rng(0).integers(0, 30, (24, 24))
+    cost = cost + cost.T
+    first = min_cost_perfect_matching(np.arange(24), cost, np.random.default_rng(3))
+    second = min_cost_perfect_matching(np.arange(24), cost, np.random.default_rng(3))
+    assert np.array_equal(first, second)
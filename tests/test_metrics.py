@@ -0,0 +1,51 @@
+import numpy as np
+
+from pbscheduler import (
+    fairness_score,
+    generate_tournament_schedule,
+    opponent_coverage,
+    repeat_histogram,
+    rest_gaps,
+    rest_matrix,
+    schedule_metrics,
+)
+
+
+def test_histograms_count_player_pairs():
+    counts = np.array([[0, 2, 0], [2, 0, 1], [0, 1, 0]])
+    assert repeat_histogram(counts).tolist() == [1, 1, 1]
+    assert opponent_coverage(counts) == 100.0 * 2 / 3
+    assert opponent_coverage(np.zeros((1, 1), dtype=int)) == 100.0
+
+
+def test_rest_matrix_and_gaps():
+    # Player 0 rests in rounds 1 and 4, player 2 in round 2, on index rounds
+    all_rounds = [(None, 0, None), (None, None, (2, 3)), (None, None, None), (None, 0, None)]
+    rested = rest_matrix(all_rounds, range(4))
+    assert rested.tolist() == [
+        [True, False, False, False],
+        [False, False, True, True],
+        [False, False, False, False],
+        [True, False, False, False],
+    ]
+    assert rest_gaps(rested).tolist() == [2]
+
+
+def test_fairness_is_100_only_for_an_even_spread():
+    # A whist design spreads partners and opponents perfectly
+    all_rounds, matchup_counts, pairing_counts, rest_counts = generate_tournament_schedule(8, 7, seed=1)
+    assert fairness_score(pairing_counts, matchup_counts, rest_counts) == 100.0
+    # The same number of partnerships, but one pair twice and another never
+    pairing_counts = pairing_counts.copy()
+    pairing_counts[[0, 1], [1, 0]] += 1
+    pairing_counts[[2, 3], [3, 2]] -= 1
+    assert fairness_score(pairing_counts, matchup_counts, rest_counts) < 100.0
+
+
+def test_schedule_metrics_totals():
+    all_rounds, matchup_counts, pairing_counts, rest_counts = generate_tournament_schedule(10, 6, seed=2)
+    metrics = schedule_metrics(pairing_counts, matchup_counts, rest_counts, rest_matrix(all_rounds, range(10)))
+    assert metrics["partner_histogram"].sum() == 10 * 9 // 2
+    assert metrics["rest_histogram"].sum() == 10
+    assert metrics["max_repeat_partners"] == pairing_counts.max()
+    assert 0 < metrics["fairness"] <= 100
@@ -0,0 +1,30 @@
+import numpy as np
+
+from checks import assert_counts_match_rounds
+from pbscheduler import parallel_multi_court_schedule, parallel_tournament_schedule
+
+
+def assert_same_schedule(first, second):
+    for (matches1, resting1, bye1), (matches2, resting2, bye2) in zip(first[0], second[0]):
+        assert np.array_equal(matches1, matches2)
+        assert np.array_equal(np.atleast_1d(resting1), np.atleast_1d(resting2))
+        assert (bye1 is None) == (bye2 is None)
+        if bye1 is not None:
+            assert np.array_equal(bye1, bye2)
+    for counts1, counts2 in zip(first[1:], second[1:]):
+        assert np.array_equal(counts1, counts2)
+
+
+def test_parallel_tournament_search_is_reproducible():
+    # A move budget rather than a clock budget, so the worker count can't matter
+    first = parallel_tournament_schedule(10, 5, seed=3, num_searches=3, workers=1, optimize_moves=500)
+    second = parallel_tournament_schedule(10, 5, seed=3, num_searches=3, workers=3, optimize_moves=500)
+    assert_same_schedule(first, second)
+    assert_counts_match_rounds(first, 10)
+
+
+def test_parallel_multi_court_search_is_reproducible():
+    first = parallel_multi_court_schedule(14, 6, 2, seed=5, num_searches=3, workers=1)
+    second = parallel_multi_court_schedule(14, 6, 2, seed=5, num_searches=3, workers=2)
+    assert_same_schedule(first, second)
+    assert_counts_match_rounds(first, 14)
@@ -0,0 +1,20 @@
+from pbscheduler import new_ratings, record_rating_result
+from pbscheduler.ratings import TEAM1_WIN, TEAM2_WIN, replay_ratings
+
+PLAYERS = ["Ann", "Bo", "Cy", "Di", "Ed", "Flo", "Gus", "Hal"]
+
+
+def test_ratings_match_a_full_replay_in_any_order():
+    ratings = new_ratings(PLAYERS)
+    results = [
+        ((2, 1), ("Ann", "Bo"), ("Cy", "Di"), TEAM2_WIN),
+        ((1, 1), ("Ann", "Cy"), ("Bo", "Di"), TEAM1_WIN),
+        ((1, 2), ("Ed", "Flo"), ("Gus", "Hal"), TEAM1_WIN),
+        ((2, 1), ("Ann", "Bo"), ("Cy", "Di"), TEAM1_WIN),  # A correction
+        ((3, 1), ("Ed", "Gus"), ("Flo", "Hal"), TEAM2_WIN),
+    ]
+    for key, team1, team2, outcome in results:
+        record_rating_result(ratings, key, team1, team2, outcome)
+    incremental = dict(ratings["ratings"])
+    replay_ratings(ratings)
+    assert ratings["ratings"] == incremental
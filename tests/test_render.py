@@ -0,0 +1,54 @@
+import io
+import re
+import zlib
+
+from pbscheduler import multi_court_schedule, schedule_rows, write_html_sheets, write_pdf_sheets
+
+PLAYERS = ["Ann <b>", "Bo & Co"] + [f"Player {i + 1}" for i in range(7)]
+
+
+def schedule():
+    return multi_court_schedule(PLAYERS, 4, 2, seed=1, use_cache=False)[0]
+
+
+def test_schedule_rows_have_every_match_and_who_sits_out():
+    all_rounds = schedule()
+    rows = schedule_rows(all_rounds)
+    assert len(rows) == sum(len(matches) for matches, _, _ in all_rounds)
+    for row in rows:
+        _, resting, _ = all_rounds[row["Round"] - 1]
+        assert row["Sitting out"] == ", ".join(resting)
+
+
+def test_html_sheets_escape_names_and_cover_everyone():
+    all_rounds = schedule()
+    out = io.StringIO()
+    write_html_sheets(all_rounds, PLAYERS, out)
+    page = out.getvalue()
+    assert "<b>" not in page.replace("<body>", "")
+    assert page.count('<div class="card">') == sum(len(matches) for matches, _, _ in all_rounds)
+    for name in ("Ann &lt;b&gt;", "Bo &amp; Co", "Player 7"):
+        assert f'<div class="itinerary"><h3>{name}</h3>' in page
+
+    out = io.StringIO()
+    write_html_sheets(all_rounds, PLAYERS, out, sections=("scorecards",))
+    assert "Schedule</h2>" not in out.getvalue() and "Itineraries" not in out.getvalue()
+
+
+def test_pdf_sheets_are_a_well_formed_pdf():
+    out = io.BytesIO()
+    write_pdf_sheets(schedule(), PLAYERS, out)
+    data = out.getvalue()
+    assert data.startswith(b"%PDF-1.4") and data.endswith(b"%%EOF\n")
+
+    # Every cross-reference entry points at its object
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    size = int(re.match(rb"xref\n0 (\d+)\n", data[xref:]).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n ", data[xref:])
+    assert len(offsets) == size - 1
+    for object_id, offset in enumerate(offsets, 1):
+        assert data[int(offset):].startswith(b"%d 0 obj" % object_id)
+
+    text = b"".join(zlib.decompress(stream) for stream in re.findall(rb"stream\n(.*?)\nendstream", data, re.S))
+    for name in PLAYERS:
+        assert name.encode("latin-1") in text
@@ -0,0 +1,18 @@
+import pytest
+
+from pbscheduler import multi_court_schedule, update_roster
+
+PLAYERS = [f"Player {i + 1}" for i in range(8)]
+
+
+@pytest.mark.parametrize("active", [[], PLAYERS[:3], PLAYERS[2:], PLAYERS + ["Late"]])
+def test_played_rounds_stay_and_only_active_players_play_on(active):
+    all_rounds = multi_court_schedule(PLAYERS, 5, 2, seed=1, use_cache=False)[0]
+    players = PLAYERS + ["Late"]
+    updated = update_roster(all_rounds, players, active, 2, num_courts=2, seed=1)[0]
+    assert updated[:2] == all_rounds[:2]
+    assert len(updated) == 5
+    for matches, _, _ in updated[2:]:
+        playing = [player for match in matches for team in match for player in team]
+        assert set(playing) <= set(active)
+        assert len(playing) == 4 * min(2, len(active) // 4)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+from pbscheduler import create_tournament, multi_court_schedule, open_store, team_text
+from pbscheduler.server import handle_request, new_service
+
+PLAYERS = [f"Player {i + 1}" for i in range(9)]
+
+
+@pytest.fixture
+def service(tmp_path):
+    conn = open_store(str(tmp_path / "tournaments.sqlite3"))
+    all_rounds = multi_court_schedule(PLAYERS, 4, 2, seed=1, use_cache=False)[0]
+    create_tournament(conn, "Open", PLAYERS, all_rounds, {"num_courts": 2, "points_per_win": 2}, {"active": PLAYERS})
+    yield new_service(conn)
+    conn.close()
+
+
+def request(service, method, target, body=None):
+    return asyncio.run(handle_request(service, method, target, None if body is None else json.dumps(body)))
+
+
+def court_row(all_rounds, round_number, match_number, winner, score1, score2):
+    pair1, pair2 = all_rounds[round_number - 1][0][match_number - 1]
+    return {"Team 1": team_text(pair1), "Team 2": team_text(pair2), "Team 1 score": score1, "Team 2 score": score2,
+            "Winner": winner}
+
+
+def test_results_are_scored_and_pushed_as_changes(service):
+    status, snapshot = request(service, "GET", "/tournaments/1")
+    all_rounds, version = snapshot["tournament"]["all_rounds"], snapshot["version"]
+    result = court_row(all_rounds, 1, 1, "Team 2", 7, 11)
+    status, reply = request(service, "POST", "/tournaments/1/results", {"results": [{"round": 1, "match": 1, "result": result}]})
+    assert status == 200 and reply["version"] == version + 1
+
+    # Two points for the win plus the four-point margin, for both winners
+    winners = all_rounds[0][0][0][1]
+    status, update = request(service, "GET", f"/tournaments/1/updates?since={version}")
+    assert [change["scores"] for change in update["changes"]] == [dict.fromkeys(winners, 6)]
+    leaders = dict(request(service, "GET", "/tournaments/1")[1]["leaderboard"])
+    assert {player for player, score in leaders.items() if score} == set(winners)
+
+
+def test_results_for_rescheduled_teams_are_not_scored(service):
+    all_rounds = request(service, "GET", "/tournaments/1")[1]["tournament"]["all_rounds"]
+    result = dict(court_row(all_rounds, 1, 1, "Team 1", 11, 3), **{"Team 1": "Someone & Else"})
+    request(service, "POST", "/tournaments/1/results", {"results": [{"round": 1, "match": 1, "result": result}]})
+    assert all(score == 0 for _, score in request(service, "GET", "/tournaments/1")[1]["leaderboard"])
+
+
+def test_bad_submissions_are_rejected_whole(service):
+    all_rounds = request(service, "GET", "/tournaments/1")[1]["tournament"]["all_rounds"]
+    good = {"round": 1, "match": 1, "result": court_row(all_rounds, 1, 1, "Team 1", 11, 3)}
+    status, reply = request(service, "POST", "/tournaments/1/results", {"results": [good, {"round": 9, "match": 1, "result": {}}]})
+    assert status == 400 and "round 9" in reply["error"]
+    assert request(service, "GET", "/tournaments/1")[1]["tournament"]["results"] == []
+
+    status, _ = request(service, "POST", "/tournaments/1/roster", {"roster": {"players": PLAYERS, "active": PLAYERS[:3]}})
+    assert status == 400
+
+
+def test_roster_changes_replan_the_rounds_to_come(service):
+    status, _ = request(service, "POST", "/tournaments/1/roster", {"roster": {"players": PLAYERS + ["Late"], "active": PLAYERS[1:] + ["Late"]}})
+    assert status == 200
+    all_rounds = request(service, "GET", "/tournaments/1")[1]["tournament"]["all_rounds"]
+    for matches, _, _ in all_rounds:
+        playing = {player for match in matches for team in match for player in team}
+        assert "Player 1" not in playing
+
+    status, player = request(service, "GET", "/tournaments/1/players/Late")
+    assert status == 200 and player["next"] is not None
+    assert request(service, "GET", "/tournaments/1/players/Nobody")[0] == 404
+    assert request(service, "GET", "/tournaments/2")[0] == 404
@@ -0,0 +1,45 @@
+from pbscheduler import (
+    append_result,
+    create_tournament,
+    list_tournaments,
+    load_tournament,
+    multi_court_schedule,
+    open_store,
+    save_schedule,
+)
+
+
+def test_store_round_trips_schedules_and_results(tmp_path):
+    conn = open_store(str(tmp_path / "tournaments.sqlite3"))
+    players = [f"Player {i + 1}" for i in range(9)]
+    all_rounds = multi_court_schedule(players, 4, 2, seed=1, use_cache=False)[0]
+    tournament_id = create_tournament(conn, "Open", players, all_rounds, {"num_courts": 2}, {"active": players})
+    append_result(conn, tournament_id, (1, 1), {"Winner": "Team 1"})
+    append_result(conn, tournament_id, (1, 2), {"Winner": "Team 2"})
+    append_result(conn, tournament_id, (1, 1), {"Winner": "Team 2"})  # A correction
+
+    tournament = load_tournament(conn, tournament_id)
+    assert tournament["all_rounds"] == all_rounds
+    assert tournament["settings"] == {"num_courts": 2}
+    assert tournament["roster"] == {"active": players, "players": players}
+    assert tournament["results"] == {(1, 1): {"Winner": "Team 2"}, (1, 2): {"Winner": "Team 2"}}
+    assert tournament["version"] == 4
+
+    replanned = multi_court_schedule(players, 4, 2, seed=2, use_cache=False)[0]
+    save_schedule(conn, tournament_id, players, replanned)
+    tournament = load_tournament(conn, tournament_id)
+    assert tournament["all_rounds"] == replanned
+    assert tournament["version"] == 5
+    assert load_tournament(conn, tournament_id + 1) is None
+    conn.close()
+
+
+def test_list_tournaments_newest_first_by_name(tmp_path):
+    conn = open_store(str(tmp_path / "tournaments.sqlite3"))
+    players = [f"Player {i + 1}" for i in range(8)]
+    all_rounds = multi_court_schedule(players, 2, 2, seed=1, use_cache=False)[0]
+    ids = [create_tournament(conn, name, players, all_rounds) for name in ("Round robin", "Americano", "Round robin")]
+    assert [row[0] for row in list_tournaments(conn)] == ids[::-1]
+    assert [(row[0], row[1]) for row in list_tournaments(conn, "Round robin")] == [(ids[2], "Round robin"), (ids[0], "Round robin")]
+    assert [row[0] for row in list_tournaments(conn, "Round robin", 1)] == [ids[2]]
+    conn.close()
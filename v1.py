@@ -1,170 +1,48 @@
+from urllib.error import HTTPError
+
+import pandas as pd
 import streamlit as st
-import random
-from collections import defaultdict
-
-def calculate_rematch_interval(num_players):
-    return max(1, num_players // 2)
-
-def choose_player_to_rest(players, rest_counts):
-    min_rests = min(rest_counts.values())
-    candidates = [p for p in players if rest_counts[p] == min_rests]
-    return random.choice(candidates)
-
-def update_recent_partners(recent_partners, player1, player2, rematch_interval):
-    for player in [player1, player2]:
-        recent_partners[player].append(player2 if player == player1 else player1)
-        if len(recent_partners[player]) > rematch_interval:
-            recent_partners[player].pop(0)
-
-def score_pairings(pairings, player_pairing_counts):
-    score = 0
-    for player1, player2 in pairings:
-        if player_pairing_counts[player1][player2] == 0:
-            score += 0  # Strongly reward new partnerships
-        else:
-            score += (player_pairing_counts[player1][player2] ** 2) * 10  # Heavily penalize repeat partnerships
-    return score
-
-def generate_random_pairings(players, rest_counts):
-    available_players = players.copy()
-    resting_player = None
-    if len(available_players) % 2 == 1:
-        resting_player = choose_player_to_rest(available_players, rest_counts)
-        available_players.remove(resting_player)
-
-    random.shuffle(available_players)
-    pairings = [(available_players[i], available_players[i+1]) for i in range(0, len(available_players), 2)]
-    return pairings, resting_player
-
-def create_optimized_pairings(players, player_pairing_counts, rest_counts):
-    best_pairings = None
-    best_score = float('inf')
-    best_resting_player = None
-
-    for _ in range(10):  # Try 10 times to get the best pairings
-        pairings, resting_player = generate_random_pairings(players, rest_counts)
-        score = score_pairings(pairings, player_pairing_counts)
-
-        if score < best_score:
-            best_score = score
-            best_pairings = pairings
-            best_resting_player = resting_player
-
-    # Update pairing counts
-    for player1, player2 in best_pairings:
-        player_pairing_counts[player1][player2] += 1
-        player_pairing_counts[player2][player1] += 1
-
-    return best_pairings, best_resting_player
-
-def create_matches(pairings, previous_match_history, player_matchups):
-    # Since we're now passing in just one match worth of pairings,
-    # we can simply return it as is
-    return [pairings]
-
-def calculate_match_score(pair1, pair2, previous_match_history, player_matchups):
-    novelty_score = 0 if tuple(pair2) in previous_match_history[tuple(pair1)] else 1
-    balance_score = sum(player_matchups[p1][p2] for p1 in pair1 for p2 in pair2)
-    return novelty_score * 10 - balance_score  # Prioritize new matchups, then balance
-
-def update_match_history(pair1, pair2, previous_match_history, player_matchups):
-    previous_match_history[tuple(pair1)].add(tuple(pair2))
-    previous_match_history[tuple(pair2)].add(tuple(pair1))
-    for p1 in pair1:
-        for p2 in pair2:
-            player_matchups[p1][p2] += 1
-            player_matchups[p2][p1] += 1
-
-def generate_multi_court_schedule(players, num_rounds, num_courts):
-    num_players = len(players)
-    games_per_player_per_cycle = num_courts * 4 // num_players
-    rests_per_player_per_cycle = 1 if num_players % (num_courts * 4) != 0 else 0
-    cycle_length = games_per_player_per_cycle + rests_per_player_per_cycle
-
-    player_pairing_counts = defaultdict(lambda: defaultdict(int))
-    player_matchups = defaultdict(lambda: defaultdict(int))
-    all_rounds = []
-
-    for cycle_start in range(0, num_rounds, cycle_length):
-        cycle_rounds = min(cycle_length, num_rounds - cycle_start)
-        cycle_players = players.copy()
-        random.shuffle(cycle_players)
-
-        for round_in_cycle in range(cycle_rounds):
-            round_matches = []
-            resting_players = []
-
-            for court in range(num_courts):
-                if len(cycle_players) >= 4:
-                    match_players = [cycle_players.pop() for _ in range(4)]
-                    pairings, _ = create_optimized_pairings(match_players, player_pairing_counts, defaultdict(int))
-                    round_matches.append(pairings)
-                else:
-                    resting_players.extend(cycle_players)
-                    break
-
-            all_rounds.append((round_matches, resting_players))
-            cycle_players = resting_players + [player for match in round_matches for pair in match for player in pair]
-
-    return all_rounds, player_matchups, player_pairing_counts, defaultdict(int)
+import pbscheduler
+
+import app_ui
+
+WINNER_OPTIONS = ["Not played", "Team 1", "Team 2"]
+
+def generate_multi_court_schedule(players, num_rounds, num_courts, use_all_cores=False, schedule_number=1):
+    return pbscheduler.multi_court_schedule(players, num_rounds, num_courts, schedule_number, use_all_cores=use_all_cores)
 
 def display_multi_court_schedule(all_rounds):
     st.write("### Multi-Court Pickleball Tournament Schedule:")
-    for round_number, (matches, resting_players) in enumerate(all_rounds, 1):
-        st.write(f"\n**Round {round_number}:**")
-        if resting_players:
-            st.write(f"Players resting this round: {', '.join(resting_players)}")
-        for match_number, match in enumerate(matches, 1):
-            (player1, player2), (player3, player4) = match
-            st.write(f"Court {match_number}: {player1} & {player2} vs. {player3} & {player4}")
-        st.write("---")  # Add a separator between rounds
-
-def display_leaderboard(player_scores, late_additions):
+    table = app_ui.schedule_table(all_rounds).rename(columns={"Match": "Court"})
+    st.dataframe(table, hide_index=True, use_container_width=True)
+
+def display_player_matches(itineraries, players, played):
+    # Read straight from the itinerary index, without going through the schedule
+    player = st.selectbox("Player", players, index=None, placeholder="Find your name")
+    if player is None:
+        return
+    upcoming = pbscheduler.next_match(itineraries, player, played)
+    if upcoming is None:
+        st.info(f"{player} has no more matches scheduled.")
+    else:
+        round_number, court_number, partner, opponents = upcoming
+        st.success(f"Next: Round {round_number}, Court {court_number}, with {partner} against {pbscheduler.team_text(opponents)}")
+    st.dataframe(app_ui.itinerary_table(pbscheduler.upcoming_entries(itineraries, player, played)), hide_index=True, use_container_width=True)
+
+def display_leaderboard(ledger, late_additions, ratings):
     st.write("### Leaderboard:")
     st.write("(Points include wins and score differences)")
-    sorted_players = sorted(player_scores.items(), key=lambda x: x[1], reverse=True)
-    for rank, (player, score) in enumerate(sorted_players, 1):
-        late_note = " (added later)" if player in late_additions else ""
-        st.write(f"{rank}. {player}: {score} points{late_note}")
-
-def insert_player_into_schedule(player_name, all_rounds, player_matchups, player_pairing_counts, rest_counts):
-    for round_number, (matches, resting_players) in enumerate(all_rounds):
-        if resting_players:
-            # Replace a resting player with the new player
-            replaced_player = random.choice(resting_players)
-            resting_players.remove(replaced_player)
-            resting_players.append(player_name)
-        else:
-            # If no resting players, we need to adjust a match
-            match_to_adjust = random.choice(matches)
-            matches.remove(match_to_adjust)
-            players_in_match = [p for pair in match_to_adjust for p in pair]
-            player_to_rest = random.choice(players_in_match)
-            players_in_match.remove(player_to_rest)
-            players_in_match.append(player_name)
-            resting_players.append(player_to_rest)
-            
-            # Create new pairings for the adjusted match
-            random.shuffle(players_in_match)
-            new_match = [(players_in_match[0], players_in_match[1]), (players_in_match[2], players_in_match[3])]
-            matches.append(new_match)
-
-        # Initialize matchup and pairing counts for the new player
-        if player_name not in player_matchups:
-            player_matchups[player_name] = defaultdict(int)
-            player_pairing_counts[player_name] = defaultdict(int)
-        
-        for existing_player in player_matchups.keys():
-            if existing_player != player_name:
-                player_matchups[player_name][existing_player] = 0
-                player_matchups[existing_player][player_name] = 0
-                player_pairing_counts[player_name][existing_player] = 0
-                player_pairing_counts[existing_player][player_name] = 0
-        
-        if player_name not in rest_counts:
-            rest_counts[player_name] = 0
-
-    return all_rounds, player_matchups, player_pairing_counts, rest_counts
+    standings = pbscheduler.leaderboard(ledger)
+    table = pd.DataFrame(
+        {
+            "Player": [player for player, _ in standings],
+            "Points": [score for _, score in standings],
+            "Rating": [round(pbscheduler.rating(ratings, player)) for player, _ in standings],
+            "Added later": [player in late_additions for player, _ in standings],
+        },
+        index=pd.RangeIndex(1, len(standings) + 1, name="Rank"),
+    )
+    st.dataframe(table, use_container_width=True)
 
 def main():
     st.set_page_config(page_title="Pickleball Tournament")
@@ -172,8 +50,8 @@ def main():
     # Initialize session state
     if 'schedule_generated' not in st.session_state:
         st.session_state.schedule_generated = False
-    if 'player_scores' not in st.session_state:
-        st.session_state.player_scores = defaultdict(int)
+    if 'ledger' not in st.session_state:
+        st.session_state.ledger = pbscheduler.new_ledger()
     if 'player_names' not in st.session_state:
         st.session_state.player_names = []  # Start with an empty list
     if 'num_rounds' not in st.session_state:
@@ -186,10 +64,28 @@ def main():
         st.session_state.all_rounds = []
     if 'late_additions' not in st.session_state:
         st.session_state.late_additions = set()
+    if 'scheduled_players' not in st.session_state:
+        st.session_state.scheduled_players = []
+    if 'ratings' not in st.session_state:
+        st.session_state.ratings = pbscheduler.new_ratings()
+    if 'balance_skill' not in st.session_state:
+        st.session_state.balance_skill = False
+    if 'use_all_cores' not in st.session_state:
+        st.session_state.use_all_cores = False
+    if 'schedule_number' not in st.session_state:
+        st.session_state.schedule_number = 1
+
+    # A tournament in the page address survives refreshes and opens on other devices
+    tournament_id = st.query_params.get("tournament")
+    if tournament_id and tournament_id.isdigit() and st.session_state.get('tournament_id') != int(tournament_id):
+        if not load_saved_tournament(int(tournament_id)):
+            st.warning(f"Tournament {tournament_id} was not found.")
+    elif st.session_state.get('tournament_id') is not None and pbscheduler.server_url():
+        sync_with_server()
 
     st.title("Pickleball Tournament")
 
-    tab1, tab2, tab3 = st.tabs(["Info", "Schedule", "Leaderboard"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Info", "Schedule", "Leaderboard", "My Matches"])
 
     with tab1:
         with st.expander("Player Management", expanded=True):
@@ -197,26 +93,39 @@ def main():
             st.subheader("Add New Player:")
             new_player = st.text_input("Enter new player name", key=f"new_player_input_{len(st.session_state.player_names)}")
             if st.button("Add Player"):
-                add_new_player(new_player)
+                add_new_players([new_player])
+
+            # A roster file adds every player in it at once
+            roster_file = st.file_uploader("Import players (CSV, JSON or one name per line)", type=["csv", "json", "jsonl", "txt"])
+            if roster_file is not None and st.session_state.get('imported_roster') != (roster_file.name, roster_file.size):
+                st.session_state.imported_roster = (roster_file.name, roster_file.size)
+                add_new_players(app_ui.import_roster(roster_file))
 
             # Display current players
             named_players = [player for player in st.session_state.player_names if not player.startswith("Player")]
             if named_players:
                 st.subheader("Current Players:")
-                for i, player in enumerate(named_players):
-                    col1, col2 = st.columns([3, 1])
-                    with col1:
-                        st.text(player)
-                    with col2:
-                        if st.button("Remove", key=f"remove_{i}"):
-                            st.session_state.player_names.remove(player)
-                            st.rerun()
+                st.dataframe(pd.DataFrame({"Player": named_players}), hide_index=True, use_container_width=True)
+                removed = st.multiselect("Players to remove", named_players)
+                # A schedule needs at least 4 players to keep going, as on the server
+                too_few = st.session_state.schedule_generated and len(st.session_state.player_names) - len(removed) < 4
+                if too_few:
+                    st.warning("At least 4 players must stay in a scheduled tournament.")
+                if removed and st.button("Remove", disabled=too_few):
+                    for player in removed:
+                        st.session_state.player_names.remove(player)
+                    if st.session_state.schedule_generated:
+                        update_schedule_roster()
+                    st.rerun()
 
         with st.expander("Tournament Settings", expanded=True):
             st.session_state.num_rounds = st.number_input("Rounds", min_value=1, value=st.session_state.num_rounds)
             max_courts = max(1, len(st.session_state.player_names) // 4)
             st.session_state.num_courts = st.number_input("Courts", min_value=1, max_value=max_courts, value=min(st.session_state.num_courts, max_courts))
             st.session_state.points_per_win = st.number_input("Points per Win", min_value=1, value=st.session_state.points_per_win)
+            st.session_state.balance_skill = st.checkbox("Balance teams by skill rating (upcoming rounds are replanned as scores come in)", value=st.session_state.balance_skill)
+            st.session_state.use_all_cores = st.checkbox("Search on all CPU cores", value=st.session_state.use_all_cores)
+            st.session_state.schedule_number = st.number_input("Schedule number (the same number gives the same schedule)", min_value=1, value=st.session_state.schedule_number)
 
         # Only enable the "Generate Schedule" button when there are at least 4 players
         if len(st.session_state.player_names) >= 4:
@@ -224,9 +133,26 @@ def main():
                 st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = generate_multi_court_schedule(
                     st.session_state.player_names, 
                     st.session_state.num_rounds, 
-                    st.session_state.num_courts
+                    st.session_state.num_courts,
+                    st.session_state.use_all_cores,
+                    st.session_state.schedule_number
                 )
                 st.session_state.schedule_generated = True
+                st.session_state.itineraries = pbscheduler.itinerary_index(st.session_state.all_rounds)
+                st.session_state.scheduled_players = list(st.session_state.player_names)
+                st.session_state.ledger = pbscheduler.new_ledger(st.session_state.player_names)
+                st.session_state.ratings = pbscheduler.new_ratings(st.session_state.player_names)
+                with app_ui.tournament_store() as conn:
+                    st.session_state.tournament_id = pbscheduler.create_tournament(
+                        conn,
+                        "Pickleball Tournament",
+                        st.session_state.scheduled_players,
+                        st.session_state.all_rounds,
+                        tournament_settings(),
+                        roster_details()
+                    )
+                st.session_state.server_version = 1
+                st.query_params["tournament"] = str(st.session_state.tournament_id)
                 st.rerun()
         else:
             st.warning("You need at least 4 players to generate a schedule.")
@@ -234,7 +160,12 @@ def main():
     with tab2:
         if st.session_state.schedule_generated:
             st.header("Tournament Schedule and Results")
-            
+
+            # Picks up results entered on other devices
+            if st.button("Reload Saved Results"):
+                load_saved_tournament(st.session_state.tournament_id)
+                st.rerun()
+
             if st.button("Show/Hide Original Schedule"):
                 st.session_state.show_schedule = not st.session_state.get('show_schedule', False)
 
@@ -248,6 +179,8 @@ def main():
                     st.write("This schedule includes newly added players:")
                     display_multi_court_schedule(st.session_state.all_rounds)
 
+            app_ui.display_printable_sheets(st.session_state.all_rounds, st.session_state.scheduled_players)
+
             # Original match results
             with st.expander("Original Match Results", expanded=True):
                 display_match_results_form(st.session_state.all_rounds, is_updated=False)
@@ -263,92 +196,234 @@ def main():
     with tab3:
         st.header("Leaderboard")
         if st.session_state.schedule_generated:
-            display_leaderboard(st.session_state.player_scores, st.session_state.late_additions)
+            display_leaderboard(st.session_state.ledger, st.session_state.late_additions, st.session_state.ratings)
+            results = app_ui.results_csv(st.session_state.all_rounds, st.session_state.ledger)
+            st.download_button("Download Results (CSV)", data=results, file_name="pickleball_results.csv", mime="text/csv")
         else:
             st.info("Generate a schedule and enter match results to view the leaderboard.")
 
+    with tab4:
+        st.header("My Matches")
+        if st.session_state.schedule_generated:
+            display_player_matches(st.session_state.itineraries, st.session_state.scheduled_players, pbscheduler.rounds_played(st.session_state.ledger))
+        else:
+            st.info("Matches appear here once a schedule is generated.")
+
     if st.button("Reset Tournament"):
         for key in list(st.session_state.keys()):
             del st.session_state[key]
+        st.query_params.clear()
         st.rerun()
 
+def court_result(results, round_number, court_number, team1, team2):
+    result = results.get((round_number, court_number))
+    # Start the court over if the players have changed
+    if result is None or result["Team 1"] != team1 or result["Team 2"] != team2:
+        result = {"Team 1": team1, "Team 2": team2, "Team 1 score": 0, "Team 2 score": 0, "Winner": "Not played"}
+    return result
+
 def display_match_results_form(all_rounds, is_updated):
-    with st.form(f"match_results_form_{'updated' if is_updated else 'original'}"):
-        for round_number, (matches, resting_players) in enumerate(all_rounds, 1):
+    # One editable grid per round, a page of rounds at a time. Submitted results live
+    # in session state so they survive paging away from a round, and both forms share
+    # them, as they share the ledger.
+    form_name = 'updated' if is_updated else 'original'
+    results = st.session_state.setdefault('match_results', {})
+    rounds = app_ui.round_page(len(all_rounds), f"results_page_{form_name}")
+    edited_rounds = []
+    with st.form(f"match_results_form_{form_name}"):
+        for round_index in rounds:
+            round_number = round_index + 1
+            matches = all_rounds[round_index][0]
             st.subheader(f"Round {round_number}")
-            for match_number, match in enumerate(matches, 1):
-                key = f"round_{round_number}_match_{match_number}_{'updated' if is_updated else 'original'}"
-                radio_key = f"radio_{key}"
-                score_key = f"score_{key}"
-                
-                (player1, player2), (player3, player4) = match
-                
-                # Reset the session state for this match if the players have changed
-                if key not in st.session_state or st.session_state[key] not in ["Not played", f"{player1} & {player2}", f"{player3} & {player4}"]:
-                    st.session_state[key] = "Not played"
-                if score_key not in st.session_state:
-                    st.session_state[score_key] = {"team1": 0, "team2": 0}
-                
-                st.write(f"{player1} & {player2} vs {player3} & {player4}")
-                col1, col2, col3 = st.columns([2, 2, 3])
-                with col1:
-                    team1_score = st.number_input(f"{player1} & {player2}", min_value=0, value=st.session_state[score_key]["team1"], key=f"team1_{score_key}")
-                with col2:
-                    team2_score = st.number_input(f"{player3} & {player4}", min_value=0, value=st.session_state[score_key]["team2"], key=f"team2_{score_key}")
-                with col3:
-                    options = ["Not played", f"{player1} & {player2}", f"{player3} & {player4}"]
-                    index = options.index(st.session_state[key])
-                    winner = st.radio(
-                        "Winner",
-                        options=options,
-                        key=radio_key,
-                        index=index,
-                        horizontal=True
-                    )
-                
-                st.session_state[key] = winner
-                st.session_state[score_key] = {"team1": team1_score, "team2": team2_score}
-        
+            table = pd.DataFrame(
+                [
+                    court_result(results, round_number, court_number, pbscheduler.team_text(pair1), pbscheduler.team_text(pair2))
+                    for court_number, (pair1, pair2) in enumerate(matches, 1)
+                ],
+                index=pd.RangeIndex(1, len(matches) + 1, name="Court"),
+            )
+            edited = st.data_editor(
+                table,
+                disabled=["Team 1", "Team 2"],
+                column_config={
+                    "Team 1 score": st.column_config.NumberColumn(min_value=0, step=1, required=True),
+                    "Team 2 score": st.column_config.NumberColumn(min_value=0, step=1, required=True),
+                    "Winner": st.column_config.SelectboxColumn(options=WINNER_OPTIONS, required=True),
+                },
+                key=f"results_{form_name}_round_{round_number}",
+            )
+            edited_rounds.append((round_number, edited))
+
         submitted = st.form_submit_button("Update Scores")
-    
+
     if submitted:
-        update_scores(all_rounds, is_updated)
+        changed = []
+        for round_number, edited in edited_rounds:
+            for court_number, result in enumerate(edited.to_dict("records"), 1):
+                if court_result(results, round_number, court_number, result["Team 1"], result["Team 2"]) != result:
+                    changed.append(((round_number, court_number), result))
+        if pbscheduler.server_url():
+            # The server scores the results and sends back everyone's changes; scores it
+            # rejects are not kept
+            try:
+                pbscheduler.submit_results(pbscheduler.server_url(), st.session_state.tournament_id, dict(changed))
+            except HTTPError as error:
+                st.error(f"The server didn't accept these scores ({error.code} {error.reason}).")
+                return
+            results.update(changed)
+            sync_with_server()
+            st.rerun()
+        results.update(changed)
+        # Only changed courts are written, each as a new row
+        with app_ui.tournament_store() as conn:
+            for key, result in changed:
+                pbscheduler.append_result(conn, st.session_state.tournament_id, key, result)
+        update_scores(all_rounds, dict(changed))
         st.success("Scores updated successfully!")
 
-def update_scores(all_rounds, is_updated):
-    for round_number, (matches, _) in enumerate(all_rounds, 1):
-        for match_number, match in enumerate(matches, 1):
-            key = f"round_{round_number}_match_{match_number}_{'updated' if is_updated else 'original'}"
-            score_key = f"score_{key}"
-            winner = st.session_state[key]
-            team1_score = st.session_state[score_key]["team1"]
-            team2_score = st.session_state[score_key]["team2"]
-            score_diff = abs(team1_score - team2_score)
-            
-            (player1, player2), (player3, player4) = match
-            
-            # Update scores
-            if winner == f"{player1} & {player2}":
-                st.session_state.player_scores[player1] += (st.session_state.points_per_win + score_diff)
-                st.session_state.player_scores[player2] += (st.session_state.points_per_win + score_diff)
-            elif winner == f"{player3} & {player4}":
-                st.session_state.player_scores[player3] += (st.session_state.points_per_win + score_diff)
-                st.session_state.player_scores[player4] += (st.session_state.points_per_win + score_diff)
-
-def add_new_player(new_player):
-    if new_player and new_player not in st.session_state.player_names:
+def record_scores(all_rounds, results):
+    # Scores only the courts in `results`, leaving every other result in the ledger as
+    # it was. Returns True if any rating changed.
+    ratings_changed = False
+    for (round_number, match_number), result in results.items():
+        if round_number > len(all_rounds) or match_number > len(all_rounds[round_number - 1][0]):
+            continue  # No longer in the schedule
+        pair1, pair2 = all_rounds[round_number - 1][0][match_number - 1]
+
+        # Update scores; unchanged results leave the leaderboard alone
+        awards = pbscheduler.court_awards(result, pair1, pair2, st.session_state.points_per_win)
+        outcome = pbscheduler.ratings.OUTCOMES.get(pbscheduler.court_winner(result, pair1, pair2))
+        pbscheduler.record_result(st.session_state.ledger, (round_number, match_number), awards)
+        if pbscheduler.record_rating_result(st.session_state.ratings, (round_number, match_number), pair1, pair2, outcome):
+            ratings_changed = True
+    return ratings_changed
+
+def update_scores(all_rounds, results):
+    ratings_changed = record_scores(all_rounds, results)
+
+    # Replan the rounds still to come around the new ratings
+    if ratings_changed and st.session_state.balance_skill:
+        update_schedule_roster()
+        st.rerun()
+
+def update_schedule_roster():
+    if pbscheduler.server_url():
+        roster = dict(roster_details(), players=st.session_state.scheduled_players)
+        pbscheduler.submit_roster(pbscheduler.server_url(), st.session_state.tournament_id, roster)
+        sync_with_server()
+        return
+
+    # Played rounds stay put; the rest are rescheduled for the current players
+    from_round = pbscheduler.rounds_played(st.session_state.ledger)
+    st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = pbscheduler.update_roster(
+        st.session_state.all_rounds,
+        st.session_state.scheduled_players,
+        st.session_state.player_names,
+        from_round,
+        st.session_state.num_courts,
+        ratings=st.session_state.ratings if st.session_state.balance_skill else None
+    )
+    pbscheduler.update_itinerary_index(st.session_state.itineraries, st.session_state.all_rounds, from_round)
+    with app_ui.tournament_store() as conn:
+        pbscheduler.save_schedule(
+            conn,
+            st.session_state.tournament_id,
+            st.session_state.scheduled_players,
+            st.session_state.all_rounds,
+            roster_details()
+        )
+
+def tournament_settings():
+    return {
+        "num_rounds": st.session_state.num_rounds,
+        "num_courts": st.session_state.num_courts,
+        "points_per_win": st.session_state.points_per_win,
+        "balance_skill": st.session_state.balance_skill,
+        "use_all_cores": st.session_state.use_all_cores,
+        "schedule_number": st.session_state.schedule_number,
+    }
+
+def roster_details():
+    return {"active": st.session_state.player_names, "late_additions": sorted(st.session_state.late_additions)}
+
+def load_saved_tournament(tournament_id):
+    if pbscheduler.server_url():
+        try:
+            tournament = pbscheduler.fetch_tournament(pbscheduler.server_url(), tournament_id)
+        except HTTPError:
+            return False
+    else:
+        with app_ui.tournament_store() as conn:
+            tournament = pbscheduler.load_tournament(conn, tournament_id)
+    if tournament is None:
+        return False
+    apply_tournament(tournament)
+    return True
+
+def apply_tournament(tournament):
+    roster = tournament["roster"]
+    for setting, value in tournament["settings"].items():
+        st.session_state[setting] = value
+    st.session_state.tournament_id = tournament["id"]
+    st.session_state.server_version = tournament["version"]
+    st.session_state.scheduled_players = roster["players"]
+    st.session_state.player_names = list(roster["active"])
+    st.session_state.late_additions = set(roster["late_additions"])
+    # Results alone leave the schedule, and so the itineraries, as they were
+    if tournament["all_rounds"] is not st.session_state.get('all_rounds') or 'itineraries' not in st.session_state:
+        st.session_state.itineraries = pbscheduler.itinerary_index(tournament["all_rounds"])
+    st.session_state.all_rounds = tournament["all_rounds"]
+    st.session_state.player_pairing_counts, st.session_state.player_matchups, st.session_state.rest_counts = pbscheduler.count_schedule(
+        pbscheduler.index_rounds(tournament["all_rounds"], roster["players"]), len(roster["players"])
+    )
+    st.session_state.match_results = dict(tournament["results"])
+
+    # Scores and ratings are replayed from the saved results
+    st.session_state.ledger = pbscheduler.new_ledger(roster["players"])
+    st.session_state.ratings = pbscheduler.new_ratings(roster["players"])
+    record_scores(tournament["all_rounds"], tournament["results"])
+    st.session_state.schedule_generated = True
+
+def sync_with_server():
+    # Applies what other scorekeepers changed since this session last looked
+    update = pbscheduler.fetch_updates(pbscheduler.server_url(), st.session_state.tournament_id, st.session_state.server_version)
+    if "tournament" in update:
+        apply_tournament(update["tournament"])
+        return
+    if not update["changes"]:
+        return
+
+    tournament = {
+        "id": st.session_state.tournament_id,
+        "version": update["version"],
+        "settings": {},
+        "roster": dict(roster_details(), players=st.session_state.scheduled_players),
+        "all_rounds": st.session_state.all_rounds,
+        "results": st.session_state.match_results,
+    }
+    for change in update["changes"]:
+        if change["type"] == "result":
+            tournament["results"][(change["round"], change["match"])] = change["result"]
+        else:
+            tournament["roster"] = change["roster"]
+            tournament["all_rounds"] = change["all_rounds"]
+    apply_tournament(tournament)
+
+def add_new_players(new_players):
+    # Any number of players, with one reschedule for all of them
+    new_players = [player for player in dict.fromkeys(new_players) if player and player not in st.session_state.player_names]
+    if not new_players:
+        return
+    for new_player in new_players:
         st.session_state.player_names.append(new_player)
         if st.session_state.schedule_generated:
-            st.session_state.all_rounds, st.session_state.player_matchups, st.session_state.player_pairing_counts, st.session_state.rest_counts = insert_player_into_schedule(
-                new_player,
-                st.session_state.all_rounds,
-                st.session_state.player_matchups,
-                st.session_state.player_pairing_counts,
-                st.session_state.rest_counts
-            )
-            st.session_state.player_scores[new_player] = 0
+            if new_player not in st.session_state.scheduled_players:
+                st.session_state.scheduled_players.append(new_player)
+            pbscheduler.adjust_score(st.session_state.ledger, new_player, 0)
             st.session_state.late_additions.add(new_player)
-        st.rerun()
+    if st.session_state.schedule_generated:
+        update_schedule_roster()
+    st.rerun()
 
 if __name__ == "__main__":
     main()